@@ -1,16 +1,23 @@
 """
 Billing Agent - CrewAI implementation with context-aware responses.
-Simple queries get short answers, complex queries get detailed analysis.
+Bills are computed locally; simple queries get a templated answer, complex ones a CrewAI analysis.
 """
 
+import threading
 from crewai import Agent, Task, Crew
-from langchain_openai import ChatOpenAI
+from agents.llm import get_chat_model, llm_timer
+from agents.billing_calculator import compute_bill, format_facts, format_simple_answer, usage_from_row
+from config.config import config
+from services.customer_service import get_usage_history
 from utils.database import db
+from utils.metrics import metrics
+from utils.concurrency import run_in_thread
 
-billing_specialist = Agent(
-    role="Billing Specialist",
-    goal="Provide CONCISE, DIRECT answers that match the user's question complexity",
-    backstory="""You are an expert billing analyst who provides contextual responses.
+def _make_billing_specialist():
+    return Agent(
+        role="Billing Specialist",
+        goal="Provide CONCISE, DIRECT answers that match the user's question complexity",
+        backstory="""You are an expert billing analyst who provides contextual responses.
     
     **CRITICAL INSTRUCTIONS:**
     
@@ -26,19 +33,75 @@ billing_specialist = Agent(
     
     ALWAYS match response length to question complexity!
     Simple question = Simple answer""",
-    verbose=False,
-    llm=ChatOpenAI(model="gpt-4o", temperature=0)
-)
-
-service_advisor = Agent(
-    role="Service Plan Advisor",
-    goal="Provide plan recommendations when specifically requested",
-    backstory="""You recommend plans ONLY when user explicitly asks for recommendations.
-    
-    For simple billing questions: Keep response concise, no unsolicited recommendations.""",
-    verbose=False,
-    llm=ChatOpenAI(model="gpt-4o", temperature=0)
-)
+        verbose=False,
+        llm=get_chat_model(temperature=0)
+    )
+
+# Task templates, interpolated by Crew.kickoff(inputs=...) so crews can be reused
+SIMPLE_TASK_TEMPLATE = """Customer asked: "{query}"
+
+This is a SIMPLE query asking for bill amount.
+
+Provide a SHORT, DIRECT response:
+1. Total bill amount: ${total_bill_amount}
+2. Brief breakdown (base + extras)
+3. MAX 5 lines total
+
+DO NOT provide lengthy analysis!
+
+{billing_data}"""
+
+DETAILED_TASK_TEMPLATE = """Customer asked: "{query}"
+
+Provide thorough billing analysis.
+
+The figures below are already computed; use them as given, do not recalculate.
+
+{billing_data}"""
+
+_TASK_TEMPLATES = {"simple": SIMPLE_TASK_TEMPLATE, "detailed": DETAILED_TASK_TEMPLATE}
+
+# Crew templates are built once per worker thread (kickoff mutates task state)
+_crew_templates = threading.local()
+
+# Token callback of the kickoff running on this thread. Crews keep one fixed
+# step_callback because CrewAI copies it onto the agents at the first kickoff.
+_stream_target = threading.local()
+
+def _forward_step(step):
+    """Crew step_callback: pass each agent's final answer to the active token callback"""
+    on_token = getattr(_stream_target, "on_token", None)
+    output = getattr(step, "output", None)
+    if on_token is not None and isinstance(output, str) and output:
+        on_token(output)
+
+def get_billing_crew(kind):
+    """Return this thread's reusable billing crew for 'simple' or 'detailed' queries"""
+    crews = _crew_templates.__dict__.setdefault("crews", {})
+    if kind not in crews:
+        specialist = _make_billing_specialist()
+        billing_task = Task(
+            description=_TASK_TEMPLATES[kind],
+            agent=specialist,
+            expected_output="Contextual response matching query complexity"
+        )
+        crews[kind] = Crew(
+            agents=[specialist],
+            tasks=[billing_task],
+            step_callback=_forward_step,
+            verbose=False
+        )
+    return crews[kind]
+
+# Questions answered by the templated bill summary (or the short crew in "llm" mode)
+SIMPLE_QUERY_KEYWORDS = [
+    "what's my bill", "whats my bill", "how much", "bill amount",
+    "what do i owe", "current bill", "this month"
+]
+
+def is_simple_query(query):
+    query_lower = query.lower()
+    return any(keyword in query_lower for keyword in SIMPLE_QUERY_KEYWORDS)
 
 def get_customer_billing_details(customer_id):
     """Fetch customer billing data from database
@@ -47,13 +110,16 @@ def get_customer_billing_details(customer_id):
         customer_id: Unique customer identifier
         
     Returns:
-        Tuple of customer and billing details
+        Tuple of (customer, plan, latest usage) dicts, or None if the customer
+        does not exist; plan and usage are None when missing
     """
     sql = """
     SELECT c.name, c.email, c.service_plan_id,
+           p.name, p.monthly_cost, p.data_limit_gb, p.voice_minutes, p.sms_count,
+           p.unlimited_data, p.unlimited_voice, p.unlimited_sms,
+           u.billing_period_start, u.billing_period_end,
            u.data_used_gb, u.voice_minutes_used, u.sms_count_used,
-           u.additional_charges, u.total_bill_amount,
-           p.monthly_cost, p.data_limit_gb, p.voice_minutes, p.sms_count
+           u.additional_charges, u.total_bill_amount
     FROM customers c
     LEFT JOIN customer_usage u ON c.customer_id = u.customer_id
     LEFT JOIN service_plans p ON c.service_plan_id = p.plan_id
@@ -62,77 +128,93 @@ def get_customer_billing_details(customer_id):
     LIMIT 1;
     """
     row = db.query_one(sql, [customer_id])
-    return row
+    if not row:
+        return None
+    customer = {"name": row[0], "email": row[1], "service_plan_id": row[2]}
+    plan = dict(zip(["name", "monthly_cost", "data_limit_gb", "voice_minutes", "sms_count",
+                     "unlimited_data", "unlimited_voice", "unlimited_sms"], row[3:11]))
+    usage = usage_from_row(row[11:])
+    return (customer, plan if plan["monthly_cost"] is not None else None,
+            usage if usage["billing_period_end"] is not None else None)
+
+def billing_details_from_context(customer_context, customer_id):
+    """Build the get_customer_billing_details result from a preloaded customer context
+    
+    Returns:
+        Same (customer, plan, usage) layout as get_customer_billing_details, or None
+        if the context does not belong to this customer
+    """
+    if not customer_context or customer_context.get("customer_id") != customer_id:
+        return None
+    customer = customer_context.get("customer")
+    if not customer:
+        return None
+    return customer, customer_context.get("plan"), customer_context.get("latest_usage")
 
-def process_billing_query(query, customer_id):
-    """Process billing query using CrewAI agents with context-awareness
+def previous_usage(customer_id, usage_history=None):
+    """Usage of the period before the latest one (for month-over-month), or None
+    
+    usage_history is the prefetched get_usage_history result; the DB is read only without it.
+    """
+    history = usage_history if usage_history is not None else get_usage_history(customer_id)
+    return usage_from_row(history[1]) if history and len(history) > 1 else None
+
+def process_billing_query(query, customer_id, customer_context=None, on_token=None, usage_history=None):
+    """Process billing query: computed locally, narrated by CrewAI only when needed
+    
+    Overage, plan deltas and month-over-month change are computed by
+    billing_calculator. Simple "what's my bill" questions get a templated answer
+    with no LLM call (BILLING_ANSWER_MODE=auto); detailed ones pass the computed
+    facts to the billing crew.
     
     Args:
         query: User's billing question
         customer_id: Customer identifier
+        customer_context: Optional context from load_customer_context (skips the DB lookup)
+        on_token: Optional callback receiving the answer as soon as the agent finishes a step
+        usage_history: Optional prefetched get_usage_history rows (skips the DB lookup)
         
     Returns:
-        AI-generated response tailored to query complexity
+        Response tailored to query complexity
     """
-    db_data = get_customer_billing_details(customer_id)
+    details = billing_details_from_context(customer_context, customer_id)
+    if details is None:
+        details = get_customer_billing_details(customer_id)
     
-    if not db_data:
+    if not details:
         return "Could not find billing records for this customer."
+    customer, plan, usage = details
     
-    billing_dict = {
-        "name": db_data[0],
-        "email": db_data[1],
-        "service_plan_id": db_data[2],
-        "data_used_gb": db_data[3],
-        "voice_minutes_used": db_data[4],
-        "sms_count_used": db_data[5],
-        "additional_charges": db_data[6],
-        "total_bill_amount": db_data[7],
-        "monthly_cost": db_data[8],
-        "data_limit_gb": db_data[9],
-        "voice_minutes": db_data[10],
-        "sms_count": db_data[11]
-    }
-    
-    # Detect query type for context-aware response
-    query_lower = query.lower()
-    is_simple_query = any(keyword in query_lower for keyword in [
-        "what's my bill", "whats my bill", "how much", "bill amount", 
-        "what do i owe", "current bill", "this month"
-    ])
-    
-    if is_simple_query:
-        task_desc = f"""Customer asked: "{query}"
-
-This is a SIMPLE query asking for bill amount.
-
-Provide a SHORT, DIRECT response:
-1. Total bill amount: ${billing_dict['total_bill_amount']}
-2. Brief breakdown (base + extras)
-3. MAX 5 lines total
-
-DO NOT provide lengthy analysis!
-
-Data: {billing_dict}"""
-    else:
-        task_desc = f"""Customer asked: "{query}"
-
-Provide thorough billing analysis.
-
-Data: {billing_dict}"""
+    facts = compute_bill(plan, usage, previous_usage(customer_id, usage_history) if usage else None)
+    simple = is_simple_query(query)
     
-    billing_task = Task(
-        description=task_desc,
-        agent=billing_specialist,
-        expected_output="Contextual response matching query complexity"
-    )
+    if simple and config.BILLING_ANSWER_MODE.lower() == "auto":
+        metrics.increment("billing.templated")
+        answer = format_simple_answer(facts, customer["name"])
+        if on_token:
+            on_token(answer)
+        return answer
+    metrics.increment("billing.narrated")
     
-    crew = Crew(
-        agents=[billing_specialist],
-        tasks=[billing_task],
-        verbose=False
-    )
+    with llm_timer("billing", "setup"):
+        crew = get_billing_crew("simple" if simple else "detailed")
     
-    result = crew.kickoff(inputs={"query": query, "billing_data": billing_dict})
+    _stream_target.on_token = on_token
+    try:
+        with llm_timer("billing", "model"):
+            result = crew.kickoff(inputs={
+                "query": query,
+                "billing_data": f"Customer: {customer['name']}\n{format_facts(facts)}",
+                "total_bill_amount": f"{facts['total']:.2f}" if facts["total"] is not None else "not billed yet"
+            })
+    finally:
+        _stream_target.on_token = None
     return str(result)
 
+async def aprocess_billing_query(query, customer_id, customer_context=None, on_token=None, usage_history=None):
+    """Async process_billing_query
+    
+    The crew runs on the shared worker pool (CrewAI's kickoff_async is itself a
+    thread offload), so each worker keeps its own thread-local crew templates.
+    """
+    return await run_in_thread(process_billing_query, query, customer_id, customer_context, on_token, usage_history)
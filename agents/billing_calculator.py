@@ -0,0 +1,166 @@
+"""
+Billing Calculator - Deterministic bill breakdown from customer_usage and service_plans.
+Simple bill questions are answered from a template; the LLM only narrates precomputed facts.
+"""
+
+# (dimension, usage column, plan limit column, plan unlimited flag, unit)
+DIMENSIONS = [
+    ("data", "data_used_gb", "data_limit_gb", "unlimited_data", "GB"),
+    ("voice", "voice_minutes_used", "voice_minutes", "unlimited_voice", "minutes"),
+    ("sms", "sms_count_used", "sms_count", "unlimited_sms", "SMS"),
+]
+
+LABELS = {"data": "Data", "voice": "Voice", "sms": "SMS"}
+
+USAGE_COLUMNS = ["billing_period_start", "billing_period_end", "data_used_gb", "voice_minutes_used",
+                 "sms_count_used", "additional_charges", "total_bill_amount"]
+
+
+def usage_from_row(row):
+    """Usage dict from a get_usage_history row (same column order)."""
+    return dict(zip(USAGE_COLUMNS, row)) if row else None
+
+
+def _number(value):
+    return float(value) if value is not None else None
+
+
+def _change(current, previous):
+    if current is None or previous is None:
+        return None
+    change = {"previous": previous, "change": current - previous}
+    change["change_pct"] = (current - previous) / previous * 100 if previous else None
+    return change
+
+
+def compute_dimension(usage, plan, used_column, limit_column, unlimited_column):
+    """Usage against the plan limit for one dimension; delta is used minus limit (None when unlimited)."""
+    used = _number(usage.get(used_column)) if usage else None
+    unlimited = bool(plan.get(unlimited_column)) if plan else False
+    limit = None if unlimited or not plan else _number(plan.get(limit_column))
+    delta = used - limit if used is not None and limit is not None else None
+    return {
+        "used": used,
+        "limit": limit,
+        "unlimited": unlimited,
+        "delta": delta,
+        "overage": max(delta, 0.0) if delta is not None else 0.0,
+        "percent_used": used / limit * 100 if delta is not None and limit else None,
+    }
+
+
+def compute_bill(plan, usage, previous_usage=None):
+    """
+    Bill facts for the latest period.
+
+    base is the plan's monthly cost, extras the period's additional charges and total
+    the billed amount (base + extras when the period has no stored total yet).
+    month_over_month compares against previous_usage when given.
+    """
+    plan = plan or {}
+    base = _number(plan.get("monthly_cost"))
+    extras = _number(usage.get("additional_charges")) if usage else None
+    total = _number(usage.get("total_bill_amount")) if usage else None
+    if total is None and usage and base is not None:
+        total = base + (extras or 0.0)
+
+    facts = {
+        "plan_name": plan.get("name"),
+        "billing_period_start": usage.get("billing_period_start") if usage else None,
+        "billing_period_end": usage.get("billing_period_end") if usage else None,
+        "base": base,
+        "extras": extras or 0.0,
+        "total": total,
+        "dimensions": {},
+        "month_over_month": None,
+    }
+    for name, used_column, limit_column, unlimited_column, unit in DIMENSIONS:
+        facts["dimensions"][name] = dict(compute_dimension(usage, plan, used_column, limit_column, unlimited_column),
+                                         unit=unit)
+
+    if usage and previous_usage:
+        mom = {"total": _change(total, _number(previous_usage.get("total_bill_amount"))),
+               "extras": _change(extras or 0.0, _number(previous_usage.get("additional_charges")) or 0.0)}
+        for name, used_column, _, _, _ in DIMENSIONS:
+            mom[name] = _change(facts["dimensions"][name]["used"], _number(previous_usage.get(used_column)))
+        facts["month_over_month"] = mom
+    return facts
+
+
+def _money(value):
+    return f"${value:,.2f}"
+
+
+def _amount(value, unit, sign=""):
+    return f"{value:{sign},.1f} {unit}" if unit == "GB" else f"{value:{sign},.0f} {unit}"
+
+
+def _overages(facts):
+    """e.g. ['2.5 GB of data', '120 minutes']"""
+    return [_amount(d["overage"], d["unit"]) + (" of data" if name == "data" else "")
+            for name, d in facts["dimensions"].items() if d["overage"] > 0]
+
+
+def format_simple_answer(facts, customer_name=None):
+    """Short templated answer to 'what's my bill' style questions."""
+    names = (customer_name or "").split()
+    greeting = f"Hi {names[0]}, " if names else ""
+    if facts["total"] is None:
+        line = f"{greeting}there is no bill for the current period yet."
+        if facts["base"] is not None:
+            line += f" Your plan costs {_money(facts['base'])}/month."
+        return line
+
+    plan = f" ({facts['plan_name']})" if facts["plan_name"] else ""
+    lines = [f"{greeting}your current bill is **{_money(facts['total'])}**."]
+    if facts["base"] is not None:
+        lines.append(f"- Base plan{plan}: {_money(facts['base'])}")
+    lines.append(f"- Additional charges: {_money(facts['extras'])}")
+
+    overages = _overages(facts)
+    lines.append(f"Over your plan limits by {', '.join(overages)}." if overages
+                 else "All usage is within your plan limits.")
+
+    change = (facts["month_over_month"] or {}).get("total")
+    if change and change["change"]:
+        direction = "up" if change["change"] > 0 else "down"
+        pct = f" ({change['change_pct']:+.1f}%)" if change["change_pct"] is not None else ""
+        lines.append(f"That's {direction} {_money(abs(change['change']))}{pct} from last period.")
+    elif change:
+        lines.append("That's the same as last period.")
+    return "\n".join(lines)
+
+
+def format_facts(facts):
+    """Plain-text fact sheet handed to the LLM for detailed questions."""
+    lines = [
+        f"Plan: {facts['plan_name'] or 'unknown'}",
+        f"Billing period: {facts['billing_period_start']} to {facts['billing_period_end']}",
+        f"Base plan cost: {_money(facts['base']) if facts['base'] is not None else 'unknown'}",
+        f"Additional charges: {_money(facts['extras'])}",
+        f"Total bill: {_money(facts['total']) if facts['total'] is not None else 'not billed yet'}",
+    ]
+    for name, d in facts["dimensions"].items():
+        if d["used"] is None:
+            continue
+        if d["unlimited"]:
+            lines.append(f"{LABELS[name]} usage: {_amount(d['used'], d['unit'])} (unlimited plan)")
+        elif d["limit"] is None:
+            lines.append(f"{LABELS[name]} usage: {_amount(d['used'], d['unit'])} (no limit on record)")
+        else:
+            status = (f"over by {_amount(d['delta'], d['unit'])}" if d["delta"] > 0
+                      else f"{_amount(-d['delta'], d['unit'])} remaining")
+            pct = f", {d['percent_used']:.0f}% used" if d["percent_used"] is not None else ""
+            lines.append(f"{LABELS[name]} usage: {_amount(d['used'], d['unit'])} of "
+                         f"{_amount(d['limit'], d['unit'])} ({status}{pct})")
+
+    mom = facts["month_over_month"]
+    if mom:
+        for key, label in [("total", "Total bill"), ("extras", "Additional charges")]:
+            if mom[key]:
+                pct = f" ({mom[key]['change_pct']:+.1f}%)" if mom[key]["change_pct"] is not None else ""
+                lines.append(f"{label} vs last period: {mom[key]['change']:+,.2f}{pct}")
+        for name, _, _, _, unit in DIMENSIONS:
+            if mom[name]:
+                lines.append(f"{LABELS[name]} usage vs last period: {_amount(mom[name]['change'], unit, '+')}")
+    return "\n".join(lines)
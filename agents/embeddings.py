@@ -0,0 +1,179 @@
+"""
+Embedding Backends - Pluggable embedding model for the knowledge base.
+OpenAI or a local CPU model, batched, behind an on-disk cache keyed by text hash.
+"""
+
+import hashlib
+import re
+import threading
+from array import array
+
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from llama_index.embeddings.openai import OpenAIEmbedding
+from pydantic import PrivateAttr
+
+from config.config import config
+from agents.llm import get_http_client
+from utils.database import ConnectionPool
+from utils.metrics import metrics
+from utils.tracing import record_cache
+
+BACKENDS = ("openai", "local")
+
+_lock = threading.Lock()
+_embed_models = {}
+
+
+class EmbeddingCache:
+    """SQLite table of vectors keyed by sha256(model, kind, text); vectors stored as float32."""
+
+    # Stay under SQLite's bound-parameter limit
+    _CHUNK = 500
+
+    def __init__(self, path):
+        self.pool = ConnectionPool(path)
+        with self.pool.connection() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+            conn.commit()
+
+    @staticmethod
+    def key(model, kind, text):
+        return hashlib.sha256(f"{model}\0{kind}\0{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys):
+        """Map of key -> vector for the keys that are cached."""
+        found = {}
+        keys = list(keys)
+        with self.pool.connection() as conn:
+            for i in range(0, len(keys), self._CHUNK):
+                chunk = keys[i:i + self._CHUNK]
+                rows = conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = array("f", blob).tolist()
+        return found
+
+    def put_many(self, items):
+        """Store (key, vector) pairs."""
+        with self.pool.connection() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, array("f", vector).tobytes()) for key, vector in items]
+            )
+            conn.commit()
+
+    def close(self):
+        self.pool.close_all()
+
+
+class CachedEmbedding(BaseEmbedding):
+    """
+    Wraps an embedding model with an EmbeddingCache.
+    Batches only the cache misses through the wrapped model, so re-ingesting
+    unchanged chunks and repeated questions cost a SQLite lookup instead of a model call.
+    """
+
+    _inner: BaseEmbedding = PrivateAttr()
+    _cache: EmbeddingCache = PrivateAttr()
+
+    def __init__(self, inner, cache, **kwargs):
+        super().__init__(model_name=inner.model_name, embed_batch_size=inner.embed_batch_size, **kwargs)
+        self._inner = inner
+        self._cache = cache
+
+    @classmethod
+    def class_name(cls):
+        return "CachedEmbedding"
+
+    def _lookup(self, kind, texts):
+        keys = [EmbeddingCache.key(self.model_name, kind, text) for text in texts]
+        found = self._cache.get_many(set(keys))
+        misses = [i for i, key in enumerate(keys) if key not in found]
+        metrics.increment("embedding.cache_hits", len(texts) - len(misses))
+        metrics.increment("embedding.cache_misses", len(misses))
+        record_cache("embedding", hits=len(texts) - len(misses), misses=len(misses))
+        return keys, found, misses
+
+    def _fill(self, keys, found, misses, vectors):
+        self._cache.put_many([(keys[i], vector) for i, vector in zip(misses, vectors)])
+        found.update({keys[i]: vector for i, vector in zip(misses, vectors)})
+        return [found[key] for key in keys]
+
+    def _get_query_embedding(self, query):
+        keys, found, misses = self._lookup("query", [query])
+        vectors = [self._inner.get_query_embedding(query)] if misses else []
+        return self._fill(keys, found, misses, vectors)[0]
+
+    async def _aget_query_embedding(self, query):
+        keys, found, misses = self._lookup("query", [query])
+        vectors = [await self._inner.aget_query_embedding(query)] if misses else []
+        return self._fill(keys, found, misses, vectors)[0]
+
+    def _get_text_embedding(self, text):
+        return self._get_text_embeddings([text])[0]
+
+    def _get_text_embeddings(self, texts):
+        keys, found, misses = self._lookup("text", texts)
+        vectors = self._inner.get_text_embedding_batch([texts[i] for i in misses]) if misses else []
+        return self._fill(keys, found, misses, vectors)
+
+    async def _aget_text_embeddings(self, texts):
+        keys, found, misses = self._lookup("text", texts)
+        vectors = await self._inner.aget_text_embedding_batch([texts[i] for i in misses]) if misses else []
+        return self._fill(keys, found, misses, vectors)
+
+
+def _openai_embed_model():
+    """OpenAI embeddings on the process-wide keep-alive HTTP pool."""
+    return OpenAIEmbedding(api_key=config.OPENAI_API_KEY, api_base=config.OPENAI_BASE_URL,
+                           http_client=get_http_client(), embed_batch_size=config.EMBEDDING_BATCH_SIZE)
+
+
+def _local_embed_model():
+    """sentence-transformers model on the CPU (optionally through ONNX Runtime)."""
+    try:
+        from llama_index.embeddings.huggingface import HuggingFaceEmbedding
+    except ImportError as e:
+        raise ImportError(
+            "EMBEDDING_BACKEND=local requires llama-index-embeddings-huggingface (sentence-transformers)"
+        ) from e
+
+    kwargs = {"backend": "onnx"} if config.LOCAL_EMBEDDING_ONNX else {}
+    return HuggingFaceEmbedding(model_name=config.LOCAL_EMBEDDING_MODEL, device=config.LOCAL_EMBEDDING_DEVICE,
+                                embed_batch_size=config.EMBEDDING_BATCH_SIZE, **kwargs)
+
+
+def create_embed_model(backend=None, cache_path=None):
+    """Build a (cached) embedding model for the backend; use get_embed_model for the shared one."""
+    backend = (backend or config.EMBEDDING_BACKEND).lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown EMBEDDING_BACKEND '{backend}' (expected one of {', '.join(BACKENDS)})")
+
+    model = _local_embed_model() if backend == "local" else _openai_embed_model()
+    if not config.EMBEDDING_CACHE_ENABLED:
+        return model
+    return CachedEmbedding(model, EmbeddingCache(cache_path or config.EMBEDDING_CACHE_PATH))
+
+
+def get_embed_model(backend=None):
+    """Process-wide embedding model for the backend (loading a local model is expensive)."""
+    backend = (backend or config.EMBEDDING_BACKEND).lower()
+    if backend not in _embed_models:
+        with _lock:
+            if backend not in _embed_models:
+                _embed_models[backend] = create_embed_model(backend)
+    return _embed_models[backend]
+
+
+def collection_name(backend=None):
+    """
+    Chroma collection for the backend.
+    Vectors from different models aren't comparable (or even the same size),
+    so each local model gets its own collection next to the OpenAI one.
+    """
+    backend = (backend or config.EMBEDDING_BACKEND).lower()
+    if backend == "openai":
+        return config.KNOWLEDGE_COLLECTION
+    slug = re.sub(r"[^a-z0-9]+", "_", config.LOCAL_EMBEDDING_MODEL.lower()).strip("_")
+    return f"{config.KNOWLEDGE_COLLECTION}_local_{slug}"[:63].rstrip("_")
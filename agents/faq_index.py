@@ -0,0 +1,134 @@
+"""
+FAQ Index - Question-to-answer index over the FAQ/guide documents.
+Strong matches are answered extractively, without retrieval synthesis by the LLM.
+"""
+
+import json
+import math
+import os
+import re
+from collections import Counter
+
+from config.config import config
+from agents.hybrid_retrieval import tokenize
+
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+
+# Question words and generic verbs carry no topic; dropping them keeps "How do I set up APN?"
+# from matching every "How do I set up ..." question
+STOPWORDS = {
+    "a", "an", "and", "are", "can", "do", "does", "for", "from", "how", "i", "if", "in", "is", "it",
+    "me", "my", "of", "on", "or", "the", "there", "this", "to", "what", "when", "where", "which",
+    "why", "will", "with", "you", "your", "s", "am", "be", "should", "could", "would", "any", "get",
+    "m", "ve", "ll", "d", "t", "did", "was", "have", "has", "at", "by", "about", "up", "set", "check",
+    "see", "find", "know", "tell", "need", "want", "please", "help", "way", "much", "many", "use",
+}
+
+
+def faq_path_for(chroma_path):
+    """FAQ index file (rebuilt by ingest when the documents change)."""
+    return os.path.join(chroma_path, "faq_index.json")
+
+
+def terms(text):
+    """Topic terms of a question: tokens without stopwords, plurals folded."""
+    return [t[:-1] if len(t) > 3 and t.endswith("s") and not t.endswith("ss") else t
+            for t in tokenize(text) if t not in STOPWORDS]
+
+
+def parse_entries(text, file_name):
+    """
+    Split a markdown document into question/answer entries.
+    Every heading below the document/section level (### and deeper) is a question;
+    its answer is the text up to the next heading of the same or a higher level.
+    """
+    lines = text.splitlines()
+    headings = []
+    for i, line in enumerate(lines):
+        match = _HEADING_RE.match(line)
+        if match:
+            headings.append((i, len(match.group(1)), match.group(2)))
+
+    entries = []
+    section = ""
+    for n, (line_no, level, title) in enumerate(headings):
+        if level <= 2:
+            section = title
+            continue
+        end = next((j for j, lvl, _ in headings[n + 1:] if lvl <= level), len(lines))
+        answer = "\n".join(lines[line_no + 1:end]).strip()
+        if answer:
+            entries.append({"question": title.rstrip(":"), "answer": answer,
+                            "section": section, "file_name": file_name})
+    return entries
+
+
+def parse_documents(documents_path=None, file_names=None):
+    documents_path = documents_path or config.DOCUMENTS_PATH
+    entries = []
+    for name in file_names if file_names is not None else config.FAQ_DOCUMENTS:
+        path = os.path.join(documents_path, name)
+        if os.path.isfile(path):
+            with open(path, encoding="utf-8") as f:
+                entries.extend(parse_entries(f.read(), name))
+    return entries
+
+
+class FAQIndex:
+    """
+    TF-IDF vectors over the entry questions; a query matches by cosine similarity,
+    scaled by the share of the query's topic weight the question covers.
+    Scores are in [0, 1], so one threshold works across documents.
+    """
+
+    def __init__(self, entries):
+        self.entries = entries
+        questions = [Counter(terms(entry["question"])) for entry in entries]
+        df = Counter(term for question in questions for term in question)
+        n = len(entries)
+        self.idf = {term: math.log((1 + n) / (1 + count)) + 1 for term, count in df.items()}
+        self.vectors = [self._weigh(question) for question in questions]
+
+    @classmethod
+    def build(cls, documents_path=None, file_names=None):
+        return cls(parse_documents(documents_path, file_names))
+
+    def _weigh(self, counts):
+        # Terms unseen in any question get the maximum IDF: they make a match less likely, not more
+        default_idf = max(self.idf.values(), default=1.0)
+        vector = {term: tf * self.idf.get(term, default_idf) for term, tf in counts.items()}
+        norm = math.sqrt(sum(w * w for w in vector.values())) or 1.0
+        return {term: w / norm for term, w in vector.items()}
+
+    def match(self, query, threshold=None):
+        """Best (entry, score) if its similarity reaches the threshold, else None."""
+        threshold = config.FAQ_MATCH_THRESHOLD if threshold is None else threshold
+        query_vector = self._weigh(Counter(terms(query)))
+        best, best_score = None, 0.0
+        for entry, vector in zip(self.entries, self.vectors):
+            shared = [term for term in query_vector if term in vector]
+            if not shared:
+                continue
+            # Query topics the question lacks ("data" against "Check Balance and Usage") cost twice
+            cosine = sum(query_vector[term] * vector[term] for term in shared)
+            coverage = sum(query_vector[term] ** 2 for term in shared)
+            score = cosine * coverage
+            if score > best_score:
+                best, best_score = entry, score
+        return (best, best_score) if best is not None and best_score >= threshold else None
+
+    def save(self, path):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"entries": self.entries}, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls(json.load(f)["entries"])
+
+
+def format_answer(entry):
+    """The matched passage, with its source so the extractive answer stays traceable."""
+    return f"{entry['answer']}\n\n*Source: {entry['file_name']} - {entry['question']}*"
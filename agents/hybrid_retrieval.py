@@ -0,0 +1,209 @@
+"""
+Hybrid Retrieval - BM25 keyword search fused with Chroma vector search.
+Reciprocal-rank fusion plus an optional local cross-encoder rerank stage.
+"""
+
+import json
+import math
+import os
+import re
+import time
+from collections import Counter
+
+from llama_index.core import QueryBundle
+from llama_index.core.retrievers import BaseRetriever
+from llama_index.core.schema import NodeWithScore, TextNode
+
+from config.config import config
+from utils.metrics import metrics
+
+# Keeps telecom terms like "internet.teleserve.co.in", "*21*", "5g" and "ipv4/ipv6" parts as tokens
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[._-][a-z0-9]+)*")
+
+
+def tokenize(text):
+    return _TOKEN_RE.findall(text.lower())
+
+
+def bm25_path_for(chroma_path, collection_name):
+    """BM25 index file for a collection (rebuilt by ingest alongside the vectors)."""
+    return os.path.join(chroma_path, f"{collection_name}_bm25.json")
+
+
+class BM25Index:
+    """
+    Okapi BM25 over document chunks with a precomputed inverted index.
+    Postings map each term to (chunk, term frequency) pairs, so a query
+    only touches the chunks that contain its terms.
+    """
+
+    def __init__(self, chunks, postings, doc_lengths, k1=1.5, b=0.75):
+        self.chunks = chunks  # [{"id", "text", "metadata"}]
+        self.postings = postings  # term -> [[chunk index, tf], ...]
+        self.doc_lengths = doc_lengths
+        self.k1 = k1
+        self.b = b
+        self.avg_length = sum(doc_lengths) / len(doc_lengths) if doc_lengths else 0.0
+
+    @classmethod
+    def build(cls, chunks, k1=1.5, b=0.75):
+        """Index chunks given as dicts with id, text and metadata."""
+        postings = {}
+        doc_lengths = []
+        for i, chunk in enumerate(chunks):
+            terms = Counter(tokenize(chunk["text"]))
+            doc_lengths.append(sum(terms.values()))
+            for term, tf in terms.items():
+                postings.setdefault(term, []).append([i, tf])
+        return cls(chunks, postings, doc_lengths, k1=k1, b=b)
+
+    @classmethod
+    def from_collection(cls, collection):
+        """Index every chunk stored in a Chroma collection (ids match the vector store's node ids)."""
+        stored = collection.get(include=["documents", "metadatas"])
+        chunks = [
+            {"id": node_id, "text": text or "", "metadata": _public_metadata(metadata)}
+            for node_id, text, metadata in zip(stored["ids"], stored["documents"], stored["metadatas"])
+        ]
+        return cls.build(chunks)
+
+    def save(self, path):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"k1": self.k1, "b": self.b, "chunks": self.chunks,
+                       "postings": self.postings, "doc_lengths": self.doc_lengths}, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            data = json.load(f)
+        return cls(data["chunks"], data["postings"], data["doc_lengths"], k1=data["k1"], b=data["b"])
+
+    def search(self, query, top_k=10):
+        """Top chunks as [(chunk index, score)], best first."""
+        n = len(self.chunks)
+        scores = {}
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for i, tf in postings:
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[i] / self.avg_length)
+                scores[i] = scores.get(i, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+
+    def retrieve(self, query, top_k=10):
+        """search() as NodeWithScore, so BM25 hits can be fused with vector hits."""
+        return [
+            NodeWithScore(node=TextNode(id_=self.chunks[i]["id"], text=self.chunks[i]["text"],
+                                        metadata=self.chunks[i]["metadata"]), score=score)
+            for i, score in self.search(query, top_k)
+        ]
+
+
+def _public_metadata(metadata):
+    # Chroma rows carry LlamaIndex bookkeeping (_node_content, doc ids); keep the document fields
+    return {k: v for k, v in (metadata or {}).items() if not k.startswith("_") and k not in ("doc_id", "ref_doc_id", "document_id")}
+
+
+def reciprocal_rank_fusion(result_lists, k=60):
+    """
+    Fuse ranked NodeWithScore lists: score(node) = sum of 1 / (k + rank).
+    Ranks (not raw scores) are combined, so BM25 and cosine scores need no calibration.
+    """
+    fused = {}
+    nodes = {}
+    for results in result_lists:
+        for rank, result in enumerate(results, start=1):
+            node_id = result.node.node_id
+            fused[node_id] = fused.get(node_id, 0.0) + 1.0 / (k + rank)
+            nodes.setdefault(node_id, result.node)
+    ranked = sorted(fused.items(), key=lambda item: item[1], reverse=True)
+    return [NodeWithScore(node=nodes[node_id], score=score) for node_id, score in ranked]
+
+
+def create_reranker(top_n):
+    """Local cross-encoder rerank stage (needs sentence-transformers)."""
+    try:
+        from llama_index.core.postprocessor import SentenceTransformerRerank
+        return SentenceTransformerRerank(model=config.RERANK_MODEL, top_n=top_n, device=config.LOCAL_EMBEDDING_DEVICE)
+    except ImportError as e:
+        raise ImportError("RERANK_ENABLED requires sentence-transformers for the local cross-encoder") from e
+
+
+class HybridRetriever(BaseRetriever):
+    """
+    Dense (vector store) + sparse (BM25) retrieval fused with RRF, optionally reranked.
+    Each stage's latency is recorded as retrieval.<stage>_ms; last_timings holds the latest turn's.
+    """
+
+    def __init__(self, vector_retriever, bm25, top_k=None, candidates=None, rrf_k=None, reranker=None):
+        super().__init__()
+        self.vector_retriever = vector_retriever
+        self.bm25 = bm25
+        self.top_k = top_k or config.RETRIEVAL_TOP_K
+        self.candidates = candidates or config.RETRIEVAL_CANDIDATES
+        self.rrf_k = rrf_k or config.RRF_K
+        self.reranker = reranker
+        self.last_timings = {}
+
+    def _timed(self, stage, timings, start):
+        timings[stage] = (time.perf_counter() - start) * 1000
+        metrics.observe(f"retrieval.{stage}_ms", timings[stage])
+
+    def _fuse(self, query_bundle, dense, timings):
+        start = time.perf_counter()
+        sparse = self.bm25.retrieve(query_bundle.query_str, self.candidates) if self.bm25 else []
+        self._timed("bm25", timings, start)
+
+        start = time.perf_counter()
+        fused = reciprocal_rank_fusion([dense, sparse], k=self.rrf_k)
+        self._timed("fusion", timings, start)
+
+        if self.reranker is not None:
+            start = time.perf_counter()
+            fused = self.reranker.postprocess_nodes(fused, query_bundle=query_bundle)
+            self._timed("rerank", timings, start)
+
+        self.last_timings = timings
+        return fused[:self.top_k]
+
+    def _retrieve(self, query_bundle: QueryBundle):
+        timings = {}
+        start = time.perf_counter()
+        dense = self.vector_retriever.retrieve(query_bundle)
+        self._timed("dense", timings, start)
+        return self._fuse(query_bundle, dense, timings)
+
+    async def _aretrieve(self, query_bundle: QueryBundle):
+        timings = {}
+        start = time.perf_counter()
+        dense = await self.vector_retriever.aretrieve(query_bundle)
+        self._timed("dense", timings, start)
+        return self._fuse(query_bundle, dense, timings)
+
+
+def create_retriever(index, collection_name, chroma_path=None, mode=None, rerank=None):
+    """
+    Retriever for the knowledge query engines.
+    'vector' is plain similarity search; 'hybrid' adds BM25 + RRF when the BM25 index exists.
+    """
+    mode = (mode or config.RETRIEVAL_MODE).lower()
+    rerank = config.RERANK_ENABLED if rerank is None else rerank
+    if mode != "hybrid":
+        return index.as_retriever(similarity_top_k=config.RETRIEVAL_TOP_K)
+
+    path = bm25_path_for(chroma_path or config.CHROMA_PATH, collection_name)
+    try:
+        bm25 = BM25Index.load(path)
+    except (OSError, ValueError) as e:
+        print(f"BM25 index unavailable ({e}); using vector retrieval only")
+        return index.as_retriever(similarity_top_k=config.RETRIEVAL_TOP_K)
+
+    return HybridRetriever(
+        index.as_retriever(similarity_top_k=config.RETRIEVAL_CANDIDATES),
+        bm25,
+        reranker=create_reranker(config.RETRIEVAL_TOP_K) if rerank else None,
+    )
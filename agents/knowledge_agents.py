@@ -4,68 +4,159 @@ Retrieves answers from telecom documentation using semantic search.
 """
 
 
-from llama_index.core import VectorStoreIndex, SimpleDirectoryReader, StorageContext, Settings
+from llama_index.core import VectorStoreIndex, Settings
+from llama_index.core.query_engine import RetrieverQueryEngine
 from llama_index.vector_stores.chroma import ChromaVectorStore
 from llama_index.llms.openai import OpenAI
-from llama_index.embeddings.openai import OpenAIEmbedding
 import chromadb
 from config.config import config
+from agents.llm import get_http_client, llm_timer
+from agents.embeddings import get_embed_model, collection_name
+from agents.knowledge_ingest import ingest
+from agents.hybrid_retrieval import create_retriever
+from agents.faq_index import FAQIndex, faq_path_for, format_answer
+from utils.concurrency import run_in_thread
+from utils.metrics import metrics
 import os
+import threading
 
 # Global variables for lazy loading
 _query_engine = None
+_streaming_query_engine = None
 _initialized = False
+_init_lock = threading.Lock()
+_faq_index = None
+_faq_mtime = None
 
-def _initialize_knowledge_base():
-    """Initialize the knowledge base (called only when needed)."""
-    global _query_engine, _initialized
+def _initialize_knowledge_base(streaming=False):
+    """Initialize the knowledge base (called only when needed).
     
-    if _initialized:
-        return _query_engine
+    Returns the streaming query engine when streaming is set.
+    """
+    if not _initialized:
+        # Concurrent first queries must not build the collection twice
+        with _init_lock:
+            if not _initialized:
+                _build_query_engines()
+    return _streaming_query_engine if streaming else _query_engine
+
+def _build_query_engines():
+    """Configure LlamaIndex, sync the Chroma collection with the documents and create the query engines."""
+    global _query_engine, _streaming_query_engine, _initialized
     
     # Configure LlamaIndex settings
-    Settings.llm = OpenAI(model="gpt-4o", api_key=config.OPENAI_API_KEY, temperature=0)
-    Settings.embed_model = OpenAIEmbedding(api_key=config.OPENAI_API_KEY)
-    
-    # Initialize Chroma client
-    chroma_client = chromadb.PersistentClient(path=config.CHROMA_PATH)
+    # Share the process-wide keep-alive HTTP pool with the other agents
+    Settings.llm = OpenAI(model=config.LLM_MODEL, api_key=config.OPENAI_API_KEY, api_base=config.OPENAI_BASE_URL,
+                          temperature=0, http_client=get_http_client())
+    # Pluggable backend (config.EMBEDDING_BACKEND); query embeddings go through the same cache
+    Settings.embed_model = get_embed_model()
     
-    # Get or create collection
+    # Sync the collection with data/documents: only new or edited files are embedded
     try:
-        chroma_collection = chroma_client.get_collection("telecom_docs")
-    except:
-        # If collection doesn't exist, create it and load documents
-        chroma_collection = chroma_client.create_collection("telecom_docs")
-        
-        # Load documents
-        if os.path.exists(config.DOCUMENTS_PATH):
-            documents = SimpleDirectoryReader(config.DOCUMENTS_PATH).load_data()
-            
-            # Create vector store and index
-            vector_store = ChromaVectorStore(chroma_collection=chroma_collection)
-            storage_context = StorageContext.from_defaults(vector_store=vector_store)
-            
-            # Build index
-            VectorStoreIndex.from_documents(
-                documents, 
-                storage_context=storage_context
-            )
+        stats = ingest(embed_model=Settings.embed_model)
+        if stats["added"] or stats["changed"] or stats["deleted"]:
+            print(f"Knowledge base updated: {stats['chunks_embedded']} chunk(s) embedded "
+                  f"in {stats['elapsed_ms']:.0f}ms")
+    except Exception as e:
+        # Serve from whatever is already indexed rather than failing the query
+        print(f"Knowledge base ingestion failed: {e}")
+    
+    chroma_client = chromadb.PersistentClient(path=config.CHROMA_PATH)
+    chroma_collection = chroma_client.get_or_create_collection(collection_name())
     
     # Create vector store from existing collection
     vector_store = ChromaVectorStore(chroma_collection=chroma_collection)
     index = VectorStoreIndex.from_vector_store(vector_store)
     
-    # Create query engine
-    _query_engine = index.as_query_engine(similarity_top_k=3)
+    # Hybrid BM25 + vector retrieval (config.RETRIEVAL_MODE); both engines share the retriever
+    retriever = create_retriever(index, chroma_collection.name)
+    _query_engine = RetrieverQueryEngine.from_args(retriever)
+    _streaming_query_engine = RetrieverQueryEngine.from_args(retriever, streaming=True)
     _initialized = True
+
+def _load_faq_index():
+    """FAQ index written by ingest (reloaded when it changes); parsed from the documents if missing."""
+    global _faq_index, _faq_mtime
+    path = faq_path_for(config.CHROMA_PATH)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        mtime = None
+    if _faq_index is None or (mtime is not None and mtime != _faq_mtime):
+        with _init_lock:
+            if _faq_index is None or (mtime is not None and mtime != _faq_mtime):
+                _faq_index = FAQIndex.load(path) if mtime is not None else FAQIndex.build()
+                _faq_mtime = mtime
+    return _faq_index
+
+def warm_up():
+    """Build the query engines and load the FAQ index ahead of the first knowledge question."""
+    _initialize_knowledge_base()
+    _load_faq_index()
+
+def extractive_answer(query):
+    """The FAQ passage answering the query verbatim, or None when no passage matches strongly enough."""
+    if config.KNOWLEDGE_ANSWER_MODE.lower() != "auto":
+        return None
+    try:
+        match = _load_faq_index().match(query)
+    except Exception as e:
+        print(f"FAQ index unavailable: {e}")
+        return None
+    if match is None:
+        metrics.increment("knowledge.synthesized")
+        return None
+    metrics.increment("knowledge.extractive")
+    return format_answer(match[0])
+
+def process_knowledge_query(query, on_token=None):
+    """Run the knowledge retrieval query using LlamaIndex.
+    
+    FAQ-style questions with a strong match are answered extractively (no LLM call);
+    on_token, when given, receives the answer incrementally from the streaming query engine.
+    """
+    answer = extractive_answer(query)
+    if answer is not None:
+        if on_token:
+            on_token(answer)
+        return answer
     
-    return _query_engine
+    try:
+        with llm_timer("knowledge", "setup"):
+            query_engine = _initialize_knowledge_base(streaming=on_token is not None)
+        with llm_timer("knowledge", "model"):
+            response = query_engine.query(query)
+            if on_token is None:
+                return str(response)
+            
+            chunks = []
+            for token in response.response_gen:
+                on_token(token)
+                chunks.append(token)
+            return "".join(chunks)
+    except Exception as e:
+        return f"Error processing knowledge query: {str(e)}"
 
-def process_knowledge_query(query):
-    """Run the knowledge retrieval query using LlamaIndex."""
+async def aprocess_knowledge_query(query, on_token=None):
+    """Async process_knowledge_query: retrieval and synthesis via the query engine's aquery."""
+    answer = extractive_answer(query)
+    if answer is not None:
+        if on_token:
+            on_token(answer)
+        return answer
+    
     try:
-        query_engine = _initialize_knowledge_base()
-        response = query_engine.query(query)
-        return str(response)
+        with llm_timer("knowledge", "setup"):
+            query_engine = await run_in_thread(_initialize_knowledge_base, on_token is not None)
+        with llm_timer("knowledge", "model"):
+            response = await query_engine.aquery(query)
+            if on_token is None:
+                return str(response)
+            
+            chunks = []
+            async for token in response.async_response_gen():
+                on_token(token)
+                chunks.append(token)
+            return "".join(chunks)
     except Exception as e:
         return f"Error processing knowledge query: {str(e)}"
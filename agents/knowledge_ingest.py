@@ -0,0 +1,206 @@
+"""
+Knowledge Ingestion - Keeps the Chroma document index in sync with data/documents.
+Tracks per-file content hashes and re-embeds only new or edited files.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+
+import chromadb
+from llama_index.core import VectorStoreIndex, SimpleDirectoryReader, StorageContext, Settings
+from llama_index.vector_stores.chroma import ChromaVectorStore
+
+from config.config import config
+from agents.embeddings import BACKENDS, collection_name as backend_collection, get_embed_model
+from agents.hybrid_retrieval import BM25Index, bm25_path_for
+from agents.faq_index import FAQIndex, faq_path_for
+from utils.metrics import metrics
+
+
+def file_hash(path):
+    """SHA-256 of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(65536), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def scan_documents(documents_path):
+    """Map of file name -> content hash for the files in documents_path."""
+    if not os.path.isdir(documents_path):
+        return {}
+    return {
+        name: file_hash(os.path.join(documents_path, name))
+        for name in sorted(os.listdir(documents_path))
+        if os.path.isfile(os.path.join(documents_path, name)) and not name.startswith(".")
+    }
+
+
+def manifest_path_for(chroma_path, collection_name):
+    """Manifest file for a collection (each embedding backend keeps its own)."""
+    return os.path.join(chroma_path, f"{collection_name}_manifest.json")
+
+
+def load_manifest(manifest_path):
+    try:
+        with open(manifest_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest_path, manifest):
+    """Write the manifest atomically so an interrupted run can't leave half a file."""
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+
+def _indexed_files(collection):
+    """File names that have vectors in the collection (for stores built before the manifest existed)."""
+    metadatas = collection.get(include=["metadatas"]).get("metadatas") or []
+    return {m["file_name"] for m in metadatas if m and m.get("file_name")}
+
+
+def plan_changes(manifest, current):
+    """Split files into added, changed, deleted and unchanged by comparing content hashes."""
+    added = sorted(name for name in current if name not in manifest)
+    changed = sorted(name for name in current if name in manifest and manifest[name]["sha256"] != current[name])
+    deleted = sorted(name for name in manifest if name not in current)
+    unchanged = sorted(name for name in current if name in manifest and manifest[name]["sha256"] == current[name])
+    return added, changed, deleted, unchanged
+
+
+def ingest(documents_path=None, chroma_path=None, collection_name=None, manifest_path=None,
+           embed_model=None, backend=None, rebuild=False):
+    """
+    Bring the Chroma collection up to date with the documents directory.
+
+    Vectors of deleted files are removed by file_name; new and edited files are
+    chunked and embedded, and an edited file's old vectors are dropped once its
+    new ones are stored. Unchanged files cost one hash each. The
+    BM25 keyword index and the FAQ index are rebuilt whenever files change.
+
+    Args:
+        backend: Embedding backend ('openai' or 'local'); picks the model and collection
+                 unless embed_model/collection_name are given
+        rebuild: Ignore the manifest and re-embed every file
+
+    Returns:
+        Dict with added/changed/deleted/unchanged file lists, chunks_embedded and elapsed_ms
+    """
+    documents_path = documents_path or config.DOCUMENTS_PATH
+    chroma_path = chroma_path or config.CHROMA_PATH
+    collection_name = collection_name or backend_collection(backend)
+    manifest_path = manifest_path or manifest_path_for(chroma_path, collection_name)
+    embed_model = embed_model or get_embed_model(backend)
+
+    start = time.perf_counter()
+    collection = chromadb.PersistentClient(path=chroma_path).get_or_create_collection(collection_name)
+
+    manifest = {} if rebuild else load_manifest(manifest_path)
+    if not manifest and collection.count():
+        # Store predates the manifest (or is being rebuilt): treat what's indexed as unknown content
+        manifest = {name: {"sha256": None} for name in _indexed_files(collection)}
+
+    current = scan_documents(documents_path)
+    added, changed, deleted, unchanged = plan_changes(manifest, current)
+
+    for name in deleted:
+        collection.delete(where={"file_name": name})
+        manifest.pop(name, None)
+
+    # Edited files keep their old vectors until the new ones are stored, so a failed
+    # embedding run (no API key, rate limit) leaves the previous index intact
+    stale_ids = set()
+    for name in changed:
+        stale_ids.update(collection.get(where={"file_name": name})["ids"])
+
+    chunks_embedded = 0
+    embed_seconds = 0.0
+    to_embed = added + changed
+    if to_embed:
+        documents = SimpleDirectoryReader(
+            input_files=[os.path.join(documents_path, name) for name in to_embed],
+            filename_as_id=True
+        ).load_data()
+        nodes = Settings.node_parser.get_nodes_from_documents(documents)
+
+        storage_context = StorageContext.from_defaults(vector_store=ChromaVectorStore(chroma_collection=collection))
+        embed_start = time.perf_counter()
+        VectorStoreIndex(nodes, storage_context=storage_context, embed_model=embed_model)
+        embed_seconds = time.perf_counter() - embed_start
+        chunks_embedded = len(nodes)
+        stale_ids -= {node.node_id for node in nodes}
+        if stale_ids:
+            collection.delete(ids=sorted(stale_ids))
+
+        chunk_counts = {}
+        for node in nodes:
+            name = node.metadata.get("file_name")
+            chunk_counts[name] = chunk_counts.get(name, 0) + 1
+        for name in to_embed:
+            manifest[name] = {"sha256": current[name], "chunks": chunk_counts.get(name, 0),
+                              "ingested_at": time.strftime("%Y-%m-%d %H:%M:%S")}
+
+    save_manifest(manifest_path, manifest)
+
+    # The BM25 index covers the same chunks as the vectors; re-tokenizing is cheap next to embedding
+    bm25_path = bm25_path_for(chroma_path, collection_name)
+    if added or changed or deleted or not os.path.exists(bm25_path):
+        BM25Index.from_collection(collection).save(bm25_path)
+
+    # FAQ question -> answer index for extractive answers (independent of the embedding backend)
+    faq_path = faq_path_for(chroma_path)
+    if added or changed or deleted or not os.path.exists(faq_path):
+        FAQIndex.build(documents_path).save(faq_path)
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    metrics.observe("knowledge.ingest_ms", elapsed_ms)
+    metrics.increment("knowledge.chunks_embedded", chunks_embedded)
+    return {
+        "added": added,
+        "changed": changed,
+        "deleted": deleted,
+        "unchanged": unchanged,
+        "chunks_embedded": chunks_embedded,
+        "chunks_per_second": chunks_embedded / embed_seconds if embed_seconds else 0.0,
+        "elapsed_ms": elapsed_ms,
+    }
+
+
+def format_report(stats):
+    lines = [
+        f"Added:     {len(stats['added'])} {', '.join(stats['added'])}".rstrip(),
+        f"Changed:   {len(stats['changed'])} {', '.join(stats['changed'])}".rstrip(),
+        f"Deleted:   {len(stats['deleted'])} {', '.join(stats['deleted'])}".rstrip(),
+        f"Unchanged: {len(stats['unchanged'])}",
+        f"Embedded {stats['chunks_embedded']} chunk(s) in {stats['elapsed_ms'] / 1000:.2f}s"
+        + (f" ({stats['chunks_per_second']:.1f} chunks/s)" if stats["chunks_embedded"] else ""),
+    ]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Knowledge base document index")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    ingest_parser = subcommands.add_parser("ingest", help="Embed new/edited documents and drop deleted ones")
+    ingest_parser.add_argument("--rebuild", action="store_true", help="Re-embed every document")
+    ingest_parser.add_argument("--documents", default=config.DOCUMENTS_PATH, help="Documents directory")
+    ingest_parser.add_argument("--backend", choices=BACKENDS, default=config.EMBEDDING_BACKEND,
+                               help="Embedding backend (each has its own collection)")
+    args = parser.parse_args(argv)
+
+    if args.command == "ingest":
+        stats = ingest(documents_path=args.documents, backend=args.backend, rebuild=args.rebuild)
+        print(format_report(stats))
+
+
+if __name__ == "__main__":
+    main()
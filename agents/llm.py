@@ -0,0 +1,187 @@
+"""
+LLM Clients - Process-wide OpenAI/LangChain clients shared by every agent.
+One keep-alive HTTP connection pool is reused across requests; setup and model time are recorded separately.
+"""
+
+import asyncio
+import inspect
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+
+import httpx
+from config.config import config
+from utils.metrics import metrics
+from utils.tracing import record_llm_usage, timed
+
+
+class SharedHTTPClient(httpx.Client):
+    """httpx client that survives deepcopy (AutoGen deep-copies llm_config) by sharing itself.
+
+    Every request is counted as an LLM call of the traced turn, with its tokens when reported.
+    """
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def send(self, request, **kwargs):
+        with timed("llm_calls", "llm_ms"):
+            response = super().send(request, **kwargs)
+        if not kwargs.get("stream"):
+            record_llm_usage(response)
+        return response
+
+
+class SharedAsyncHTTPClient(httpx.AsyncClient):
+    def __deepcopy__(self, memo):
+        return self
+
+    async def send(self, request, **kwargs):
+        with timed("llm_calls", "llm_ms"):
+            response = await super().send(request, **kwargs)
+        if not kwargs.get("stream"):
+            record_llm_usage(response)
+        return response
+
+
+_lock = threading.Lock()
+_http_client = None
+_openai_client = None
+_chat_models = {}
+# Async connections are bound to the event loop that opened them, so async clients are per loop
+_loop_clients = weakref.WeakKeyDictionary()
+
+
+def _limits():
+    return httpx.Limits(
+        max_connections=config.LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=config.LLM_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=config.LLM_KEEPALIVE_EXPIRY,
+    )
+
+
+def get_http_client():
+    """Shared keep-alive HTTP client for all synchronous OpenAI traffic."""
+    global _http_client
+    with _lock:
+        if _http_client is None:
+            _http_client = SharedHTTPClient(limits=_limits(), timeout=config.LLM_TIMEOUT)
+        return _http_client
+
+
+def _loop_client(name, factory):
+    """Return the running event loop's client for name, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        clients = _loop_clients.setdefault(loop, {})
+        if name not in clients:
+            clients[name] = factory()
+        return clients[name]
+
+
+def get_async_http_client():
+    """Keep-alive async HTTP client for the running event loop."""
+    return _loop_client("http", lambda: SharedAsyncHTTPClient(limits=_limits(), timeout=config.LLM_TIMEOUT))
+
+
+def get_openai_client():
+    """Shared openai.OpenAI client."""
+    global _openai_client
+    from openai import OpenAI
+
+    http_client = get_http_client()
+    with _lock:
+        if _openai_client is None:
+            _openai_client = OpenAI(api_key=config.OPENAI_API_KEY, base_url=config.OPENAI_BASE_URL,
+                                    http_client=http_client)
+        return _openai_client
+
+
+def get_chat_model(model=config.LLM_MODEL, temperature=0, **kwargs):
+    """Shared LangChain ChatOpenAI instance per (model, temperature, options)."""
+    from langchain_openai import ChatOpenAI
+
+    key = (model, temperature, tuple(sorted(kwargs.items())))
+    http_client = get_http_client()
+    with _lock:
+        if key not in _chat_models:
+            _chat_models[key] = ChatOpenAI(
+                model=model,
+                temperature=temperature,
+                api_key=config.OPENAI_API_KEY,
+                base_url=config.OPENAI_BASE_URL,
+                http_client=http_client,
+                **kwargs
+            )
+        return _chat_models[key]
+
+
+def get_async_openai_client():
+    """openai.AsyncOpenAI client for the running event loop."""
+    from openai import AsyncOpenAI
+
+    http_client = get_async_http_client()
+    return _loop_client("openai", lambda: AsyncOpenAI(api_key=config.OPENAI_API_KEY, base_url=config.OPENAI_BASE_URL,
+                                                      http_client=http_client))
+
+
+def get_async_chat_model(model=config.LLM_MODEL, temperature=0, **kwargs):
+    """LangChain ChatOpenAI whose ainvoke/astream use the running loop's connection pool."""
+    from langchain_openai import ChatOpenAI
+
+    key = ("chat", model, temperature, tuple(sorted(kwargs.items())))
+    http_client = get_http_client()
+    http_async_client = get_async_http_client()
+    return _loop_client(key, lambda: ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        api_key=config.OPENAI_API_KEY,
+        base_url=config.OPENAI_BASE_URL,
+        http_client=http_client,
+        http_async_client=http_async_client,
+        **kwargs
+    ))
+
+
+async def close_async_clients():
+    """Close every async client opened for the running event loop (call before the loop shuts down)."""
+    with _lock:
+        clients = _loop_clients.pop(asyncio.get_running_loop(), {})
+    # SDK clients first; each closes its own transport, then the shared HTTP pool goes
+    http_client = clients.pop("http", None)
+    for client in clients.values():
+        close = getattr(client, "close", None)
+        if inspect.iscoroutinefunction(close):
+            await close()
+    if http_client is not None:
+        await http_client.aclose()
+
+
+def run_async(coro):
+    """asyncio.run(coro) for async graph turns; the loop's LLM clients are closed before it shuts down."""
+    async def main():
+        try:
+            return await coro
+        finally:
+            await close_async_clients()
+
+    return asyncio.run(main())
+
+
+def autogen_config_list(model=config.LLM_MODEL):
+    """AutoGen config_list entry that reuses the shared HTTP connection pool."""
+    entry = {"model": model, "api_key": config.OPENAI_API_KEY, "http_client": get_http_client()}
+    if config.OPENAI_BASE_URL:
+        entry["base_url"] = config.OPENAI_BASE_URL
+    return [entry]
+
+
+@contextmanager
+def llm_timer(agent, phase):
+    """Record the duration of an agent phase ('setup' or 'model') in ms."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.observe(f"agent.{agent}.{phase}_ms", (time.perf_counter() - start) * 1000)
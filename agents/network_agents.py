@@ -3,16 +3,19 @@ Network Agent - AutoGen multi-agent troubleshooting system.
 Checks account status first, then provides diagnostics or reactivation guidance.
 """
 
+import queue
+import threading
+from contextlib import contextmanager
+
 import autogen
+from autogen.io import IOStream
 from utils.database import db
 from config.config import config
+from utils.concurrency import run_in_thread
+from agents.llm import autogen_config_list, llm_timer
+from services.network_analytics import get_network_overview, format_network_overview
 
-# Define network troubleshooting agents with database context
-config_list = [{"model": "gpt-4o", "api_key": config.OPENAI_API_KEY}]
-
-Diagnostics_Agent = autogen.AssistantAgent(
-    name="Diagnostics_Agent",
-    system_message="""You are a telecom network diagnostics specialist. 
+DIAGNOSTICS_SYSTEM_MESSAGE = """You are a telecom network diagnostics specialist. 
 
 CRITICAL INSTRUCTION: You will receive customer information including their account status.
 
@@ -27,102 +30,263 @@ CRITICAL INSTRUCTION: You will receive customer information including their acco
   → Proceed with normal network diagnostic steps
   → Check signal, device settings, network outages, etc.
 
-Always prioritize account status before any other troubleshooting!""",
-    llm_config={"config_list": config_list, "temperature": 0.7}
-)
+Always prioritize account status before any other troubleshooting!"""
 
-Solution_Integrator = autogen.AssistantAgent(
-    name="Solution_Integrator",
-    system_message="""You are a network solution integrator providing final solutions.
+SOLUTION_SYSTEM_MESSAGE = """You are a network solution integrator providing final solutions.
 
 Based on the diagnostics:
 - If account is suspended → Provide clear steps to reactivate account
 - If network issue → Provide step-by-step troubleshooting
-- Be concise and actionable""",
-    llm_config={"config_list": config_list, "temperature": 0.7}
-)
-
-user_proxy = autogen.UserProxyAgent(
-    name="User_Proxy",
-    human_input_mode="NEVER",
-    max_consecutive_auto_reply=0,
-    is_termination_msg=lambda x: "TERMINATE" in x.get("content", ""),
-    code_execution_config=False
-)
-
-# Setup group chat
-groupchat = autogen.GroupChat(
-    agents=[user_proxy, Diagnostics_Agent, Solution_Integrator],
-    messages=[],
-    max_round=6
-)
-
-manager = autogen.GroupChatManager(groupchat=groupchat, llm_config={"config_list": config_list})
-
-def process_network_query(query, customer_email="user@example.com"):
-    """Run the AutoGen network troubleshooting flow with customer context."""
+- Be concise and actionable"""
+
+
+class NetworkAgentSet:
+    """One isolated set of AutoGen agents + group chat; never shared by two requests at once."""
+
+    def __init__(self, config_list=None, speaker_selection_method="auto", llm_options=None):
+        # Define network troubleshooting agents with database context (shared HTTP pool)
+        config_list = config_list or autogen_config_list()
+        llm_options = llm_options or {}
+
+        self.diagnostics = autogen.AssistantAgent(
+            name="Diagnostics_Agent",
+            system_message=DIAGNOSTICS_SYSTEM_MESSAGE,
+            llm_config={"config_list": config_list, "temperature": 0.7, **llm_options}
+        )
+
+        self.integrator = autogen.AssistantAgent(
+            name="Solution_Integrator",
+            system_message=SOLUTION_SYSTEM_MESSAGE,
+            llm_config={"config_list": config_list, "temperature": 0.7, **llm_options}
+        )
+
+        # Streaming twin used only when a caller passes a token callback; the group chat
+        # and the admin narrative have no TokenIOStream, so streamed text would hit stdout
+        self.streaming_integrator = autogen.AssistantAgent(
+            name="Solution_Integrator",
+            system_message=SOLUTION_SYSTEM_MESSAGE,
+            llm_config={"config_list": config_list, "temperature": 0.7, "stream": True, **llm_options}
+        )
+
+        self.user_proxy = autogen.UserProxyAgent(
+            name="User_Proxy",
+            human_input_mode="NEVER",
+            max_consecutive_auto_reply=0,
+            is_termination_msg=lambda x: "TERMINATE" in x.get("content", ""),
+            code_execution_config=False
+        )
+
+        # Setup group chat
+        self.groupchat = autogen.GroupChat(
+            agents=[self.user_proxy, self.diagnostics, self.integrator],
+            messages=[],
+            max_round=6,
+            speaker_selection_method=speaker_selection_method
+        )
+
+        self.manager = autogen.GroupChatManager(groupchat=self.groupchat,
+                                                llm_config={"config_list": config_list, **llm_options})
+
+    def reset(self):
+        """Clear every transcript so the next request starts clean."""
+        self.groupchat.reset()
+        for agent in (self.manager, self.user_proxy, self.diagnostics, self.integrator,
+                      self.streaming_integrator):
+            agent.reset()
+
+
+class TokenIOStream:
+    """
+    AutoGen IOStream that hands streamed completion text to on_token (or drops it).
+    The TERMINATE marker is filtered out, holding back text that may be its start.
+    """
+
+    MARKER = "TERMINATE"
+
+    def __init__(self, on_token=None):
+        self.on_token = on_token
+        self._pending = ""
+
+    def print(self, *objects, sep=" ", end="\n", flush=False):
+        if self.on_token is None:
+            return
+        text = sep.join(str(o) for o in objects)
+        if text.startswith("\033"):
+            # AutoGen wraps each streamed completion in terminal colour codes
+            self._emit(self._pending)
+            self._pending = ""
+            return
+
+        pending = (self._pending + text).replace(self.MARKER, "")
+        held = next((i for i in range(len(self.MARKER) - 1, 0, -1) if pending.endswith(self.MARKER[:i])), 0)
+        self._pending = pending[len(pending) - held:] if held else ""
+        self._emit(pending[:len(pending) - held])
+
+    def _emit(self, text):
+        if text:
+            self.on_token(text)
+
+    def input(self, prompt="", *, password=False):
+        return ""
+
+
+def create_network_agents():
+    """Default factory for NetworkAgentPool."""
+    return NetworkAgentSet()
+
+
+class NetworkAgentPool:
+    """
+    Bounded pool of NetworkAgentSets checked out per request, so concurrent
+    network queries never share a transcript. Sets are created lazily.
+    """
+
+    def __init__(self, size=config.NETWORK_AGENT_POOL_SIZE, factory=create_network_agents):
+        self.size = size
+        self.factory = factory
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self.created = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+
+    @contextmanager
+    def checkout(self, timeout=None):
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"No network agent set available ({self.size} in use)")
+        try:
+            agents = self._idle.get_nowait()
+        except queue.Empty:
+            try:
+                agents = self.factory()
+            except Exception:
+                self._slots.release()
+                raise
+            with self._lock:
+                self.created += 1
+        with self._lock:
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+        try:
+            yield agents
+        finally:
+            agents.reset()
+            with self._lock:
+                self.in_use -= 1
+            self._idle.put(agents)
+            self._slots.release()
+
+
+agent_pool = NetworkAgentPool()
+
+# Execution modes: 'fast' = Diagnostics_Agent -> Solution_Integrator directly,
+# 'groupchat' = full GroupChatManager conversation with LLM speaker selection
+NETWORK_MODES = ("fast", "groupchat")
+INACTIVE_STATUSES = ("suspended", "cancelled", "canceled")
+
+SUSPENDED_ACCOUNT_TEMPLATE = """Hi {name}, your account is currently **{status}**, which is why calls, SMS and mobile data are not working right now. This is not a network fault, so device or network troubleshooting will not help.
+
+To restore service:
+1. Contact billing/customer service (call 198 or use the TeleServe app) to review the account.
+2. Clear any outstanding balance or resolve the reason for the {status_lower} status.
+3. Once the account is reactivated, restart your phone to re-register on the network.
+
+Current plan: {plan}"""
+
+def process_network_query(query, customer_email="user@example.com", customer_context=None, mode=None,
+                          on_token=None):
+    """Run the AutoGen network troubleshooting flow with customer context.
+    
+    customer_context is the optional load_customer_context result for
+    customer_email; when given, no role/profile queries are issued.
+    mode selects 'fast' or 'groupchat' per request (default: config.NETWORK_AGENT_MODE).
+    on_token, when given, receives answer text as each stage produces it.
+    """
     
     # Import here to avoid circular imports
-    from services.customer_service import get_user_role, get_customer_profile
+    from services.customer_service import get_user_role
     
     # Get user role first
-    user_role = get_user_role(customer_email)
+    if customer_context is not None:
+        user_role = customer_context.get("role")
+    else:
+        user_role = get_user_role(customer_email)
     
     if user_role == 'admin':
         # Admin gets network system overview
-        return handle_admin_network_query(query, customer_email)
+        return handle_admin_network_query(query, customer_email, on_token=on_token)
     elif user_role == 'customer':
         # Customer gets personal troubleshooting
-        return handle_customer_network_query(query, customer_email)
+        return handle_customer_network_query(query, customer_email, customer_context, mode, on_token)
     else:
         return "⚠️ Access denied: Invalid user credentials"
 
-def handle_admin_network_query(query, admin_email):
-    """Handle network queries for admin users"""
+async def aprocess_network_query(query, customer_email="user@example.com", customer_context=None, mode=None,
+                                 on_token=None):
+    """Async process_network_query.
+    
+    AutoGen 0.2 runs its async replies in an executor anyway, so the whole flow
+    (pool checkout included) runs on the shared worker pool instead of blocking the loop.
+    """
+    return await run_in_thread(process_network_query, query, customer_email, customer_context, mode, on_token)
+
+def handle_admin_network_query(query, admin_email, narrative=None, on_token=None):
+    """Handle network queries for admin users.
+    
+    The overview is computed directly from the database; an LLM narrative is
+    only added when narrative (default: config.NETWORK_ADMIN_NARRATIVE) is set.
+    """
+    narrative = config.NETWORK_ADMIN_NARRATIVE if narrative is None else narrative
     
     # Get network system overview for admin
     try:
-        # Get network incidents summary
-        incidents_query = """
-        SELECT COUNT(*) as total_incidents, 
-               COUNT(CASE WHEN status = 'open' THEN 1 END) as open_incidents
-        FROM network_incidents
-        """
-        incidents = db.query_one(incidents_query, [])
-        
-        # Get customer account status summary
-        status_query = """
-        SELECT account_status, COUNT(*) as count
-        FROM customers
-        GROUP BY account_status
-        """
-        status_summary = db.query(status_query, [])
-        
-        admin_context = f"""
-NETWORK SYSTEM OVERVIEW (Admin View):
-- Total Network Incidents: {incidents[0] if incidents else 0}
-- Open Incidents: {incidents[1] if incidents else 0}
-- Customer Status Summary: {status_summary}
-
-Admin Query: {query}
-"""
-        
-        # Use AutoGen for admin analysis
-        user_proxy.initiate_chat(
-            manager,
-            message=f"{admin_context}\n\nProvide network system analysis and recommendations for admin."
-        )
-        
-        return user_proxy.last_message()["content"] if user_proxy.chat_messages else "Admin network analysis completed."
-        
+        overview = get_network_overview()
     except Exception as e:
         return f"⚠️ Admin network query error: {str(e)}"
+    
+    report = format_network_overview(overview, query)
+    if on_token is not None:
+        on_token(report)
+    if not narrative:
+        return report
+    
+    try:
+        # Single integrator call on an isolated agent set; the figures above stay authoritative
+        with agent_pool.checkout() as agents, llm_timer("network", "model"):
+            summary = _reply_text(agents.integrator.generate_reply(messages=[{
+                "role": "user",
+                "content": f"{report}\n\nAdmin Query: {query}\n\n"
+                           "Summarise the network situation for an admin in 3-4 sentences "
+                           "and recommend where to focus. Use only the figures above."
+            }]))
+    except Exception as e:
+        print(f"Admin network narrative error: {e}")
+        summary = ""
+    
+    if not summary:
+        return report
+    analysis = f"\n\n**Analysis**\n{summary}"
+    if on_token is not None:
+        on_token(analysis)
+    return report + analysis
 
-def handle_customer_network_query(query, customer_email):
+def handle_customer_network_query(query, customer_email, customer_context=None, mode=None, on_token=None):
     """Handle network queries for customer users"""
+    mode = (mode or config.NETWORK_AGENT_MODE).lower()
+    if mode not in NETWORK_MODES:
+        mode = "fast"
     
-    # Get customer info from database
+    # Get customer info from the preloaded context, falling back to the database
     try:
+        customer = (customer_context or {}).get("customer")
+        plan = (customer_context or {}).get("plan") or {}
+        if customer:
+            customer_data = (customer["customer_id"], customer["name"], customer["account_status"],
+                             customer["service_plan_id"], plan.get("name"))
+        else:
+            customer_data = None
+        
         customer_query = """
         SELECT c.customer_id, c.name, c.account_status, c.service_plan_id,
                p.name as plan_name
@@ -130,11 +294,20 @@ def handle_customer_network_query(query, customer_email):
         LEFT JOIN service_plans p ON c.service_plan_id = p.plan_id
         WHERE c.email = ?
         """
-        customer_data = db.query_one(customer_query, [customer_email])
+        if customer_data is None:
+            customer_data = db.query_one(customer_query, [customer_email])
         
         if not customer_data:
             return f"⚠️ Customer profile not found for email: {customer_email}"
         
+        account_status = customer_data[2]
+        if mode == "fast" and account_status and account_status.lower() in INACTIVE_STATUSES:
+            # Inactive account is the root cause - no LLM needed
+            return SUSPENDED_ACCOUNT_TEMPLATE.format(
+                name=customer_data[1], status=account_status,
+                status_lower=account_status.lower(), plan=customer_data[4]
+            )
+        
         customer_context = f"""
 CUSTOMER INFORMATION (CHECK THIS FIRST!):
 - Customer Name: {customer_data[1]}
@@ -144,13 +317,7 @@ CUSTOMER INFORMATION (CHECK THIS FIRST!):
     except Exception as e:
         customer_context = f"Error fetching customer data: {str(e)}\nProceeding with generic troubleshooting."
     
-    # Reset chat history
-    groupchat.messages = []
-    
-    # Initiate chat with customer context
-    chat_result = user_proxy.initiate_chat(
-        manager,
-        message=f"""{customer_context}
+    message = f"""{customer_context}
 
 Customer Issue: {query}
 
@@ -159,7 +326,14 @@ IMPORTANT INSTRUCTIONS:
 2. If account is Suspended/Cancelled → Address this IMMEDIATELY as the root cause
 3. If account is Active → Then proceed with network diagnostics
 4. End your final response with TERMINATE"""
-    )
+    
+    with agent_pool.checkout() as agents:
+        if mode == "fast":
+            return run_fast_diagnostics(message, agents, on_token)
+        
+        # Initiate chat with customer context (the pool hands out a clean transcript)
+        with llm_timer("network", "model"):
+            chat_result = agents.user_proxy.initiate_chat(agents.manager, message=message)
     
     # Extract the final response
     if chat_result.chat_history:
@@ -169,3 +343,28 @@ IMPORTANT INSTRUCTIONS:
             return last_msg.replace("TERMINATE", "").strip()
     
     return "I'm sorry, I couldn't diagnose the network issue at this time."
+
+def _reply_text(reply):
+    """Normalise an AutoGen generate_reply result to plain text."""
+    if isinstance(reply, dict):
+        reply = reply.get("content")
+    return (reply or "").replace("TERMINATE", "").strip()
+
+def run_fast_diagnostics(message, agents, on_token=None):
+    """Single pass: Diagnostics_Agent then Solution_Integrator, with no speaker-selection calls.
+    
+    When on_token is given, the integrator's answer is streamed to it as it is generated.
+    """
+    integrator = agents.integrator if on_token is None else agents.streaming_integrator
+    with llm_timer("network", "model"):
+        diagnosis = _reply_text(agents.diagnostics.generate_reply(
+            messages=[{"role": "user", "content": message}]
+        ))
+        with IOStream.set_default(TokenIOStream(on_token)):
+            solution = _reply_text(integrator.generate_reply(messages=[
+                {"role": "user", "content": message},
+                {"role": "user", "name": "Diagnostics_Agent", "content": diagnosis},
+                {"role": "user", "content": "Provide the final, concise, step-by-step solution for the customer."}
+            ]))
+    
+    return solution or diagnosis or "I'm sorry, I couldn't diagnose the network issue at this time."
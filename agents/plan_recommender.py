@@ -0,0 +1,197 @@
+"""
+Plan Recommender - Vectorized plan scoring against customers' recent usage.
+Projects every plan's monthly cost (base + overage) with NumPy; the LLM only phrases the top pick.
+"""
+
+import numpy as np
+
+from config.config import config
+
+DIMENSIONS = ["data", "voice", "sms"]
+
+# Rows scored per batch: keeps the (customers x plans) working arrays to a few MB
+BATCH_SIZE = 20000
+
+
+def overage_rates():
+    """Per-unit overage charge for (data GB, voice minute, SMS)."""
+    return np.array([config.OVERAGE_RATE_DATA_GB, config.OVERAGE_RATE_VOICE_MINUTE, config.OVERAGE_RATE_SMS])
+
+
+class PlanMatrix:
+    """
+    The plan catalogue (get_service_plans rows) as arrays: monthly cost (P,) and
+    allowance caps (P, 3). Unlimited dimensions have an infinite cap, so they never
+    produce overage; a missing allowance counts as none.
+    """
+
+    def __init__(self, plans):
+        self.plans = list(plans)
+        self.ids = [plan[0] for plan in self.plans]
+        self.names = [plan[1] for plan in self.plans]
+        self.cost = np.array([plan[2] or 0.0 for plan in self.plans], dtype=float)
+        caps = np.array([plan[3:6] for plan in self.plans], dtype=float).reshape(-1, 3)
+        caps = np.nan_to_num(caps, nan=0.0)
+        unlimited = np.array([[bool(flag) for flag in plan[6:9]] for plan in self.plans]).reshape(-1, 3)
+        caps[unlimited] = np.inf
+        self.caps = caps
+
+    def __len__(self):
+        return len(self.plans)
+
+    def index_of(self, plan_id):
+        return self.ids.index(plan_id) if plan_id in self.ids else None
+
+
+def project_usage(history, months=None):
+    """Expected monthly (data, voice, sms): mean of the latest months of get_usage_history rows."""
+    months = months or config.PLAN_LOOKBACK_MONTHS
+    rows = [row[2:5] for row in (history or [])[:months]]
+    if not rows:
+        return None
+    return np.nan_to_num(np.array(rows, dtype=float)).mean(axis=0)
+
+
+def overage_charges(usage, matrix, rates=None):
+    """Overage charge per plan and dimension, shape (P, 3), for one usage vector."""
+    rates = overage_rates() if rates is None else rates
+    return np.maximum(np.asarray(usage, dtype=float) - matrix.caps, 0.0) * rates
+
+
+def project_costs(usage, matrix, rates=None):
+    """
+    Projected monthly cost of every plan for every customer, shape (C, P).
+    usage is (C, 3); the overage is accumulated one dimension at a time so the
+    temporaries stay (C, P) instead of (C, P, 3).
+    """
+    rates = overage_rates() if rates is None else rates
+    usage = np.asarray(usage, dtype=float).reshape(-1, 3)
+    costs = np.broadcast_to(matrix.cost, (len(usage), len(matrix))).copy()
+    for d in range(3):
+        excess = usage[:, d, None] - matrix.caps[None, :, d]
+        np.maximum(excess, 0.0, out=excess)
+        costs += excess * rates[d]
+    return costs
+
+
+def rank_plans(history, plans, current_plan_id=None, months=None):
+    """
+    Every plan ranked by projected cost for one customer.
+
+    Returns None without usage history, else a dict with the projected usage and
+    'ranking': entries (cheapest first) with base, per-dimension overage, total and
+    the monthly saving against the current plan.
+    """
+    usage = project_usage(history, months)
+    matrix = plans if isinstance(plans, PlanMatrix) else PlanMatrix(plans)
+    if usage is None or not len(matrix):
+        return None
+
+    overage = overage_charges(usage, matrix)
+    totals = matrix.cost + overage.sum(axis=1)
+    current = matrix.index_of(current_plan_id)
+    ranking = []
+    for i in np.argsort(totals, kind="stable"):
+        ranking.append({
+            "plan_id": matrix.ids[i],
+            "name": matrix.names[i],
+            "base": float(matrix.cost[i]),
+            "overage": {name: float(overage[i, d]) for d, name in enumerate(DIMENSIONS)},
+            "total": float(totals[i]),
+            "current": i == current,
+            "savings": float(totals[current] - totals[i]) if current is not None else None,
+        })
+    return {
+        "usage": {name: float(usage[d]) for d, name in enumerate(DIMENSIONS)},
+        "months": min(len(history), months or config.PLAN_LOOKBACK_MONTHS),
+        "ranking": ranking,
+        "current": next((entry for entry in ranking if entry["current"]), None),
+    }
+
+
+def recommend_batch(usage, plans, current_plan_ids=None, batch_size=BATCH_SIZE):
+    """
+    Cheapest plan for many customers at once.
+
+    usage is (C, 3) projected monthly usage. Returns arrays over the customers:
+    'best' (plan index into the matrix), 'best_cost', and, when current_plan_ids
+    is given, 'current_cost' and 'savings' (NaN where the current plan is unknown).
+    """
+    matrix = plans if isinstance(plans, PlanMatrix) else PlanMatrix(plans)
+    usage = np.asarray(usage, dtype=float).reshape(-1, 3)
+    rates = overage_rates()
+    best = np.empty(len(usage), dtype=np.int64)
+    best_cost = np.empty(len(usage))
+    current = None
+    if current_plan_ids is not None:
+        positions = {plan_id: i for i, plan_id in enumerate(matrix.ids)}
+        current = np.array([positions.get(plan_id, -1) for plan_id in current_plan_ids], dtype=np.int64)
+        current_cost = np.full(len(usage), np.nan)
+
+    for start in range(0, len(usage), batch_size):
+        stop = start + batch_size
+        costs = project_costs(usage[start:stop], matrix, rates)
+        best[start:stop] = costs.argmin(axis=1)
+        best_cost[start:stop] = costs[np.arange(len(costs)), best[start:stop]]
+        if current is not None:
+            known = current[start:stop] >= 0
+            rows = np.flatnonzero(known)
+            current_cost[start:stop][known] = costs[rows, current[start:stop][known]]
+
+    result = {"matrix": matrix, "best": best, "best_cost": best_cost}
+    if current is not None:
+        result["current_cost"] = current_cost
+        result["savings"] = current_cost - best_cost
+    return result
+
+
+def recommend_for_customers(profiles, plans, min_savings=0.0):
+    """
+    Admin view: customers whose cheapest plan differs from their current one.
+
+    profiles are get_usage_profiles rows (customer_id, name, current plan id, avg
+    data, avg voice, avg sms). Returns dicts sorted by monthly saving, largest first.
+    """
+    if not profiles or not plans:
+        return []
+    result = recommend_batch([row[3:6] for row in profiles], plans, [row[2] for row in profiles])
+    matrix = result["matrix"]
+    savings = result["savings"]
+    switches = np.flatnonzero(savings > min_savings)
+    rows = []
+    for i in switches[np.argsort(-savings[switches], kind="stable")]:
+        current = matrix.index_of(profiles[i][2])
+        rows.append({
+            "customer_id": profiles[i][0],
+            "name": profiles[i][1],
+            "current_plan": matrix.names[current],
+            "current_cost": float(result["current_cost"][i]),
+            "recommended_plan": matrix.names[result["best"][i]],
+            "recommended_cost": float(result["best_cost"][i]),
+            "savings": float(savings[i]),
+        })
+    return rows
+
+
+def format_ranking(recommendation, limit=3):
+    """Fact sheet for the LLM: projected usage, the current plan and the cheapest options."""
+    usage = recommendation["usage"]
+    lines = [f"Average monthly usage over the last {recommendation['months']} month(s): "
+             f"{usage['data']:.1f} GB data, {usage['voice']:.0f} voice minutes, {usage['sms']:.0f} SMS"]
+    current = recommendation["current"]
+    if current:
+        lines.append(f"Current plan: {_describe(current)}")
+    lines.append("Cheapest plans for this usage (projected monthly cost):")
+    for n, entry in enumerate(recommendation["ranking"][:limit], 1):
+        saving = ""
+        if entry["savings"] is not None and not entry["current"]:
+            saving = f", saves ${entry['savings']:,.2f}/month" if entry["savings"] > 0 else \
+                f", costs ${-entry['savings']:,.2f}/month more"
+        lines.append(f"{n}. {_describe(entry)}{' (current plan)' if entry['current'] else ''}{saving}")
+    return "\n".join(lines)
+
+
+def _describe(entry):
+    overage = [f"{name} ${charge:,.2f}" for name, charge in entry["overage"].items() if charge > 0]
+    breakdown = f" = ${entry['base']:,.2f} base + overage ({', '.join(overage)})" if overage else " (no overage)"
+    return f"{entry['name']}: ${entry['total']:,.2f}{breakdown}"
@@ -1,20 +1,25 @@
 """
-Service Plan Agent - LangChain with tool-calling for plan recommendations.
-Uses database tools to fetch plans and user usage for personalized suggestions.
+Service Plan Agent - LangChain plan advisor over a locally computed plan ranking.
+Plans are scored against recent usage by plan_recommender; the LLM phrases the top pick.
 """
 
 from langchain_core.tools import tool
-from langchain_openai import ChatOpenAI
-from config.config import config
+from agents.llm import get_chat_model, get_async_chat_model, llm_timer
+from utils.concurrency import run_in_thread
 from utils.database import db
+from services.customer_service import get_service_plans, get_usage_history
+from agents.plan_recommender import rank_plans, format_ranking
 
 # 1. Define Tools
 @tool
 def get_available_plans():
     """Fetch all available service plans from the database."""
-    sql = "SELECT plan_id, name, monthly_cost, data_limit_gb, voice_minutes, sms_count FROM service_plans"
-    plans = db.query(sql)
-    return str(plans)
+    # Plan catalogue is served from the customer-service cache
+    return format_plans(get_service_plans())
+
+def format_plans(plans):
+    """Tool output for get_service_plans rows (id, name, cost and allowances)."""
+    return str([plan[:6] for plan in plans])
 
 @tool
 def get_user_usage(customer_id: str):
@@ -33,20 +38,63 @@ def get_user_usage(customer_id: str):
         return "No usage data found."
     return str(usage)
 
+def usage_from_context(customer_context, customer_id):
+    """Format get_user_usage output from a preloaded customer context (None if unusable)."""
+    if not customer_context or customer_context.get("customer_id") != customer_id:
+        return None
+    customer = customer_context.get("customer")
+    usage = customer_context.get("latest_usage")
+    plan = customer_context.get("plan")
+    if not customer or not usage or not plan:
+        return "No usage data found."
+    return str((customer["service_plan_id"], usage["data_used_gb"], usage["voice_minutes_used"],
+                usage["sms_count_used"], plan["name"]))
+
+def current_plan_id(customer_context, customer_id):
+    """The customer's plan id, from the preloaded context when it belongs to them."""
+    if customer_context and customer_context.get("customer_id") == customer_id and customer_context.get("customer"):
+        return customer_context["customer"]["service_plan_id"]
+    row = db.query_one("SELECT service_plan_id FROM customers WHERE customer_id = ?", [customer_id])
+    return row[0] if row else None
+
+def is_prefetched(customer_id, customer_context, plan_catalog, usage_history):
+    """True when build_plan_prompt needs no database reads."""
+    return (plan_catalog is not None and usage_history is not None
+            and usage_from_context(customer_context, customer_id) is not None)
+
 # 2. Process Function
-def process_plan_query(query, customer_id="CUST001"):
-    """Run the plan recommendation logic using LLM with tools."""
-    llm = ChatOpenAI(model="gpt-4o", api_key=config.OPENAI_API_KEY, temperature=0)
+def build_plan_prompt(query, customer_id, customer_context=None, plan_catalog=None, usage_history=None):
+    """Build the advisor prompt, fetching usage history and the plan catalogue unless prefetched.
     
-    tools = [get_available_plans, get_user_usage]
-    llm_with_tools = llm.bind_tools(tools)
+    With usage history the plans arrive ranked by projected cost and the model only
+    explains the top pick; without it the model gets the raw usage and catalogue.
+    """
+    plans = plan_catalog if plan_catalog is not None else get_service_plans()
+    history = usage_history if usage_history is not None else get_usage_history(customer_id)
+    recommendation = rank_plans(history, plans, current_plan_id(customer_context, customer_id))
+    
+    if recommendation is not None:
+        top = recommendation["ranking"][0]
+        verdict = ("Their current plan is already the cheapest fit; recommend staying on it."
+                   if top["current"] else f"Recommend switching to {top['name']}.")
+        return f"""You are a helpful telecom service plan advisor.
+
+Customer Query: {query}
+Customer ID: {customer_id}
+
+Plan analysis (already computed from the customer's usage; use these figures as given):
+{format_ranking(recommendation)}
+
+{verdict} Answer the customer's question briefly, explaining the recommendation with the figures above."""
     
     # Get usage data
-    usage_data = get_user_usage.invoke({"customer_id": customer_id})
-    plans_data = get_available_plans.invoke({})
+    usage_data = usage_from_context(customer_context, customer_id)
+    if usage_data is None:
+        usage_data = get_user_usage.invoke({"customer_id": customer_id})
+    plans_data = format_plans(plans)
     
     # Create a prompt with the data
-    prompt = f"""You are a helpful telecom service plan advisor.
+    return f"""You are a helpful telecom service plan advisor.
 
 Customer Query: {query}
 Customer ID: {customer_id}
@@ -59,9 +107,56 @@ Available Plans:
 
 Based on the customer's current usage and available plans, provide a recommendation. 
 Analyze if they are on the optimal plan or if they should upgrade/downgrade."""
+
+def process_plan_query(query, customer_id="CUST001", customer_context=None, on_token=None, plan_catalog=None,
+                       usage_history=None):
+    """Run the plan recommendation logic: local plan ranking, phrased by the LLM.
+    
+    on_token, when given, receives the answer incrementally as the model streams it.
+    plan_catalog and usage_history, when given, are the prefetched get_service_plans
+    and get_usage_history results.
+    """
+    with llm_timer("plan", "setup"):
+        # Shared, long-lived client; the plan data is ranked up front so no tool binding is needed
+        llm = get_chat_model(temperature=0)
+        prompt = build_plan_prompt(query, customer_id, customer_context, plan_catalog, usage_history)
+    
+    try:
+        with llm_timer("plan", "model"):
+            if on_token is None:
+                return llm.invoke(prompt).content
+            
+            chunks = []
+            for chunk in llm.stream(prompt):
+                if chunk.content:
+                    on_token(chunk.content)
+                    chunks.append(chunk.content)
+            return "".join(chunks)
+    except Exception as e:
+        return f"Error processing plan query: {str(e)}"
+
+async def aprocess_plan_query(query, customer_id="CUST001", customer_context=None, on_token=None,
+                              plan_catalog=None, usage_history=None):
+    """Async process_plan_query: DB reads on the worker pool, model call via ainvoke/astream."""
+    with llm_timer("plan", "setup"):
+        llm = get_async_chat_model(temperature=0)
+        if is_prefetched(customer_id, customer_context, plan_catalog, usage_history):
+            # Everything was prefetched: no DB work left to offload
+            prompt = build_plan_prompt(query, customer_id, customer_context, plan_catalog, usage_history)
+        else:
+            prompt = await run_in_thread(build_plan_prompt, query, customer_id, customer_context, plan_catalog,
+                                         usage_history)
     
     try:
-        response = llm.invoke(prompt)
-        return response.content
+        with llm_timer("plan", "model"):
+            if on_token is None:
+                return (await llm.ainvoke(prompt)).content
+            
+            chunks = []
+            async for chunk in llm.astream(prompt):
+                if chunk.content:
+                    on_token(chunk.content)
+                    chunks.append(chunk.content)
+            return "".join(chunks)
     except Exception as e:
         return f"Error processing plan query: {str(e)}"
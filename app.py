@@ -10,6 +10,7 @@ import sys
 from ui.sidebar import render_sidebar
 from ui.dashboard import render_dashboard
 from ui.chat_interface import render_chat_tab
+from orchestration.runtime import get_runtime
 
 print("=" * 80)
 print("STREAMLIT APP STARTING")
@@ -23,6 +24,15 @@ st.set_page_config(
 
 print("✓ Page config set")
 
+@st.cache_resource
+def shared_runtime():
+    """One runtime per server process: migrations, graph, LLM clients and knowledge engine
+    warm up in a background thread while the first visitor is still on the login page."""
+    return get_runtime()
+
+
+runtime = shared_runtime()
+
 # Initialize session state variables
 if "logged_in" not in st.session_state:
     st.session_state.logged_in = False
@@ -53,18 +63,17 @@ if not st.session_state.logged_in:
 else:
     st.title(f"Telecom AI Assistant - {st.session_state.user_type} Portal")
     
-    # Lazy-load LangGraph on first use to improve startup time
+    # The compiled graph is shared by every session; only the first login may wait for warm-up
     if not st.session_state.graph_initialized:
-        try:
+        if not runtime.ready:
             with st.spinner("Loading AI system..."):
-                from orchestration.graph import create_graph
-                st.session_state.graph = create_graph()
-                st.session_state.graph_initialized = True
-                st.success("AI System Ready!")
-                st.rerun()
-        except Exception as e:
-            st.error(f"Failed to load AI system: {str(e)}")
+                runtime.wait_for_graph()
+        if runtime.graph is None:
+            error = runtime.stages.get("graph", {}).get("error")
+            st.error(f"Failed to load AI system: {error}")
             st.stop()
+        st.session_state.graph = runtime.graph
+        st.session_state.graph_initialized = True
     
     # Create tabs
     tab0, tab1 = st.tabs([
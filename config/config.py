@@ -17,10 +17,108 @@ load_dotenv(env_path)
 class Config:
     # LLM API key
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
+    # Alternative OpenAI-compatible endpoint (e.g. tests/stub_llm_server.py for load tests); None = api.openai.com
+    OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
+
+    # Shared LLM clients (keep-alive HTTP pool)
+    LLM_MODEL = os.getenv("LLM_MODEL", "gpt-4o")
+    LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "120"))
+    LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "50"))
+    LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "120"))
+
+    # Network agent: 'fast' (two direct agent calls) or 'groupchat' (AutoGen GroupChatManager)
+    NETWORK_AGENT_MODE = os.getenv("NETWORK_AGENT_MODE", "fast")
+    NETWORK_AGENT_POOL_SIZE = int(os.getenv("NETWORK_AGENT_POOL_SIZE", "8"))
+    # Admin network overview is computed in SQL; the LLM narrative on top is opt-in
+    NETWORK_ADMIN_NARRATIVE = os.getenv("NETWORK_ADMIN_NARRATIVE", "false").lower() == "true"
+
+    # Worker threads for blocking calls (SQLite, CrewAI, AutoGen) on the async path
+    ASYNC_WORKER_THREADS = int(os.getenv("ASYNC_WORKER_THREADS", "32"))
+
+    # Stream answer tokens to the chat UI (False = wait for the full answer)
+    STREAMING_ENABLED = os.getenv("STREAMING_ENABLED", "true").lower() == "true"
 
     # Paths
-    DB_PATH = os.path.join(BASE_DIR, "data", "telecom.db")
-    CHROMA_PATH = os.path.join(BASE_DIR, "data", "chromadb")
+    DB_PATH = os.getenv("DB_PATH", os.path.join(BASE_DIR, "data", "telecom.db"))
+    CHROMA_PATH = os.getenv("CHROMA_PATH", os.path.join(BASE_DIR, "data", "chromadb"))
     DOCUMENTS_PATH = os.path.join(BASE_DIR, "data", "documents")
 
+    # Knowledge base Chroma collection (local embedding models get a suffixed collection of their own)
+    KNOWLEDGE_COLLECTION = os.getenv("KNOWLEDGE_COLLECTION", "telecom_docs")
+
+    # Embeddings: "openai" or "local" (sentence-transformers on the CPU, no network round-trip)
+    EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "openai")
+    LOCAL_EMBEDDING_MODEL = os.getenv("LOCAL_EMBEDDING_MODEL", "BAAI/bge-small-en-v1.5")
+    LOCAL_EMBEDDING_DEVICE = os.getenv("LOCAL_EMBEDDING_DEVICE", "cpu")
+    LOCAL_EMBEDDING_ONNX = os.getenv("LOCAL_EMBEDDING_ONNX", "false").lower() == "true"
+    EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+    EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+    EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", os.path.join(BASE_DIR, "data", "embedding_cache.db"))
+
+    # Retrieval: "hybrid" fuses BM25 and vector hits (reciprocal-rank fusion), "vector" is similarity only
+    RETRIEVAL_MODE = os.getenv("RETRIEVAL_MODE", "hybrid")
+    RETRIEVAL_TOP_K = int(os.getenv("RETRIEVAL_TOP_K", "3"))
+    RETRIEVAL_CANDIDATES = int(os.getenv("RETRIEVAL_CANDIDATES", "10"))
+    RRF_K = int(os.getenv("RRF_K", "60"))
+    # Optional local cross-encoder over the fused candidates (needs sentence-transformers)
+    RERANK_ENABLED = os.getenv("RERANK_ENABLED", "false").lower() == "true"
+    RERANK_MODEL = os.getenv("RERANK_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+
+    # Knowledge answers: "auto" returns the matching FAQ passage verbatim when one clears the
+    # threshold and only synthesizes with the LLM otherwise; "llm" always synthesizes
+    KNOWLEDGE_ANSWER_MODE = os.getenv("KNOWLEDGE_ANSWER_MODE", "auto")
+    FAQ_MATCH_THRESHOLD = float(os.getenv("FAQ_MATCH_THRESHOLD", "0.75"))
+    FAQ_DOCUMENTS = [name.strip() for name in os.getenv(
+        "FAQ_DOCUMENTS", "Billing FAQs.txt,Technical Support Guide.txt").split(",") if name.strip()]
+
+    # Billing answers: "auto" answers simple bill questions from the computed breakdown with no
+    # LLM call and has the crew narrate precomputed facts otherwise; "llm" always uses the crew
+    BILLING_ANSWER_MODE = os.getenv("BILLING_ANSWER_MODE", "auto")
+
+    # Plan recommender: plans are scored on the average of the latest N billing periods, with
+    # usage above a plan's allowance charged at these per-unit overage rates
+    PLAN_LOOKBACK_MONTHS = int(os.getenv("PLAN_LOOKBACK_MONTHS", "3"))
+    OVERAGE_RATE_DATA_GB = float(os.getenv("OVERAGE_RATE_DATA_GB", "10.0"))
+    OVERAGE_RATE_VOICE_MINUTE = float(os.getenv("OVERAGE_RATE_VOICE_MINUTE", "0.05"))
+    OVERAGE_RATE_SMS = float(os.getenv("OVERAGE_RATE_SMS", "0.02"))
+
+    # Bulk plan optimization job (python -m services.plan_optimization run)
+    PLAN_JOB_WORKERS = int(os.getenv("PLAN_JOB_WORKERS", str(os.cpu_count() or 1)))
+    PLAN_JOB_CHUNK_SIZE = int(os.getenv("PLAN_JOB_CHUNK_SIZE", "20000"))
+
+    # SQLite connection pool
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "8"))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "256"))
+    DB_SYNCHRONOUS = os.getenv("DB_SYNCHRONOUS", "NORMAL")
+    DB_CACHE_SIZE_KB = int(os.getenv("DB_CACHE_SIZE_KB", "16384"))
+    DB_MMAP_SIZE = int(os.getenv("DB_MMAP_SIZE", str(128 * 1024 * 1024)))
+
+    # Customer/plan data cache (TTLs in seconds)
+    CACHE_ENABLED = os.getenv("CACHE_ENABLED", "true").lower() == "true"
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "2048"))
+    CACHE_TTL_PLANS = float(os.getenv("CACHE_TTL_PLANS", "3600"))
+    CACHE_TTL_CUSTOMER = float(os.getenv("CACHE_TTL_CUSTOMER", "300"))
+    CACHE_TTL_USAGE = float(os.getenv("CACHE_TTL_USAGE", "300"))
+
+    # Query classification: below this local confidence the LLM is consulted
+    CLASSIFIER_CONFIDENCE_THRESHOLD = float(os.getenv("CLASSIFIER_CONFIDENCE_THRESHOLD", "0.75"))
+
+    # Semantic response cache in front of the agents
+    RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+    RESPONSE_CACHE_THRESHOLD = float(os.getenv("RESPONSE_CACHE_THRESHOLD", "0.9"))
+    RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "1800"))
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "2048"))
+
+    # Per-turn tracing of the graph nodes (wall time, DB queries, LLM calls/tokens, cache hits).
+    # TRACE_EXPORTER is a comma-separated list of "jsonl" (appended to TRACE_JSONL_PATH) and
+    # "otel" (OpenTelemetry spans, needs opentelemetry-api); "none" keeps traces in memory only
+    TRACING_ENABLED = os.getenv("TRACING_ENABLED", "true").lower() == "true"
+    TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "jsonl")
+    TRACE_JSONL_PATH = os.getenv("TRACE_JSONL_PATH", os.path.join(BASE_DIR, "data", "traces.jsonl"))
+    # The JSONL file rolls over to TRACE_JSONL_PATH.1 (replacing the previous one) past this size
+    TRACE_JSONL_MAX_MB = float(os.getenv("TRACE_JSONL_MAX_MB", "50"))
+    TRACE_BUFFER_SIZE = int(os.getenv("TRACE_BUFFER_SIZE", "200"))
+
 config = Config()
@@ -0,0 +1,327 @@
+"""
+Query Classifier - Tiered intent classification for the orchestration graph.
+Keyword rules first, then a local TF-IDF model, and the LLM only when both are unsure.
+"""
+
+import math
+import re
+import time
+from collections import Counter, defaultdict
+from config.config import config
+from utils.metrics import metrics
+
+LABELS = ["billing", "network", "plan", "knowledge"]
+
+# (pattern, weight) per label; weights >= RULE_FULL_SCORE are decisive on their own
+KEYWORD_RULES = {
+    "billing": [
+        (r"\bbill(s|ed|ing)?\b", 3), (r"\bcharge[sd]?\b", 3), (r"\bpayments?\b|\bpay\b", 3),
+        (r"\binvoice\b", 3), (r"\bowe\b", 3), (r"\brefund\b", 3), (r"\boverage\b", 2),
+        (r"\bhow much\b", 1), (r"\bextra\b", 1), (r"\bcost\b", 1),
+    ],
+    "network": [
+        (r"\bno (signal|service|network)\b", 3), (r"\bsignal\b", 2), (r"\bnetwork\b", 2),
+        (r"\binternet\b", 2), (r"\bdrop(s|ped|ping)?\b", 2), (r"\bslow\b", 2),
+        (r"\bconnection\b|\bconnectivity\b", 2), (r"\boutage\b", 3), (r"\bcan'?t (call|connect)\b", 3),
+        (r"\bcalls?\b", 1), (r"\bcall quality\b", 3), (r"\bquality\b|\bpoor\b", 1), (r"\bdata\b", 1), (r"\bcoverage\b", 1),
+    ],
+    "plan": [
+        (r"\bplans?\b", 2), (r"\bupgrade\b", 3), (r"\bdowngrade\b", 3), (r"\brecommend\w*\b", 2),
+        (r"\bswitch\b|\bchange\b", 1), (r"\bbetter\b|\bcheaper\b", 1), (r"\bunlimited\b", 1),
+    ],
+    "knowledge": [
+        (r"\bwhat (is|are)\b", 2), (r"\bhow (does|do)\b.*\bwork\b", 3), (r"\bexplain\b", 1),
+        (r"\b5g\b|\b4g\b|\blte\b", 2), (r"\bvolte\b|\bvowifi\b|\bwi-?fi calling\b", 3),
+        (r"\bapn\b", 3), (r"\besim\b|\bsim\b", 1), (r"\broaming\b", 1), (r"\bsettings?\b", 1),
+    ],
+}
+RULE_FULL_SCORE = 3
+# Below this cosine similarity a model prediction is treated as a weak guess
+MODEL_FULL_SIMILARITY = 0.3
+
+# Labelled seed queries for the local model; tests/test_classification.py holds out its own cases
+TRAINING_QUERIES = [
+    ("What's my bill this month?", "billing"),
+    ("How much do I owe?", "billing"),
+    ("Why did my bill go up?", "billing"),
+    ("I was double charged", "billing"),
+    ("When is my payment due?", "billing"),
+    ("Break down the charges on my invoice", "billing"),
+    ("What are these additional charges?", "billing"),
+    ("The amount on my statement looks wrong", "billing"),
+    ("Can you go through my last invoice?", "billing"),
+    ("Why do I have a late fee?", "billing"),
+    ("My calls keep failing", "network"),
+    ("I can't connect to mobile data", "network"),
+    ("Is there an outage in my area?", "network"),
+    ("My phone shows no service", "network"),
+    ("Voice breaks up during calls", "network"),
+    ("Browsing is very slow today", "network"),
+    ("Mobile data stopped working", "network"),
+    ("Pages take forever to load", "network"),
+    ("People can't hear me on calls", "network"),
+    ("Which plan suits my usage?", "plan"),
+    ("Is there a cheaper plan for me?", "plan"),
+    ("I want to switch to unlimited data", "plan"),
+    ("Am I on the right plan?", "plan"),
+    ("Compare plans for me", "plan"),
+    ("Change my plan to a family plan", "plan"),
+    ("Suggest a plan with more data", "plan"),
+    ("Move me to a bigger package", "plan"),
+    ("Which package would suit me?", "plan"),
+    ("I want fewer minutes and a lower price", "plan"),
+    ("What is eSIM?", "knowledge"),
+    ("How do I enable Wi-Fi calling?", "knowledge"),
+    ("Which cities have 5G coverage?", "knowledge"),
+    ("How do I reset my PIN?", "knowledge"),
+    ("What are international roaming rates?", "knowledge"),
+    ("How do I activate roaming?", "knowledge"),
+    ("What payment methods do you accept?", "knowledge"),
+    ("What does LTE stand for?", "knowledge"),
+    ("How do I configure access point settings?", "knowledge"),
+    ("Does my phone support 5G?", "knowledge"),
+]
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+# Clause boundaries for multi-intent questions ("why is my bill high and should I change plans?"):
+# sentence punctuation, or and/also/plus only when a new question or request starts after it
+_CLAUSE_SPLIT_RE = re.compile(
+    r"[?;.!]|,?\s*\b(?:and|also|plus)\b,?\s*(?=(?:what|why|how|when|where|which|who|can|could|should|would|"
+    r"will|is|are|do|does|did|i|i'm|i'd|please|tell|show|give|recommend|help|check|explain)\b)",
+    re.IGNORECASE)
+
+
+def tokenize(text):
+    """Lowercase word unigrams plus bigrams."""
+    words = _TOKEN_RE.findall(text.lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+class KeywordScorer:
+    """Tier 1: compiled keyword/regex rules with per-label weights."""
+
+    def __init__(self, rules=KEYWORD_RULES):
+        self.rules = {
+            label: [(re.compile(pattern, re.IGNORECASE), weight) for pattern, weight in patterns]
+            for label, patterns in rules.items()
+        }
+
+    def scores(self, query):
+        return {
+            label: sum(weight for pattern, weight in patterns if pattern.search(query))
+            for label, patterns in self.rules.items()
+        }
+
+    def predict(self, query):
+        """Return (label, confidence, scores); confidence is the label's score share scaled by strength."""
+        scores = self.scores(query)
+        total = sum(scores.values())
+        if not total:
+            return None, 0.0, scores
+        label = max(scores, key=scores.get)
+        share = scores[label] / total
+        strength = min(1.0, scores[label] / RULE_FULL_SCORE)
+        return label, share * strength, scores
+
+
+class TfidfCentroidModel:
+    """Tier 2: TF-IDF vectors with one centroid per label, scored by cosine similarity."""
+
+    def __init__(self, examples=TRAINING_QUERIES, temperature=10.0):
+        self.temperature = temperature
+        self.fit(examples)
+
+    def fit(self, examples):
+        docs = [(Counter(tokenize(text)), label) for text, label in examples]
+        df = Counter()
+        for terms, _ in docs:
+            df.update(terms.keys())
+        n = len(docs)
+        self.idf = {term: math.log((1 + n) / (1 + count)) + 1 for term, count in df.items()}
+
+        sums = defaultdict(Counter)
+        for terms, label in docs:
+            for term, weight in self._vector(terms).items():
+                sums[label][term] += weight
+        self.centroids = {label: _normalize(vector) for label, vector in sums.items()}
+
+    def _vector(self, terms):
+        return _normalize({t: (1 + math.log(c)) * self.idf[t] for t, c in terms.items() if t in self.idf})
+
+    def similarities(self, query):
+        vector = self._vector(Counter(tokenize(query)))
+        return {
+            label: sum(weight * centroid.get(term, 0.0) for term, weight in vector.items())
+            for label, centroid in self.centroids.items()
+        }
+
+    def predict(self, query):
+        """Return (label, confidence, similarities); confidence is a softmax scaled by match strength."""
+        sims = self.similarities(query)
+        if not any(sims.values()):
+            return None, 0.0, sims
+        exps = {label: math.exp(self.temperature * sim) for label, sim in sims.items()}
+        label = max(exps, key=exps.get)
+        strength = min(1.0, sims[label] / MODEL_FULL_SIMILARITY)
+        return label, exps[label] / sum(exps.values()) * strength, sims
+
+
+def _normalize(vector):
+    norm = math.sqrt(sum(v * v for v in vector.values()))
+    return {k: v / norm for k, v in vector.items()} if norm else {}
+
+
+class TieredClassifier:
+    """Runs rules -> local model -> LLM, stopping at the first tier above the threshold."""
+
+    def __init__(self, threshold=config.CLASSIFIER_CONFIDENCE_THRESHOLD):
+        self.threshold = threshold
+        self.rules = KeywordScorer()
+        self.model = TfidfCentroidModel()
+
+    def classify(self, query, llm=None):
+        """
+        Classify a query into one of LABELS.
+
+        Args:
+            query: User query text
+            llm: Optional callable(query) -> label used when local tiers are unsure
+
+        Returns:
+            Dict with label, tier ('rules', 'model', 'llm', 'llm_failed' or 'fallback'),
+            confidence and latency_ms; both fallbacks route to knowledge
+        """
+        start = time.perf_counter()
+        decision, _, best_confidence = self._classify_locally(query, start)
+        if decision:
+            return decision
+
+        if llm is not None:
+            try:
+                label = llm(query)
+                if label in LABELS:
+                    return self._record(query, label, "llm", 1.0, start)
+            except Exception as e:
+                print(f"Classification error: {e}")
+            # The LLM was paid for even though its answer is unusable
+            return self._record(query, "knowledge", "llm_failed", best_confidence, start)
+
+        # An unsure local guess is no better than the general knowledge agent
+        return self._record(query, "knowledge", "fallback", best_confidence, start)
+
+    async def aclassify(self, query, llm=None):
+        """Async classify; llm is an optional coroutine function(query) -> label."""
+        start = time.perf_counter()
+        decision, _, best_confidence = self._classify_locally(query, start)
+        if decision:
+            return decision
+
+        if llm is not None:
+            try:
+                label = await llm(query)
+                if label in LABELS:
+                    return self._record(query, label, "llm", 1.0, start)
+            except Exception as e:
+                print(f"Classification error: {e}")
+            # The LLM was paid for even though its answer is unusable
+            return self._record(query, "knowledge", "llm_failed", best_confidence, start)
+
+        # An unsure local guess is no better than the general knowledge agent
+        return self._record(query, "knowledge", "fallback", best_confidence, start)
+
+    def classify_intents(self, query, llm=None):
+        """
+        Multi-label classify: every clause the local tiers are sure about adds its label.
+
+        Returns:
+            classify()'s dict plus 'labels' (primary label first) and 'clauses'
+            ({label: the part of the query it answers}); single-intent queries
+            go through classify() unchanged
+        """
+        start = time.perf_counter()
+        multi = self._classify_clauses(query, start)
+        if multi:
+            return multi
+        decision = self.classify(query, llm=llm)
+        return {**decision, "labels": [decision["label"]], "clauses": {decision["label"]: query}}
+
+    async def aclassify_intents(self, query, llm=None):
+        """Async classify_intents; llm is an optional coroutine function(query) -> label."""
+        start = time.perf_counter()
+        multi = self._classify_clauses(query, start)
+        if multi:
+            return multi
+        decision = await self.aclassify(query, llm=llm)
+        return {**decision, "labels": [decision["label"]], "clauses": {decision["label"]: query}}
+
+    def _classify_clauses(self, query, start):
+        """Decision for a query whose clauses each classify confidently into two or more labels, else None."""
+        clauses = [c.strip() for c in _CLAUSE_SPLIT_RE.split(query) if c.strip()]
+        if len(clauses) < 2:
+            return None
+
+        labels, tiers, confidences, label_clauses = [], [], [], {}
+        for clause in clauses:
+            prediction = self._predict_locally(clause)
+            if not prediction:
+                # A fragment that means nothing on its own belongs to its neighbour: one intent
+                return None
+            label = prediction[0]
+            if label in label_clauses:
+                label_clauses[label] += f" and {clause}"
+                continue
+            labels.append(label)
+            tiers.append(prediction[1])
+            confidences.append(prediction[2])
+            label_clauses[label] = clause
+        if len(labels) < 2:
+            return None
+
+        metrics.increment("classifier.multi_intent")
+        # The weakest clause decision stands for the whole query
+        tier = "model" if "model" in tiers else "rules"
+        decision = self._record(query, labels[0], tier, min(confidences), start, labels=labels)
+        return {**decision, "clauses": label_clauses}
+
+    def _predict_locally(self, query):
+        """First local tier above the threshold as (label, tier, confidence), else None."""
+        for tier, predictor in (("rules", self.rules), ("model", self.model)):
+            label, confidence, _ = predictor.predict(query)
+            if label and confidence >= self.threshold:
+                return label, tier, confidence
+        return None
+
+    def _classify_locally(self, query, start):
+        """Run the local tiers; returns (decision or None, best label, best confidence)."""
+        best_label, best_confidence = None, 0.0
+        for tier, predictor in (("rules", self.rules), ("model", self.model)):
+            label, confidence, _ = predictor.predict(query)
+            if label and confidence > best_confidence:
+                best_label, best_confidence = label, confidence
+            if label and confidence >= self.threshold:
+                return self._record(query, label, tier, confidence, start), label, confidence
+        return None, best_label, best_confidence
+
+    def _record(self, query, label, tier, confidence, start, labels=None):
+        latency_ms = (time.perf_counter() - start) * 1000
+        metrics.increment(f"classifier.tier.{tier}")
+        metrics.observe(f"classifier.latency_ms.{tier}", latency_ms)
+        decision = {"label": label, "tier": tier, "confidence": confidence, "latency_ms": latency_ms}
+        if labels:
+            decision["labels"] = labels
+        return decision
+
+
+TIERS = ("rules", "model", "llm", "llm_failed", "fallback")
+# Tiers that never called the LLM ("fallback" only happens when no LLM was passed)
+OFFLOADED_TIERS = ("rules", "model", "fallback")
+
+
+def llm_offload_rate():
+    """Share of classifications answered without an LLM call."""
+    counts = {tier: metrics.counter(f"classifier.tier.{tier}") for tier in TIERS}
+    total = sum(counts.values())
+    return sum(counts[tier] for tier in OFFLOADED_TIERS) / total if total else 0.0
+
+
+classifier = TieredClassifier()
@@ -3,187 +3,445 @@ LangGraph Orchestrator - Routes queries to specialized agents.
 Classifies intent and coordinates multi-agent responses.
 """
 
-
-from langgraph.graph import StateGraph
+import importlib
+from langgraph.graph import StateGraph, START
+from langgraph.config import get_stream_writer
 from .state import TelecomState
+from .classifier import classifier, LABELS
+from .response_cache import response_cache, customer_fingerprint, ROUTE_INPUTS
+from utils.tracing import TracedGraph, trace_node
+
+from agents.llm import get_openai_client, get_async_openai_client
+from config.config import config
+
+
+def _lazy(module, name):
+    """
+    Agent entry point imported on its first call. crewai, autogen, langchain and
+    llama_index load only when a query is first routed to their node, so importing
+    the graph (and a deployment that never uses an agent) doesn't pay for them.
+    """
+    target = None
+
+    def call(*args, **kwargs):
+        nonlocal target
+        if target is None:
+            target = getattr(importlib.import_module(module), name)
+        return target(*args, **kwargs)
 
-from agents.billing_agents import process_billing_query
-from agents.network_agents import process_network_query
-from agents.service_agents import process_plan_query
-from agents.knowledge_agents import process_knowledge_query
-from openai import OpenAI
-import os
+    call.__name__ = name
+    return call
 
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+process_billing_query = _lazy("agents.billing_agents", "process_billing_query")
+aprocess_billing_query = _lazy("agents.billing_agents", "aprocess_billing_query")
+process_network_query = _lazy("agents.network_agents", "process_network_query")
+aprocess_network_query = _lazy("agents.network_agents", "aprocess_network_query")
+process_plan_query = _lazy("agents.service_agents", "process_plan_query")
+aprocess_plan_query = _lazy("agents.service_agents", "aprocess_plan_query")
+process_knowledge_query = _lazy("agents.knowledge_agents", "process_knowledge_query")
+aprocess_knowledge_query = _lazy("agents.knowledge_agents", "aprocess_knowledge_query")
 
 
 def get_customer_context(state: TelecomState):
-    """Extract customer context from user info before routing to agents"""
+    """Prefetch customer context, plan catalogue and usage history while the query is classified
+    
+    Runs in parallel with classify_query, so it returns only the keys it owns.
+    """
     try:
-        from services.customer_service import get_customer_profile, get_user_role
+        from services.customer_service import prefetch_customer_data
         
         # Get user email from customer_info or user_email
-        customer_info = state.get("customer_info", {})
-        user_email = customer_info.get("email") or state.get("user_email", "")
+        user_email = _user_email(state)
         
         if user_email:
-            # Get user role and customer data
-            user_role = get_user_role(user_email)
-            customer_id, customer_data = get_customer_profile(user_email)
-            
-            # Update state with customer context
-            state["user_email"] = user_email
-            state["user_role"] = user_role
-            state["customer_id"] = customer_id
-            state["customer_data"] = customer_data
-        
-        return state
+            # Role, profile, plan and latest usage in a single round-trip, plus the cached catalogue and history
+            return _customer_update(user_email, prefetch_customer_data(user_email))
+        return {}
     except Exception as e:
         # Fallback to defaults if there's an issue
-        state["customer_id"] = state.get("customer_id", None)
-        return state
+        return {"customer_id": state.get("customer_id", None)}
+
+
+async def aget_customer_context(state: TelecomState):
+    """Async get_customer_context; the lookups run on the shared worker pool"""
+    try:
+        from services.customer_service import aprefetch_customer_data
+        
+        user_email = _user_email(state)
+        if user_email:
+            return _customer_update(user_email, await aprefetch_customer_data(user_email))
+        return {}
+    except Exception as e:
+        return {"customer_id": state.get("customer_id", None)}
+
+
+def _user_email(state: TelecomState):
+    customer_info = state.get("customer_info", {})
+    return customer_info.get("email") or state.get("user_email", "")
+
+
+def _customer_update(user_email, prefetched):
+    # Update state with customer context
+    context = prefetched["context"]
+    return {
+        "user_email": user_email,
+        "user_role": context["role"],
+        "customer_id": context["customer_id"],
+        "customer_data": context["customer_data"],
+        "customer_context": context,
+        "plan_catalog": prefetched["plan_catalog"],
+        "usage_history": prefetched.get("usage_history"),
+    }
+
+
+_CLASSIFY_SYSTEM_PROMPT = "You are a helpful assistant that classifies telecom user queries. Classify the following query into exactly one of these categories: 'billing', 'network', 'plan', or 'knowledge'. Return ONLY the category name in lowercase."
+
+
+def llm_classify(query):
+    """OpenAI-based classification; returns a label or raises on API errors."""
+    response = get_openai_client().chat.completions.create(
+        model=config.LLM_MODEL,
+        messages=[
+            {"role": "system", "content": _CLASSIFY_SYSTEM_PROMPT},
+            {"role": "user", "content": query}
+        ],
+        temperature=0
+    )
+    classification = response.choices[0].message.content.strip().lower()
+    
+    # Fallback if model returns something unexpected
+    return classification if classification in LABELS else "knowledge"
+
+
+async def allm_classify(query):
+    """Async llm_classify using the event loop's OpenAI client."""
+    response = await get_async_openai_client().chat.completions.create(
+        model=config.LLM_MODEL,
+        messages=[
+            {"role": "system", "content": _CLASSIFY_SYSTEM_PROMPT},
+            {"role": "user", "content": query}
+        ],
+        temperature=0
+    )
+    classification = response.choices[0].message.content.strip().lower()
+    return classification if classification in LABELS else "knowledge"
+
+
+def _explicit_classification(state: TelecomState):
+    """Classification from the UI tab's service_type, or None"""
+    service_type = state.get("service_type")
+    if not service_type:
+        return None
+    # Map "plans" to "plan" for consistency
+    return "plan" if service_type.lower() == "plans" else service_type.lower()
+
+
+def _decision_update(decision):
+    return {
+        "classification": decision["label"],
+        "classifications": decision.get("labels") or [decision["label"]],
+        "route_queries": decision.get("clauses") or {},
+        "classification_tier": decision["tier"],
+        "classification_confidence": decision["confidence"],
+    }
 
 
 def classify_query(state: TelecomState):
+    """Classify the query (runs in parallel with get_customer_context; returns only its own keys)"""
     # Check if service_type is explicitly provided (from UI tabs)
-    service_type = state.get("service_type")
+    explicit = _explicit_classification(state)
     
-    if service_type:
+    if explicit:
         # Use explicit service type from UI tab
-        # Map "plans" to "plan" for consistency
-        if service_type.lower() == "plans":
-            state["classification"] = "plan"
-        else:
-            state["classification"] = service_type.lower()
-    else:
-        # OpenAI-based classification
-        q = state.get("query", "")
-        try:
-            response = client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant that classifies telecom user queries. Classify the following query into exactly one of these categories: 'billing', 'network', 'plan', or 'knowledge'. Return ONLY the category name in lowercase."},
-                    {"role": "user", "content": q}
-                ],
-                temperature=0
-            )
-            classification = response.choices[0].message.content.strip().lower()
-            
-            # Validate classification
-            if classification in ["billing", "network", "plan", "knowledge"]:
-                state["classification"] = classification
-            else:
-                # Fallback if model returns something unexpected
-                state["classification"] = "knowledge"
-                
-        except Exception as e:
-            print(f"Classification error: {e}")
-            # Fallback to keyword-based classification for general queries
-            q = q.lower()
-            if any(w in q for w in ["bill", "charge", "payment"]):
-                state["classification"] = "billing"
-            elif any(w in q for w in ["network", "signal", "data", "call", "internet", "slow"]):
-                state["classification"] = "network"
-            elif any(w in q for w in ["plan", "recommend", "upgrade", "downgrade"]):
-                state["classification"] = "plan"
-            else:
-                state["classification"] = "knowledge"
+        return {"classification": explicit, "classifications": [explicit], "route_queries": {}}
+    
+    # Local rules/model first; the LLM is only consulted below the confidence threshold.
+    # Multi-intent questions get one label per clause and fan out below.
+    return _decision_update(classifier.classify_intents(state.get("query", ""), llm=llm_classify))
+
+
+async def aclassify_query(state: TelecomState):
+    explicit = _explicit_classification(state)
+    
+    if explicit:
+        return {"classification": explicit, "classifications": [explicit], "route_queries": {}}
+    
+    return _decision_update(await classifier.aclassify_intents(state.get("query", ""), llm=allm_classify))
+
+# Route -> agent node, and the section titles used when several routes answer one question
+ROUTE_NODES = {
+    "billing": "billing_node",
+    "network": "network_node",
+    "plan": "plan_node",
+    "knowledge": "knowledge_node",
+}
+SECTION_TITLES = {
+    "billing": "💳 Billing",
+    "network": "📶 Network",
+    "plan": "📋 Plans",
+    "knowledge": "📚 Knowledge Base",
+}
 
+def _routes(state: TelecomState):
+    return state.get("classifications") or [state.get("classification") or "knowledge"]
+
+def _section_header(route):
+    return f"### {SECTION_TITLES.get(route, route.title())}\n\n"
+
+class RouteTokenWriter:
+    """on_token callback for the live-streamed route; heads the answer with its section title on multi-route turns"""
+
+    def __init__(self, writer, node, header=""):
+        self.writer = writer
+        self.node = node
+        self.header = header
+        self.emitted = False
+
+    def __call__(self, token):
+        if not self.emitted and self.header:
+            self.writer({"node": self.node, "token": self.header})
+        self.emitted = True
+        self.writer({"node": self.node, "token": token})
+
+def token_writer(state: TelecomState, route):
+    """Callback streaming this route's tokens, or None (not streaming, or another route streams live)"""
+    if not state.get("stream") or state.get("stream_route") != route:
+        return None
+    header = _section_header(route) if len(_routes(state)) > 1 else ""
+    return RouteTokenWriter(get_stream_writer(), ROUTE_NODES.get(route, route), header)
+
+def _route_query(state: TelecomState, route):
+    """The part of the question a route answers; multi-intent turns are answered and cached clause by clause"""
+    return (state.get("route_queries") or {}).get(route) or state.get("query", "")
+
+def check_response_cache(state: TelecomState):
+    """Answer each route from the semantic response cache when a near-identical question was already answered"""
+    fingerprints, cached, pending = {}, {}, []
+    for route in _routes(state):
+        fingerprint = customer_fingerprint(route, state.get("customer_context"),
+                                           {name: state.get(name) for name in ROUTE_INPUTS.get(route, ())})
+        fingerprints[route] = fingerprint
+        response = response_cache.lookup(route, fingerprint, _route_query(state, route))
+        if response is None:
+            pending.append(route)
+        else:
+            cached[route] = response
+    
+    state["cache_fingerprints"] = fingerprints
+    state["cached_routes"] = list(cached)
+    state["pending_routes"] = pending
+    state["cache_hit"] = not pending
+    state["stream_route"] = pending[0] if pending else None
+    state["intermediate_responses"] = cached
     return state
 
+def _agent_update(route, response, on_token=None):
+    """Partial state update from one agent branch (branches run in parallel, so never the whole state)"""
+    update = {"intermediate_responses": {route: response}}
+    if on_token is not None and on_token.emitted:
+        update["streamed_routes"] = [route]
+    return update
+
 def run_billing_agent(state: TelecomState):
-    query = state.get("query")
+    query = _route_query(state, "billing")
     customer_id = state.get("customer_id")
     
     if not customer_id:
-        state["intermediate_responses"] = {"result": "Unable to access billing information. Please log in."}
-        return state
+        return _agent_update("billing", "Unable to access billing information. Please log in.")
     
-    response = process_billing_query(query, customer_id=customer_id)
-    state["intermediate_responses"] = {"result": response}
-    return state
+    on_token = token_writer(state, "billing")
+    response = process_billing_query(query, customer_id=customer_id,
+                                     customer_context=state.get("customer_context"),
+                                     on_token=on_token,
+                                     usage_history=state.get("usage_history"))
+    return _agent_update("billing", response, on_token)
 
 def run_network_agent(state: TelecomState):
-    query = state.get("query")
+    query = _route_query(state, "network")
     user_email = state.get("user_email")
     
     if not user_email:
-        state["intermediate_responses"] = {"result": "Unable to access network information. Please log in."}
-        return state
+        return _agent_update("network", "Unable to access network information. Please log in.")
     
-    response = process_network_query(query, user_email)
-    state["intermediate_responses"] = {"result": response}
-    return state
+    on_token = token_writer(state, "network")
+    response = process_network_query(query, user_email,
+                                     customer_context=state.get("customer_context"),
+                                     mode=state.get("network_mode"),
+                                     on_token=on_token)
+    return _agent_update("network", response, on_token)
 
 def run_plan_agent(state: TelecomState):
-    query = state.get("query")
+    query = _route_query(state, "plan")
     customer_id = state.get("customer_id")
     
     if not customer_id:
-        state["intermediate_responses"] = {"result": "Unable to access plan information. Please log in."}
-        return state
+        return _agent_update("plan", "Unable to access plan information. Please log in.")
     
-    response = process_plan_query(query, customer_id=customer_id)
-    state["intermediate_responses"] = {"result": response}
-    return state
+    on_token = token_writer(state, "plan")
+    response = process_plan_query(query, customer_id=customer_id,
+                                  customer_context=state.get("customer_context"),
+                                  plan_catalog=state.get("plan_catalog"),
+                                  usage_history=state.get("usage_history"),
+                                  on_token=on_token)
+    return _agent_update("plan", response, on_token)
 
 def run_knowledge_agent(state: TelecomState):
-    query = state.get("query")
-    response = process_knowledge_query(query)
-    state["intermediate_responses"] = {"result": response}
-    return state
+    query = _route_query(state, "knowledge")
+    on_token = token_writer(state, "knowledge")
+    response = process_knowledge_query(query, on_token=on_token)
+    return _agent_update("knowledge", response, on_token)
+
+async def arun_billing_agent(state: TelecomState):
+    customer_id = state.get("customer_id")
+    if not customer_id:
+        return _agent_update("billing", "Unable to access billing information. Please log in.")
+    
+    on_token = token_writer(state, "billing")
+    response = await aprocess_billing_query(_route_query(state, "billing"), customer_id=customer_id,
+                                            customer_context=state.get("customer_context"),
+                                            on_token=on_token,
+                                            usage_history=state.get("usage_history"))
+    return _agent_update("billing", response, on_token)
+
+async def arun_network_agent(state: TelecomState):
+    user_email = state.get("user_email")
+    if not user_email:
+        return _agent_update("network", "Unable to access network information. Please log in.")
+    
+    on_token = token_writer(state, "network")
+    response = await aprocess_network_query(_route_query(state, "network"), user_email,
+                                            customer_context=state.get("customer_context"),
+                                            mode=state.get("network_mode"),
+                                            on_token=on_token)
+    return _agent_update("network", response, on_token)
+
+async def arun_plan_agent(state: TelecomState):
+    customer_id = state.get("customer_id")
+    if not customer_id:
+        return _agent_update("plan", "Unable to access plan information. Please log in.")
+    
+    on_token = token_writer(state, "plan")
+    response = await aprocess_plan_query(_route_query(state, "plan"), customer_id=customer_id,
+                                         customer_context=state.get("customer_context"),
+                                         plan_catalog=state.get("plan_catalog"),
+                                         usage_history=state.get("usage_history"),
+                                         on_token=on_token)
+    return _agent_update("plan", response, on_token)
+
+async def arun_knowledge_agent(state: TelecomState):
+    on_token = token_writer(state, "knowledge")
+    response = await aprocess_knowledge_query(_route_query(state, "knowledge"), on_token=on_token)
+    return _agent_update("knowledge", response, on_token)
 
 def make_placeholder(name):
     def node(state: TelecomState):
-        state["intermediate_responses"] = {
-            "result": f"{name} processed — {state['query']}"
-        }
-        return state
+        return {"intermediate_responses": {name: f"{name} processed — {state['query']}"}}
     return node
 
+def merge_responses(state: TelecomState):
+    """Combine the per-route answers (cached and fresh) into one reply
+    
+    The live-streamed route comes first, then the rest in classification order;
+    sections that were not streamed are emitted now.
+    """
+    responses = state.get("intermediate_responses") or {}
+    streamed = [route for route in state.get("streamed_routes", []) if route in responses]
+    order = streamed + [route for route in _routes(state) if route in responses and route not in streamed]
+    order += [route for route in responses if route not in order]
+    
+    if not order:
+        return {"final_response": "No response"}
+    
+    multi = len(order) > 1
+    sections = [(route, (_section_header(route) if multi else "") + str(responses[route])) for route in order]
+    
+    if state.get("stream"):
+        writer = get_stream_writer()
+        for i, (route, text) in enumerate(sections):
+            if route not in streamed:
+                writer({"node": "merge_responses", "token": ("\n\n" if i else "") + text})
+    
+    return {"final_response": "\n\n".join(text for _, text in sections)}
+
+# Agent replies that report a failure rather than an answer
+_UNCACHEABLE_PREFIXES = ("Error", "⚠️", "Unable", "Could not", "I'm sorry")
+
 def finalize(state: TelecomState):
-    state["final_response"] = list(state["intermediate_responses"].values())[0]
-    return state
+    # Remember fresh agent answers (per route) for similar follow-up questions
+    responses = state.get("intermediate_responses") or {}
+    fingerprints = state.get("cache_fingerprints") or {}
+    for route in state.get("pending_routes", []):
+        response = responses.get(route)
+        if isinstance(response, str) and not response.startswith(_UNCACHEABLE_PREFIXES):
+            response_cache.store(route, fingerprints.get(route), _route_query(state, route), response)
+    return {}
 
 def create_graph():
+    """Synchronous graph for graph.invoke / graph.stream"""
+    return _build_graph({
+        "get_customer_context": get_customer_context,
+        "classify_query": classify_query,
+        "response_cache": check_response_cache,
+        "billing_node": run_billing_agent,
+        "network_node": run_network_agent,
+        "plan_node": run_plan_agent,
+        "knowledge_node": run_knowledge_agent,
+        "merge_responses": merge_responses,
+        "finalize": finalize,
+    })
+
+def create_async_graph():
+    """Same graph with async nodes, for graph.ainvoke / graph.astream.
+    
+    Many turns can be in flight on one event loop: OpenAI calls use async
+    clients and blocking work (SQLite, CrewAI, AutoGen) runs on the shared
+    worker pool. The in-memory cache check, merge and finalize stay synchronous.
+    Drive it with agents.llm.run_async (or await close_async_clients before the
+    loop closes) so the loop's LLM connections are released.
+    """
+    return _build_graph({
+        "get_customer_context": aget_customer_context,
+        "classify_query": aclassify_query,
+        "response_cache": check_response_cache,
+        "billing_node": arun_billing_agent,
+        "network_node": arun_network_agent,
+        "plan_node": arun_plan_agent,
+        "knowledge_node": arun_knowledge_agent,
+        "merge_responses": merge_responses,
+        "finalize": finalize,
+    })
+
+def _build_graph(nodes):
     sg = StateGraph(TelecomState)
 
-    sg.add_node("get_customer_context", get_customer_context)
-    sg.add_node("classify_query", classify_query)
-    sg.add_node("billing_node", run_billing_agent)
-    sg.add_node("network_node", run_network_agent)
-    sg.add_node("plan_node", run_plan_agent)
-    sg.add_node("knowledge_node", run_knowledge_agent)
-    sg.add_node("finalize", finalize)
+    # Every node run is a span of the turn traced by TracedGraph
+    for name, node in nodes.items():
+        sg.add_node(name, trace_node(name, node))
 
     def router(state: TelecomState):
-        return {
-            "billing": "billing_node",
-            "network": "network_node",
-            "plan": "plan_node",
-            "knowledge": "knowledge_node",
-        }.get(state["classification"], "knowledge_node")
+        # Every uncached route runs as a parallel branch; cache hits skip the agents entirely
+        pending = state.get("pending_routes") or []
+        if not pending:
+            return ["merge_responses"]
+        return [ROUTE_NODES.get(route, "knowledge_node") for route in pending]
 
-    # Add the customer context step first
-    sg.add_edge("get_customer_context", "classify_query")
+    # Customer data is prefetched while the query is classified; both feed the cache check
+    sg.add_edge(START, "get_customer_context")
+    sg.add_edge(START, "classify_query")
+    sg.add_edge(["get_customer_context", "classify_query"], "response_cache")
     
     sg.add_conditional_edges(
-        "classify_query",
+        "response_cache",
         router,
-        {
-            "billing_node": "billing_node",
-            "network_node": "network_node",
-            "plan_node": "plan_node",
-            "knowledge_node": "knowledge_node",
-        }
+        ["billing_node", "network_node", "plan_node", "knowledge_node", "merge_responses"]
     )
 
-    sg.add_edge("billing_node", "finalize")
-    sg.add_edge("network_node", "finalize")
-    sg.add_edge("plan_node", "finalize")
-    sg.add_edge("knowledge_node", "finalize")
-
-    sg.set_entry_point("get_customer_context")
+    # Branches join at the merge, so wall-clock time is the slowest branch
+    sg.add_edge("billing_node", "merge_responses")
+    sg.add_edge("network_node", "merge_responses")
+    sg.add_edge("plan_node", "merge_responses")
+    sg.add_edge("knowledge_node", "merge_responses")
+    sg.add_edge("merge_responses", "finalize")
 
-    return sg.compile()
+    return TracedGraph(sg.compile())
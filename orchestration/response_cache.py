@@ -0,0 +1,165 @@
+"""
+Semantic Response Cache - Reuses agent answers for near-identical questions.
+Keyed by a query embedding plus a fingerprint of the customer data the answer depends on.
+"""
+
+import hashlib
+import json
+import math
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from config.config import config
+from utils.metrics import metrics
+from utils.tracing import record_cache
+
+# Routes whose answers do not depend on who is asking share one namespace
+SHARED_ROUTES = {"knowledge"}
+# Network answers read live incident data that no fingerprint here can see, so they are never cached
+UNCACHED_ROUTES = {"network"}
+# Prefetched state, beyond the customer context, that each route's agent reads
+ROUTE_INPUTS = {
+    "billing": ("usage_history",),
+    "plan": ("plan_catalog", "usage_history"),
+}
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_CONTRACTIONS = {"what's": "what is", "whats": "what is", "how's": "how is", "it's": "it is",
+                 "i'm": "i am", "can't": "can not", "don't": "do not", "isn't": "is not"}
+_STOPWORDS = {
+    "a", "an", "the", "is", "are", "am", "was", "be", "i", "me", "my", "mine", "you", "your",
+    "we", "our", "it", "its", "this", "that", "of", "to", "in", "on", "for", "with", "and",
+    "or", "please", "can", "could", "would", "tell", "about", "what", "do", "does", "so",
+}
+
+
+def embed_query(text, dim=1024):
+    """
+    Local hashed bag-of-words embedding (unigrams + bigrams of content words).
+    Returns a sparse L2-normalised {bucket: weight} dict; no network round-trip.
+    """
+    text = text.lower()
+    for contraction, expansion in _CONTRACTIONS.items():
+        text = text.replace(contraction, expansion)
+    words = [w for w in _WORD_RE.findall(text) if w not in _STOPWORDS]
+    terms = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+    vector = {}
+    for term in terms:
+        bucket = zlib.crc32(term.encode()) % dim
+        vector[bucket] = vector.get(bucket, 0.0) + 1.0
+    norm = math.sqrt(sum(v * v for v in vector.values()))
+    return {k: v / norm for k, v in vector.items()} if norm else {}
+
+
+def cosine(a, b):
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(key, 0.0) for key, weight in a.items())
+
+
+def customer_fingerprint(route, customer_context, route_inputs=None):
+    """
+    Hash of the customer data an answer on this route depends on.
+    route_inputs holds the ROUTE_INPUTS values from the turn state (plan catalogue, usage history).
+    Returns 'shared' for customer-independent routes, None when the turn is not cacheable.
+    """
+    if route in SHARED_ROUTES:
+        return "shared"
+    if route in UNCACHED_ROUTES:
+        return None
+    if not customer_context or customer_context.get("role") != "customer" or not customer_context.get("customer"):
+        return None
+    payload = {
+        "customer": customer_context.get("customer"),
+        "plan": customer_context.get("plan"),
+        "latest_usage": customer_context.get("latest_usage"),
+    }
+    for name in ROUTE_INPUTS.get(route, ()):
+        payload[name] = (route_inputs or {}).get(name)
+    digest = hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+    return digest[:16]
+
+
+class SemanticResponseCache:
+    """
+    In-process vector index of past answers, partitioned by (route, fingerprint).
+    Lookups return the most similar unexpired entry above the threshold;
+    the least recently used entries are evicted beyond max_entries.
+    """
+
+    def __init__(self, threshold=config.RESPONSE_CACHE_THRESHOLD, ttl=config.RESPONSE_CACHE_TTL,
+                 max_entries=config.RESPONSE_CACHE_MAX_ENTRIES, embed=embed_query,
+                 enabled=config.RESPONSE_CACHE_ENABLED):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.embed = embed
+        self.enabled = enabled
+        self._namespaces = {}  # (route, fingerprint) -> {normalised query: (expires_at, vector, response)}
+        self._lru = OrderedDict()  # (namespace, normalised query) in recency order
+        self._lock = threading.Lock()
+
+    def lookup(self, route, fingerprint, query):
+        """Return a cached response for a similar query, or None."""
+        if not self.enabled or fingerprint is None:
+            return None
+        namespace = (route, fingerprint)
+        vector = self.embed(query)
+        now = time.monotonic()
+        best_key, best_score = None, self.threshold
+
+        with self._lock:
+            entries = self._namespaces.get(namespace, {})
+            for key, (expires_at, cached_vector, _) in list(entries.items()):
+                if expires_at <= now:
+                    self._remove(namespace, key)
+                    continue
+                score = cosine(vector, cached_vector)
+                if score >= best_score:
+                    best_key, best_score = key, score
+
+            if best_key is None:
+                metrics.increment(f"response_cache.miss.{route}")
+                record_cache("response", misses=1)
+                return None
+            self._lru.move_to_end((namespace, best_key))
+            metrics.increment(f"response_cache.hit.{route}")
+            record_cache("response", hits=1)
+            return entries[best_key][2]
+
+    def store(self, route, fingerprint, query, response):
+        """Cache a response for this route/fingerprint."""
+        if not self.enabled or fingerprint is None or not response:
+            return
+        namespace = (route, fingerprint)
+        key = query.strip().lower()
+        with self._lock:
+            self._namespaces.setdefault(namespace, {})[key] = (time.monotonic() + self.ttl, self.embed(query), response)
+            self._lru[(namespace, key)] = None
+            self._lru.move_to_end((namespace, key))
+            while len(self._lru) > self.max_entries:
+                (old_namespace, old_key), _ = self._lru.popitem(last=False)
+                self._remove(old_namespace, old_key)
+                metrics.increment("response_cache.evictions")
+
+    def _remove(self, namespace, key):
+        entries = self._namespaces.get(namespace)
+        if entries is not None:
+            entries.pop(key, None)
+            if not entries:
+                del self._namespaces[namespace]
+        self._lru.pop((namespace, key), None)
+
+    def clear(self):
+        with self._lock:
+            self._namespaces.clear()
+            self._lru.clear()
+
+    def __len__(self):
+        return len(self._lru)
+
+
+response_cache = SemanticResponseCache()
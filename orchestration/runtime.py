@@ -0,0 +1,144 @@
+"""
+Shared Runtime - Process-wide warm start of the heavy subsystems.
+Builds the graph, LLM clients and knowledge engine once, in the background.
+"""
+
+import threading
+import time
+
+PENDING = "pending"
+STARTING = "starting"
+READY = "ready"
+DEGRADED = "degraded"
+FAILED = "failed"
+
+
+def _warm_database():
+    from utils.database import db
+    db.ensure_migrated()
+
+
+def _warm_llm_clients():
+    from agents.llm import get_http_client, get_openai_client, get_chat_model
+    get_http_client()
+    get_openai_client()
+    get_chat_model()
+
+
+def _warm_network_agents():
+    # Creates the first AutoGen agent set; later checkouts reuse it
+    from agents.network_agents import agent_pool
+    with agent_pool.checkout():
+        pass
+
+
+def _warm_knowledge():
+    from agents.knowledge_agents import warm_up
+    warm_up()
+
+
+class Runtime:
+    """
+    Warms subsystems in order on a background thread and records how long each took.
+    The graph stage gates readiness; a failure in any later stage leaves the
+    runtime usable but DEGRADED (that subsystem initializes lazily on first use).
+    """
+
+    def __init__(self):
+        self.graph = None
+        self.status = STARTING
+        self.stages = {}
+        self.started_at = None
+        self.total_ms = None
+        self._graph_ready = threading.Event()
+        self._done = threading.Event()
+        self._thread = None
+
+    def _build_graph(self):
+        # Agent frameworks load on first use of their node; the later stages preload them
+        from orchestration.graph import create_graph
+        self.graph = create_graph()
+
+    def plan(self):
+        """(stage name, warm-up function, required) in start order."""
+        return [
+            ("database", _warm_database, False),
+            ("llm_clients", _warm_llm_clients, False),
+            ("graph", self._build_graph, True),
+            ("knowledge", _warm_knowledge, False),
+            ("network_agents", _warm_network_agents, False),
+        ]
+
+    def start(self):
+        """Begin warming up in a daemon thread (idempotent)."""
+        if self._thread is None:
+            self.started_at = time.time()
+            self.stages = {name: {"status": PENDING, "ms": None, "error": None} for name, _, _ in self.plan()}
+            self._thread = threading.Thread(target=self._warm_up, name="runtime-warm-up", daemon=True)
+            self._thread.start()
+        return self
+
+    def _warm_up(self):
+        start = time.perf_counter()
+        for name, warm, required in self.plan():
+            self.stages[name]["status"] = STARTING
+            stage_start = time.perf_counter()
+            try:
+                warm()
+                self.stages[name]["status"] = READY
+            except Exception as e:
+                self.stages[name].update(status=FAILED, error=str(e))
+                if required:
+                    self.status = FAILED
+            self.stages[name]["ms"] = (time.perf_counter() - stage_start) * 1000
+            if self.stages[name]["status"] == READY:
+                print(f"✓ {name} warmed up in {self.stages[name]['ms']:.0f}ms")
+            else:
+                print(f"⚠️ Warm-up of {name} failed after {self.stages[name]['ms']:.0f}ms: {self.stages[name]['error']}")
+
+            if name == "graph":
+                if self.status != FAILED:
+                    self.status = READY
+                self._graph_ready.set()
+
+        if self.status == READY and any(stage["status"] == FAILED for stage in self.stages.values()):
+            self.status = DEGRADED
+        self.total_ms = (time.perf_counter() - start) * 1000
+        self._graph_ready.set()
+        self._done.set()
+
+    @property
+    def ready(self):
+        return self._graph_ready.is_set() and self.graph is not None
+
+    def wait_for_graph(self, timeout=None):
+        """Block until the graph stage finishes; returns the graph (None if it failed or timed out)."""
+        self._graph_ready.wait(timeout)
+        return self.graph
+
+    def wait(self, timeout=None):
+        """Block until every stage has run."""
+        return self._done.wait(timeout)
+
+    def snapshot(self):
+        """Readiness and the per-subsystem startup breakdown."""
+        return {
+            "status": self.status,
+            "ready": self.ready,
+            "total_ms": self.total_ms,
+            "stages": {name: dict(stage) for name, stage in self.stages.items()},
+        }
+
+
+_lock = threading.Lock()
+_runtime = None
+
+
+def get_runtime():
+    """The process-wide runtime, started on first call."""
+    global _runtime
+    if _runtime is None:
+        with _lock:
+            if _runtime is None:
+                _runtime = Runtime().start()
+    return _runtime
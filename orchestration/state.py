@@ -4,17 +4,45 @@ Tracks query, classification, responses, and customer context.
 """
 
 
-from typing import TypedDict, Dict, Any, List, Optional
+from typing import TypedDict, Dict, Any, List, Optional, Annotated
+
+
+def merge_dicts(left, right):
+    """Reducer: parallel agent branches each add their own route's entry."""
+    return {**(left or {}), **(right or {})}
+
+
+def merge_unique(left, right):
+    """Reducer: order-preserving union of lists."""
+    merged = list(left or [])
+    merged += [item for item in (right or []) if item not in merged]
+    return merged
+
 
 class TelecomState(TypedDict, total=False):
     query: str
     service_type: str  # Explicit service type from UI tabs
-    classification: str
-    intermediate_responses: Dict[str, Any]
+    classification: str  # Primary route
+    classifications: List[str]  # Every route the query needs, primary first
+    route_queries: Dict[str, str]  # route -> the part of the query it answers (response cache key)
+    classification_tier: str  # rules / model / llm / llm_failed / fallback
+    classification_confidence: float
+    intermediate_responses: Annotated[Dict[str, Any], merge_dicts]  # route -> answer
     final_response: str
     customer_info: Dict[str, Any]
     chat_history: List[Dict[str, str]]
     user_email: str
     user_role: str
     customer_id: str
+    network_mode: Optional[str]  # 'fast' or 'groupchat'; defaults to config.NETWORK_AGENT_MODE
     customer_data: Optional[Any]
+    customer_context: Optional[Dict[str, Any]]  # Role/profile/plan/latest usage loaded once per turn
+    plan_catalog: Optional[List[Any]]  # get_service_plans rows, prefetched alongside the context
+    usage_history: Optional[List[Any]]  # get_usage_history rows (latest first), prefetched for customers
+    cache_fingerprints: Dict[str, Optional[str]]  # route -> customer-data hash its cached answer is keyed on
+    cached_routes: List[str]  # Routes answered from the response cache
+    pending_routes: List[str]  # Routes whose agents run (in parallel) this turn
+    cache_hit: bool  # Every route was answered from the cache
+    stream: bool  # Agent nodes emit answer tokens through the LangGraph custom stream
+    stream_route: Optional[str]  # The one route streamed live; the others are emitted when merged
+    streamed_routes: Annotated[List[str], merge_unique]
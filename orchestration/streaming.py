@@ -0,0 +1,69 @@
+"""
+Response Streaming - Runs the graph with graph.stream and yields answer tokens.
+Records time-to-first-token so streamed and blocking turns can be compared.
+"""
+
+import time
+from utils.metrics import metrics
+
+
+class ResponseStream:
+    """
+    Iterable of answer tokens for one turn (suitable for st.write_stream).
+    After iteration, final_state and final_response hold the graph result.
+    Turns whose nodes emit no tokens (cache misses on non-streaming paths,
+    login errors) yield the final response as a single chunk.
+    """
+
+    def __init__(self, graph, inputs):
+        self.graph = graph
+        self.inputs = {**inputs, "stream": True}
+        self.final_state = {}
+        self.ttft_ms = None
+        self.total_ms = None
+
+    @property
+    def final_response(self):
+        return self.final_state.get("final_response", "No response")
+
+    def __iter__(self):
+        start = time.perf_counter()
+        for mode, chunk in self.graph.stream(self.inputs, stream_mode=["custom", "values"]):
+            token = self._handle(mode, chunk, start)
+            if token:
+                yield token
+
+        if self.ttft_ms is None:
+            self.ttft_ms = (time.perf_counter() - start) * 1000
+            yield self.final_response
+        self._record(start)
+
+    async def __aiter__(self):
+        """Same as iteration, for graphs built by create_async_graph (graph.astream)."""
+        start = time.perf_counter()
+        async for mode, chunk in self.graph.astream(self.inputs, stream_mode=["custom", "values"]):
+            token = self._handle(mode, chunk, start)
+            if token:
+                yield token
+
+        if self.ttft_ms is None:
+            self.ttft_ms = (time.perf_counter() - start) * 1000
+            yield self.final_response
+        self._record(start)
+
+    def _handle(self, mode, chunk, start):
+        """Track the latest state; return the token carried by a custom event, if any."""
+        if mode == "values":
+            self.final_state = chunk
+            return None
+        token = chunk.get("token") if isinstance(chunk, dict) else None
+        if token and self.ttft_ms is None:
+            self.ttft_ms = (time.perf_counter() - start) * 1000
+        return token
+
+    def _record(self, start):
+        self.total_ms = (time.perf_counter() - start) * 1000
+        route = self.final_state.get("classification") or "unknown"
+        metrics.observe("stream.ttft_ms", self.ttft_ms)
+        metrics.observe(f"stream.ttft_ms.{route}", self.ttft_ms)
+        metrics.observe("stream.total_ms", self.total_ms)
@@ -1,16 +1,178 @@
 """
 Customer Service Module
 Handles database interactions for fetching customer profile and usage data.
+Reads are served from an LRU/TTL cache invalidated by Database.execute writes.
 """
 
+import functools
+import re
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from config.config import config
 from utils.database import db
+from utils.concurrency import run_in_thread
+from utils.tracing import record_cache
 
+
+class CustomerDataCache:
+    """
+    LRU cache with per-entity TTLs and hit/miss counters.
+    Entries are dropped when a write touches one of the tables they were read from.
+    Cached values are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries=config.CACHE_MAX_ENTRIES, enabled=config.CACHE_ENABLED):
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._entries = OrderedDict()  # (entity, key) -> (expires_at, value)
+        self._ttls = {}
+        self._tables = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._stats = defaultdict(lambda: {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0})
+
+    def register(self, entity, ttl, tables):
+        """Declare an entity, its TTL and the tables its values are read from."""
+        self._ttls[entity] = ttl
+        self._tables[entity] = set(tables)
+
+    def get_or_load(self, entity, key, loader):
+        """Return the cached value for (entity, key), calling loader() on a miss."""
+        if not self.enabled:
+            return loader()
+
+        cache_key = (entity, key)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(cache_key)
+                self._stats[entity]["hits"] += 1
+                record_cache("customer_data", hits=1)
+                return entry[1]
+            self._stats[entity]["misses"] += 1
+            generation = self._generation
+        record_cache("customer_data", misses=1)
+
+        value = loader()
+
+        with self._lock:
+            # A write committed while loading may have made this value stale
+            if generation == self._generation:
+                self._entries[cache_key] = (now + self._ttls[entity], value)
+                self._entries.move_to_end(cache_key)
+                while len(self._entries) > self.max_entries:
+                    evicted, _ = self._entries.popitem(last=False)
+                    self._stats[evicted[0]]["evictions"] += 1
+        return value
+
+    def invalidate(self, entity=None, key=None):
+        """Drop one key, one entity, or everything."""
+        with self._lock:
+            self._generation += 1
+            for cache_key in list(self._entries):
+                if (entity is None or cache_key[0] == entity) and (key is None or cache_key[1] == key):
+                    del self._entries[cache_key]
+                    self._stats[cache_key[0]]["invalidations"] += 1
+
+    def invalidate_tables(self, tables):
+        """Drop every entity that was read from any of the given tables."""
+        tables = set(tables)
+        for entity, entity_tables in self._tables.items():
+            if entity_tables & tables:
+                self.invalidate(entity)
+
+    def on_write(self, sql):
+        """Database write listener: invalidate by the table the statement modifies."""
+        match = _WRITE_TABLE_RE.match(sql)
+        if match:
+            self.invalidate_tables([match.group(1).strip('"`[]').lower()])
+        else:
+            self.invalidate()
+
+    def stats(self):
+        """Return per-entity hit/miss counters and current entry counts."""
+        with self._lock:
+            sizes = defaultdict(int)
+            for entity, _ in self._entries:
+                sizes[entity] += 1
+            result = {}
+            for entity in self._ttls:
+                counters = dict(self._stats[entity])
+                lookups = counters["hits"] + counters["misses"]
+                counters["hit_rate"] = counters["hits"] / lookups if lookups else 0.0
+                counters["size"] = sizes[entity]
+                result[entity] = counters
+            return result
+
+
+_WRITE_TABLE_RE = re.compile(
+    r"\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)\s+([\w\"`\[\]]+)",
+    re.IGNORECASE
+)
+
+_CUSTOMER_TABLES = ("users", "customers", "service_plans", "customer_usage")
+
+customer_cache = CustomerDataCache()
+customer_cache.register("role", config.CACHE_TTL_CUSTOMER, ["users"])
+customer_cache.register("context", config.CACHE_TTL_CUSTOMER, _CUSTOMER_TABLES)
+customer_cache.register("profile", config.CACHE_TTL_CUSTOMER, _CUSTOMER_TABLES)
+customer_cache.register("customer_by_id", config.CACHE_TTL_CUSTOMER, ["customers", "service_plans"])
+customer_cache.register("customers", config.CACHE_TTL_CUSTOMER, ["customers", "service_plans"])
+customer_cache.register("usage_history", config.CACHE_TTL_USAGE, ["customer_usage"])
+customer_cache.register("plans", config.CACHE_TTL_PLANS, ["service_plans"])
+customer_cache.register("usage_profiles", config.CACHE_TTL_USAGE, ["customers", "customer_usage"])
+db.add_write_listener(customer_cache.on_write)
+
+
+def cached(entity):
+    """Serve the decorated loader through customer_cache, keyed by its arguments."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args):
+            return customer_cache.get_or_load(entity, args, lambda: fn(*args))
+        wrapper.uncached = fn
+        return wrapper
+    return decorator
+
+
+# Column layout of the single-statement context lookup below
+_CUSTOMER_COLUMNS = ["customer_id", "name", "email", "phone_number", "address",
+                     "account_status", "registration_date", "last_billing_date", "service_plan_id"]
+_PLAN_COLUMNS = ["plan_id", "name", "monthly_cost", "data_limit_gb", "voice_minutes", "sms_count",
+                 "unlimited_data", "unlimited_voice", "unlimited_sms"]
+_USAGE_COLUMNS = ["billing_period_start", "billing_period_end", "data_used_gb", "voice_minutes_used",
+                  "sms_count_used", "additional_charges", "total_bill_amount"]
+
+CUSTOMER_CONTEXT_QUERY = """
+SELECT u.role,
+       c.customer_id, c.name, c.email, c.phone_number, c.address,
+       c.account_status, c.registration_date, c.last_billing_date, c.service_plan_id,
+       p.plan_id, p.name, p.monthly_cost, p.data_limit_gb, p.voice_minutes, p.sms_count,
+       p.unlimited_data, p.unlimited_voice, p.unlimited_sms,
+       us.billing_period_start, us.billing_period_end,
+       us.data_used_gb, us.voice_minutes_used, us.sms_count_used,
+       us.additional_charges, us.total_bill_amount
+FROM users u
+LEFT JOIN customers c ON c.email = u.email
+LEFT JOIN service_plans p ON c.service_plan_id = p.plan_id
+LEFT JOIN customer_usage us ON us.id = (
+    SELECT id FROM customer_usage
+    WHERE customer_id = c.customer_id
+    ORDER BY billing_period_end DESC LIMIT 1
+)
+WHERE u.email = ?
+"""
+
+@cached("role")
 def get_user_role(email):
     """Get user role from users table"""
     user_query = "SELECT role FROM users WHERE email = ?"
     result = db.query_one(user_query, [email])
     return result[0] if result else None
 
+@cached("profile")
 def get_customer_profile(email):
     """
     Fetch customer profile and plan details by email with role-based access.
@@ -88,6 +250,7 @@ def get_admin_dashboard():
     
     return 'ADMIN', admin_data
 
+@cached("customers")
 def get_all_customers():
     """
     Admin function to get all customers
@@ -101,6 +264,7 @@ def get_all_customers():
     """
     return db.query(query)
 
+@cached("customer_by_id")
 def get_customer_by_id(customer_id):
     """
     Admin function to get any customer by ID
@@ -121,6 +285,7 @@ def get_customer_by_id(customer_id):
     
     return customer_id, customer_data
 
+@cached("usage_history")
 def get_usage_history(customer_id):
     """
     Fetch last 6 months of usage history for a customer.
@@ -134,3 +299,142 @@ def get_usage_history(customer_id):
     ORDER BY billing_period_end DESC LIMIT 6
     """
     return db.query(usage_query, [customer_id])
+
+@cached("context")
+def load_customer_context(email):
+    """
+    Load role, profile, plan and latest usage for a user in one statement.
+
+    Returns a dict with:
+    - role: 'admin', 'customer' or None for unknown users
+    - customer_id / customer_data: same values get_customer_profile returns
+    - customer, plan, latest_usage: column dicts (None when missing)
+    """
+    context = {
+        "role": None,
+        "customer_id": None,
+        "customer_data": None,
+        "customer": None,
+        "plan": None,
+        "latest_usage": None,
+    }
+
+    row = db.query_one(CUSTOMER_CONTEXT_QUERY, [email])
+    if not row:
+        return context
+
+    context["role"] = row[0]
+    if context["role"] == 'admin':
+        context["customer_id"], context["customer_data"] = get_admin_dashboard()
+        return context
+    elif context["role"] != 'customer':
+        return context
+
+    customer_end = 1 + len(_CUSTOMER_COLUMNS)
+    plan_end = customer_end + len(_PLAN_COLUMNS)
+    customer = dict(zip(_CUSTOMER_COLUMNS, row[1:customer_end]))
+    plan = dict(zip(_PLAN_COLUMNS, row[customer_end:plan_end]))
+    usage = dict(zip(_USAGE_COLUMNS, row[plan_end:]))
+
+    if customer["customer_id"] is None:
+        return context  # Customer not found
+
+    context["customer"] = customer
+    context["plan"] = plan if plan["plan_id"] is not None else None
+    context["latest_usage"] = usage if usage["billing_period_end"] is not None else None
+    context["customer_id"] = customer["customer_id"]
+    # Same tuple layout as get_customer_data_by_email for the dashboard and agents
+    context["customer_data"] = (
+        customer["customer_id"], customer["name"], customer["email"], customer["phone_number"],
+        customer["address"], customer["account_status"], customer["registration_date"],
+        customer["last_billing_date"], plan["name"], plan["monthly_cost"], plan["data_limit_gb"],
+        plan["voice_minutes"], plan["sms_count"], plan["unlimited_data"], plan["unlimited_voice"],
+        plan["unlimited_sms"],
+    )
+    return context
+
+async def aload_customer_context(email):
+    """Async load_customer_context; the SQLite work runs on the shared worker pool"""
+    return await run_in_thread(load_customer_context, email)
+
+def prefetch_customer_data(email):
+    """Everything an agent may need for this user, fetched before routing is decided
+    
+    Returns:
+        Dict with 'context' (load_customer_context), 'plan_catalog' (get_service_plans)
+        and 'usage_history' (get_usage_history, None for non-customers)
+    """
+    context = load_customer_context(email)
+    usage_history = get_usage_history(context["customer_id"]) if context.get("customer") else None
+    return {"context": context, "plan_catalog": get_service_plans(), "usage_history": usage_history}
+
+async def aprefetch_customer_data(email):
+    """Async prefetch_customer_data"""
+    return await run_in_thread(prefetch_customer_data, email)
+
+@cached("plans")
+def get_service_plans():
+    """
+    Fetch the full service plan catalogue.
+    The first six columns match the plan agent's original tool output.
+    """
+    plans_query = """
+    SELECT plan_id, name, monthly_cost, data_limit_gb, voice_minutes, sms_count,
+           unlimited_data, unlimited_voice, unlimited_sms, plan_type, features
+    FROM service_plans
+    ORDER BY plan_id
+    """
+    return db.query(plans_query)
+
+@cached("usage_profiles")
+def get_usage_profiles(months):
+    """
+    Average monthly usage over each customer's latest `months` billing periods,
+    for scoring plans across the whole customer base in one pass.
+
+    Rows: (customer_id, name, service_plan_id, avg data GB, avg voice minutes, avg SMS)
+    """
+    profiles_query = """
+    SELECT c.customer_id, c.name, c.service_plan_id,
+           AVG(u.data_used_gb), AVG(u.voice_minutes_used), AVG(u.sms_count_used)
+    FROM customers c
+    JOIN (
+        SELECT customer_id, data_used_gb, voice_minutes_used, sms_count_used,
+               ROW_NUMBER() OVER (PARTITION BY customer_id ORDER BY billing_period_end DESC) AS recency
+        FROM customer_usage
+    ) u ON u.customer_id = c.customer_id AND u.recency <= ?
+    GROUP BY c.customer_id, c.name, c.service_plan_id
+    ORDER BY c.customer_id
+    """
+    return db.query(profiles_query, [months])
+
+def get_plan_optimization(limit=100):
+    """
+    Latest completed bulk plan optimization run (services.plan_optimization).
+
+    Returns (run, top switchers): run is a dict or None when the job has never
+    completed; switchers are (customer_id, name, current plan, current cost,
+    recommended plan, recommended cost, savings), largest saving first.
+    """
+    run = db.query_one("""
+    SELECT run_id, finished_at, lookback_months, customers, switchers, total_monthly_savings,
+           elapsed_seconds, customers_per_second
+    FROM plan_optimization_runs
+    WHERE status = 'completed'
+    ORDER BY run_id DESC LIMIT 1
+    """)
+    if not run:
+        return None, []
+    run = dict(zip(["run_id", "finished_at", "lookback_months", "customers", "switchers",
+                    "total_monthly_savings", "elapsed_seconds", "customers_per_second"], run))
+    switchers = db.query("""
+    SELECT r.customer_id, c.name, cp.name, r.current_cost, rp.name, r.recommended_cost, r.savings
+    FROM plan_recommendations r
+    JOIN customers c ON c.customer_id = r.customer_id
+    LEFT JOIN service_plans cp ON cp.plan_id = r.current_plan_id
+    LEFT JOIN service_plans rp ON rp.plan_id = r.recommended_plan_id
+    WHERE r.run_id = ? AND r.savings > 0
+    ORDER BY r.savings DESC
+    LIMIT ?
+    """, [run["run_id"], limit])
+    return run, switchers
@@ -0,0 +1,137 @@
+"""
+Network Analytics - Deterministic incident aggregates for the admin network view.
+One grouped SQL pass over network_incidents, rolled up by area, severity and issue type.
+"""
+
+import time
+from utils.database import db
+from utils.metrics import metrics
+
+CLOSED_STATUSES = ("resolved", "closed")
+_CLOSED_SQL = ", ".join(f"'{status}'" for status in CLOSED_STATUSES)
+SEVERITY_ORDER = ["critical", "high", "medium", "low"]
+
+# One row per (area, severity, issue_type); every rollup below is derived from these rows
+INCIDENT_AGGREGATE_QUERY = f"""
+SELECT area, severity, issue_type,
+       COUNT(*) AS total,
+       SUM(CASE WHEN lower(status) IN ({_CLOSED_SQL}) THEN 1 ELSE 0 END) AS closed,
+       COUNT(resolved_date) AS repaired,
+       SUM((julianday(resolved_date) - julianday(reported_date)) * 24) AS repair_hours
+FROM network_incidents
+GROUP BY area, severity, issue_type
+"""
+
+ACCOUNT_STATUS_QUERY = """
+SELECT account_status, COUNT(*)
+FROM customers
+GROUP BY account_status
+"""
+
+
+def _empty_bucket():
+    return {"total": 0, "open": 0, "closed": 0, "repaired": 0, "repair_hours": 0.0}
+
+
+def _add(bucket, total, closed, repaired, repair_hours):
+    bucket["total"] += total
+    bucket["closed"] += closed
+    bucket["open"] += total - closed
+    bucket["repaired"] += repaired
+    bucket["repair_hours"] += repair_hours or 0.0
+
+
+def _finish(bucket):
+    """Replace the repair accumulators with MTTR in hours (None when nothing was repaired)."""
+    repaired = bucket.pop("repaired")
+    repair_hours = bucket.pop("repair_hours")
+    bucket["mttr_hours"] = round(repair_hours / repaired, 2) if repaired else None
+    return bucket
+
+
+def _severity_key(severity):
+    severity = (severity or "").lower()
+    return (SEVERITY_ORDER.index(severity) if severity in SEVERITY_ORDER else len(SEVERITY_ORDER), severity)
+
+
+def get_network_overview(database=None):
+    """
+    Compute incident and account aggregates for admins.
+
+    Returns:
+        Dict with totals, MTTR, by_area/by_severity/by_issue_type breakdowns
+        ({key: {total, open, closed, mttr_hours}}), account_status counts and latency_ms
+    """
+    database = database or db
+    start = time.perf_counter()
+
+    rows = database.query(INCIDENT_AGGREGATE_QUERY)
+    account_status = {status or "Unknown": count for status, count in database.query(ACCOUNT_STATUS_QUERY)}
+
+    overall = _empty_bucket()
+    by_area, by_severity, by_issue_type = {}, {}, {}
+    for area, severity, issue_type, total, closed, repaired, repair_hours in rows:
+        for group, key in ((by_area, area), (by_severity, severity), (by_issue_type, issue_type)):
+            _add(group.setdefault(key, _empty_bucket()), total, closed, repaired, repair_hours)
+        _add(overall, total, closed, repaired, repair_hours)
+
+    _finish(overall)
+    overview = {
+        "total_incidents": overall["total"],
+        "open_incidents": overall["open"],
+        "closed_incidents": overall["closed"],
+        "mttr_hours": overall["mttr_hours"],
+        # Areas and issue types with the most open incidents first
+        "by_area": {k: _finish(v) for k, v in sorted(by_area.items(), key=lambda kv: (-kv[1]["open"], kv[0]))},
+        "by_severity": {k: _finish(v) for k, v in sorted(by_severity.items(), key=lambda kv: _severity_key(kv[0]))},
+        "by_issue_type": {k: _finish(v) for k, v in sorted(by_issue_type.items(), key=lambda kv: (-kv[1]["open"], kv[0]))},
+        "account_status": account_status,
+    }
+    overview["latency_ms"] = (time.perf_counter() - start) * 1000
+    metrics.observe("network.admin_overview_ms", overview["latency_ms"])
+    return overview
+
+
+def _format_hours(hours):
+    return "n/a" if hours is None else f"{hours:.1f}h"
+
+
+def _format_group(title, group, limit=None):
+    lines = [f"**{title}**"]
+    items = list(group.items())
+    for key, stats in items[:limit]:
+        lines.append(f"- {key}: {stats['open']} open / {stats['closed']} closed "
+                     f"(MTTR {_format_hours(stats['mttr_hours'])})")
+    if limit is not None and len(items) > limit:
+        lines.append(f"- ... {len(items) - limit} more")
+    return lines
+
+
+def format_network_overview(overview, query=""):
+    """Render the overview as markdown; areas named in the query are shown on their own."""
+    query_lower = (query or "").lower()
+    by_area = overview["by_area"]
+    focus = {area: stats for area, stats in by_area.items() if area and area.lower() in query_lower}
+
+    lines = [
+        "📡 **Network System Overview**",
+        f"- Total incidents: {overview['total_incidents']} "
+        f"({overview['open_incidents']} open, {overview['closed_incidents']} closed)",
+        f"- Mean time to resolve: {_format_hours(overview['mttr_hours'])}",
+        "",
+    ]
+    if not overview["total_incidents"]:
+        lines.append("No network incidents have been recorded.")
+    else:
+        lines += _format_group("By severity", overview["by_severity"]) + [""]
+        if focus:
+            lines += _format_group("Requested areas", focus) + [""]
+        else:
+            lines += _format_group("By area", by_area, limit=10) + [""]
+        lines += _format_group("By issue type", overview["by_issue_type"], limit=10)
+
+    if overview["account_status"]:
+        lines += ["", "**Customer accounts**: " + ", ".join(
+            f"{status} {count}" for status, count in sorted(overview["account_status"].items())
+        )]
+    return "\n".join(lines)
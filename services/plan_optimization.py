@@ -0,0 +1,204 @@
+"""
+Plan Optimization Job - Offline "what-if" plan scoring for the whole customer base.
+Streams usage in key-range chunks through a process pool and materializes the results.
+"""
+
+import argparse
+import math
+import sqlite3
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from config.config import config
+from agents.plan_recommender import PlanMatrix, recommend_batch
+
+# get_service_plans layout (the columns PlanMatrix reads)
+PLANS_QUERY = """
+SELECT plan_id, name, monthly_cost, data_limit_gb, voice_minutes, sms_count,
+       unlimited_data, unlimited_voice, unlimited_sms
+FROM service_plans
+ORDER BY plan_id
+"""
+
+# Average usage over the latest N periods for customers in (low, high]; the key range
+# keeps each chunk on idx_customer_usage_customer_period
+CHUNK_PROFILE_QUERY = """
+SELECT u.customer_id, c.service_plan_id,
+       AVG(u.data_used_gb), AVG(u.voice_minutes_used), AVG(u.sms_count_used)
+FROM (
+    SELECT customer_id, data_used_gb, voice_minutes_used, sms_count_used,
+           ROW_NUMBER() OVER (PARTITION BY customer_id ORDER BY billing_period_end DESC) AS recency
+    FROM customer_usage
+    WHERE customer_id > ? AND customer_id <= ?
+) u
+JOIN customers c ON c.customer_id = u.customer_id
+WHERE u.recency <= ?
+GROUP BY u.customer_id, c.service_plan_id
+"""
+
+_INSERT_RESULT = """
+INSERT INTO plan_recommendations (run_id, customer_id, current_plan_id, current_cost,
+                                  recommended_plan_id, recommended_cost, savings)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Per-process state, set by _init_worker (each worker has its own read-only connection)
+_worker = {}
+
+
+def _init_worker(db_path, plans, months):
+    _worker["conn"] = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    _worker["matrix"] = PlanMatrix(plans)
+    _worker["months"] = months
+
+
+def _close_worker():
+    conn = _worker.pop("conn", None)
+    if conn is not None:
+        conn.close()
+    _worker.clear()
+
+
+def score_chunk(bounds):
+    """Optimal plan for every customer with usage in the (low, high] key range."""
+    low, high = bounds
+    rows = _worker["conn"].execute(CHUNK_PROFILE_QUERY, [low, high, _worker["months"]]).fetchall()
+    if not rows:
+        return []
+    matrix = _worker["matrix"]
+    result = recommend_batch([row[2:5] for row in rows], matrix, [row[1] for row in rows])
+    return [
+        (row[0], row[1], _nullable(result["current_cost"][i]), matrix.ids[result["best"][i]],
+         float(result["best_cost"][i]), _nullable(result["savings"][i]))
+        for i, row in enumerate(rows)
+    ]
+
+
+def _nullable(value):
+    value = float(value)
+    return None if math.isnan(value) else value
+
+
+def chunk_bounds(conn, chunk_size):
+    """Stream (low, high] customer_id ranges of chunk_size customers off the customers key index."""
+    cursor = conn.execute("SELECT customer_id FROM customers ORDER BY customer_id")
+    low = ""
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            return
+        yield low, rows[-1][0]
+        low = rows[-1][0]
+
+
+def print_progress(done, total, elapsed):
+    rate = done / elapsed if elapsed else 0.0
+    print(f"  {done:,}/{total:,} customers ({done / total * 100 if total else 100:.0f}%) "
+          f"- {rate:,.0f} customers/s")
+
+
+def run_optimization(database=None, workers=None, chunk_size=None, months=None, on_progress=print_progress):
+    """
+    Score every customer with usage against every plan and materialize the results.
+
+    Chunks of chunk_size customers are read and scored by `workers` processes
+    (in this process when workers is 1); this process is the only writer. The
+    results become visible as one completed run in plan_optimization_runs, and
+    the previous run's rows are dropped. Returns the run summary; customers
+    without usage history are counted as skipped.
+    """
+    if database is None:
+        from utils.database import db as database
+    database.ensure_migrated()
+    workers = workers or config.PLAN_JOB_WORKERS
+    chunk_size = chunk_size or config.PLAN_JOB_CHUNK_SIZE
+    months = months or config.PLAN_LOOKBACK_MONTHS
+
+    plans = [tuple(plan) for plan in database.query(PLANS_QUERY)]
+    # Chunks only return customers with usage; the rest have nothing to score
+    with_usage, customers = database.query_one(
+        "SELECT SUM(EXISTS (SELECT 1 FROM customer_usage u WHERE u.customer_id = c.customer_id)), COUNT(*) "
+        "FROM customers c")
+    total = with_usage or 0
+    run_id = database.execute("INSERT INTO plan_optimization_runs (lookback_months) VALUES (?)", [months])
+    summary = {"run_id": run_id, "customers": 0, "skipped": customers - total, "switchers": 0,
+               "total_monthly_savings": 0.0}
+    start = time.perf_counter()
+
+    def write(rows):
+        # Through the Database API so the customer-service cache sees the new results
+        if rows:
+            database.executemany(_INSERT_RESULT, [(run_id, *row) for row in rows])
+        summary["customers"] += len(rows)
+        savings = [row[5] for row in rows if row[5] is not None and row[5] > 0]
+        summary["switchers"] += len(savings)
+        summary["total_monthly_savings"] += sum(savings)
+        if on_progress:
+            on_progress(summary["customers"], total, time.perf_counter() - start)
+
+    reader = database.get_connection()
+    try:
+        if plans and workers <= 1:
+            _init_worker(database.db_path, plans, months)
+            try:
+                for bounds in chunk_bounds(reader, chunk_size):
+                    write(score_chunk(bounds))
+            finally:
+                _close_worker()
+        elif plans:
+            with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                     initargs=(database.db_path, plans, months)) as pool:
+                # At most two chunks per worker in flight, so memory stays flat at any base size
+                pending = set()
+                for bounds in chunk_bounds(reader, chunk_size):
+                    pending.add(pool.submit(score_chunk, bounds))
+                    if len(pending) >= workers * 2:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            write(future.result())
+                for future in pending:
+                    write(future.result())
+    except Exception as e:
+        database.execute("UPDATE plan_optimization_runs SET status = 'failed', finished_at = CURRENT_TIMESTAMP, "
+                         "error = ? WHERE run_id = ?", [str(e), run_id])
+        database.execute("DELETE FROM plan_recommendations WHERE run_id = ?", [run_id])
+        raise
+    finally:
+        reader.close()
+
+    elapsed = time.perf_counter() - start
+    summary["elapsed_seconds"] = elapsed
+    summary["customers_per_second"] = summary["customers"] / elapsed if elapsed else 0.0
+    database.execute("""UPDATE plan_optimization_runs
+                        SET status = 'completed', finished_at = CURRENT_TIMESTAMP, customers = ?, switchers = ?,
+                            total_monthly_savings = ?, elapsed_seconds = ?, customers_per_second = ?
+                        WHERE run_id = ?""",
+                     [summary["customers"], summary["switchers"], summary["total_monthly_savings"],
+                      elapsed, summary["customers_per_second"], run_id])
+    database.execute("DELETE FROM plan_recommendations WHERE run_id < ?", [run_id])
+    return summary
+
+
+def format_summary(summary):
+    return (f"Run {summary['run_id']}: {summary['customers']:,} customers scored in "
+            f"{summary['elapsed_seconds']:.1f}s ({summary['customers_per_second']:,.0f} customers/s); "
+            f"{summary['switchers']:,} would save ${summary['total_monthly_savings']:,.2f}/month by switching"
+            + (f"; {summary['skipped']:,} without usage skipped" if summary.get("skipped") else ""))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk plan optimization for every customer")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    run_parser = subcommands.add_parser("run", help="Score every customer and materialize the results")
+    run_parser.add_argument("--workers", type=int, default=config.PLAN_JOB_WORKERS, help="Scoring processes")
+    run_parser.add_argument("--chunk-size", type=int, default=config.PLAN_JOB_CHUNK_SIZE, help="Customers per chunk")
+    run_parser.add_argument("--months", type=int, default=config.PLAN_LOOKBACK_MONTHS,
+                            help="Billing periods averaged per customer")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        print(format_summary(run_optimization(workers=args.workers, chunk_size=args.chunk_size, months=args.months)))
+
+
+if __name__ == "__main__":
+    main()
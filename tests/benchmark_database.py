@@ -0,0 +1,99 @@
+import sys
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.database import Database
+
+CUSTOMERS = 2000
+QUERIES_PER_THREAD = 2000
+THREADS = [1, 4, 8]
+
+LOOKUP_SQL = """
+SELECT c.customer_id, c.name, c.account_status, p.name, p.monthly_cost
+FROM customers c
+LEFT JOIN service_plans p ON c.service_plan_id = p.plan_id
+WHERE c.customer_id = ?
+"""
+
+
+class UnpooledDatabase:
+    """The pre-pool behaviour: one sqlite3.connect() per call."""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+
+    def query_one(self, sql, params=None):
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        try:
+            cursor.execute(sql, params or [])
+            return cursor.fetchone()
+        finally:
+            conn.close()
+
+
+def seed(db_path):
+    database = Database(db_path)
+    database.create_tables()
+    conn = sqlite3.connect(db_path)
+    conn.executemany(
+        "INSERT INTO service_plans (name, plan_type, monthly_cost, data_limit_gb, voice_minutes, sms_count) VALUES (?, ?, ?, ?, ?, ?)",
+        [(f"Plan {i}", "postpaid", 10.0 * i, 5.0 * i, 100 * i, 100 * i) for i in range(1, 6)]
+    )
+    conn.executemany(
+        "INSERT INTO customers (customer_id, name, email, service_plan_id) VALUES (?, ?, ?, ?)",
+        [(f"CUST{i:05d}", f"Customer {i}", f"c{i}@example.com", i % 5 + 1) for i in range(CUSTOMERS)]
+    )
+    conn.commit()
+    conn.close()
+
+
+def run(database, threads):
+    def worker(offset):
+        for i in range(QUERIES_PER_THREAD):
+            database.query_one(LOOKUP_SQL, [f"CUST{(offset + i) % CUSTOMERS:05d}"])
+
+    workers = [threading.Thread(target=worker, args=(n * 97,)) for n in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - start
+    return threads * QUERIES_PER_THREAD / elapsed
+
+
+def benchmark_database():
+    """Compare queries/sec of connect-per-query against the pooled Database."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        seed(db_path)
+
+        pooled = Database(db_path)
+        unpooled = UnpooledDatabase(db_path)
+
+        print("=" * 80)
+        print("DATABASE CONNECTION BENCHMARK")
+        print("=" * 80)
+        print(f"{'Threads':>8} {'Before (q/s)':>15} {'After (q/s)':>15} {'Speedup':>10}")
+
+        results = []
+        for threads in THREADS:
+            before = run(unpooled, threads)
+            after = run(pooled, threads)
+            results.append((threads, before, after))
+            print(f"{threads:>8} {before:>15,.0f} {after:>15,.0f} {after / before:>9.1f}x")
+
+        pooled.pool.close_all()
+        print("=" * 80)
+        return results
+
+
+if __name__ == "__main__":
+    benchmark_database()
@@ -0,0 +1,77 @@
+import sys
+import os
+import statistics
+import tempfile
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from llama_index.core import SimpleDirectoryReader, Settings
+from agents.embeddings import BACKENDS, create_embed_model
+from config.config import config
+
+QUESTIONS = [
+    "How do I activate international roaming?",
+    "Why is my bill higher this month?",
+    "What should I do if my phone has no signal?",
+    "Which plans include unlimited data?",
+    "How do I enable VoLTE on my device?",
+    "When is 5G available in my area?",
+    "How are late payment fees calculated?",
+    "Can I keep my number when switching plans?",
+]
+
+
+def document_chunks():
+    documents = SimpleDirectoryReader(config.DOCUMENTS_PATH).load_data()
+    return [node.get_content() for node in Settings.node_parser.get_nodes_from_documents(documents)]
+
+
+def query_latency_ms(model):
+    timings = []
+    for question in QUESTIONS:
+        start = time.perf_counter()
+        model.get_query_embedding(question)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def ingestion_rate(model, chunks):
+    start = time.perf_counter()
+    model.get_text_embedding_batch(chunks)
+    return len(chunks) / (time.perf_counter() - start)
+
+
+def benchmark_embeddings():
+    """Compare query-embedding latency and ingestion throughput per backend, cold and cached."""
+    chunks = document_chunks()
+
+    print("=" * 80)
+    print(f"EMBEDDING BACKEND BENCHMARK ({len(chunks)} chunks from data/documents, batch {config.EMBEDDING_BATCH_SIZE})")
+    print("=" * 80)
+    print(f"{'Backend':>8} {'Query p50 (ms)':>16} {'Cached p50 (ms)':>16} {'Ingest (chunks/s)':>18} {'Cached (chunks/s)':>18}")
+
+    results = {}
+    for backend in BACKENDS:
+        with tempfile.TemporaryDirectory() as tmp:
+            try:
+                model = create_embed_model(backend, cache_path=os.path.join(tmp, "embeddings.db"))
+                model.get_query_embedding("warm up")  # model load / connection setup
+            except Exception as e:
+                print(f"{backend:>8} skipped: {e}")
+                continue
+
+            cold_query = query_latency_ms(model)
+            cached_query = query_latency_ms(model)
+            cold_ingest = ingestion_rate(model, chunks)
+            cached_ingest = ingestion_rate(model, chunks)
+            results[backend] = (cold_query, cached_query, cold_ingest, cached_ingest)
+            print(f"{backend:>8} {cold_query:>16.1f} {cached_query:>16.2f} {cold_ingest:>18,.1f} {cached_ingest:>18,.0f}")
+
+    print("=" * 80)
+    return results
+
+
+if __name__ == "__main__":
+    benchmark_embeddings()
@@ -0,0 +1,52 @@
+import sys
+import os
+import tempfile
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import config
+from services.plan_optimization import run_optimization, format_summary
+from utils.database import Database
+from utils.synthetic_data import generate
+
+CUSTOMERS = int(os.getenv("BENCH_CUSTOMERS", "1000000"))
+MONTHS = 3
+
+
+def benchmark_plan_optimization():
+    """Throughput of the bulk plan optimization job on a synthetic customer base, per worker count."""
+    worker_counts = sorted({1, config.PLAN_JOB_WORKERS})
+    with tempfile.TemporaryDirectory() as tmp:
+        database = Database(os.path.join(tmp, "bulk.db"))
+
+        print("=" * 80)
+        print(f"PLAN OPTIMIZATION BENCHMARK ({CUSTOMERS:,} customers x {MONTHS} months, "
+              f"chunks of {config.PLAN_JOB_CHUNK_SIZE:,})")
+        print("=" * 80)
+        start = time.perf_counter()
+        counts = generate(database, CUSTOMERS, MONTHS)
+        print(f"Generated {counts['customers']:,} customers / {counts['usage_rows']:,} usage rows "
+              f"in {time.perf_counter() - start:.1f}s")
+
+        results = {}
+        for workers in worker_counts:
+            def progress(done, total, elapsed):
+                if done == total or done % (config.PLAN_JOB_CHUNK_SIZE * 10) == 0:
+                    print(f"  [{workers} worker(s)] {done:,}/{total:,} - {done / elapsed:,.0f} customers/s")
+
+            summary = run_optimization(database, workers=workers, on_progress=progress)
+            results[workers] = summary["customers_per_second"]
+            print(format_summary(summary))
+
+        print(f"{'Workers':>8} {'Customers/s':>14}")
+        for workers, rate in results.items():
+            print(f"{workers:>8} {rate:>14,.0f}")
+        database.pool.close_all()
+        print("=" * 80)
+        return results
+
+
+if __name__ == "__main__":
+    benchmark_plan_optimization()
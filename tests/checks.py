@@ -0,0 +1,20 @@
+"""
+Checks - Shared pass/fail bookkeeping for the test scripts.
+Each suite still returns (passed, failed) to run_all_tests.
+"""
+
+
+class Checks:
+    """Callable check(description, condition) that prints ✅/❌ and counts the results."""
+
+    def __init__(self):
+        self.passed = 0
+        self.failed = 0
+
+    def __call__(self, description, condition):
+        if condition:
+            print(f"✅ {description}")
+            self.passed += 1
+        else:
+            print(f"❌ {description}")
+            self.failed += 1
@@ -0,0 +1,126 @@
+import sys
+import os
+import argparse
+import statistics
+import tempfile
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chromadb
+from llama_index.core import VectorStoreIndex, SimpleDirectoryReader, StorageContext
+from llama_index.core.node_parser import SentenceSplitter
+from llama_index.vector_stores.chroma import ChromaVectorStore
+
+from agents.embeddings import get_embed_model
+from agents.hybrid_retrieval import BM25Index, HybridRetriever, create_reranker
+from config.config import config
+
+# (question, phrase the retrieved context must contain to answer it)
+EVAL_SET = [
+    ("What APN should I configure for TeleServe internet?", "internet.teleserve.co.in"),
+    ("How do I switch on VoLTE calls?", "VoLTE Calls"),
+    ("Which iPhone models work on 5G?", "iPhone 12/13/14/15"),
+    ("What is the peak mmWave download speed?", "Up to 3 Gbps"),
+    ("How long do billing disputes take to resolve?", "5-7 business days"),
+    ("Do you charge a convenience fee for online payments?", "convenience fees"),
+    ("How much does BASIC_100 cost per month?", "₹499"),
+    ("What speed do I get after the 150GB FUP on PREM_UNL?", "64Kbps"),
+    ("What is the dialer code to forward calls when busy?", "*67*"),
+    ("How do I reset Wi-Fi, mobile and Bluetooth settings?", "Reset Wi-Fi, mobile & Bluetooth"),
+    ("What is the IMAP incoming server for my email?", "imap.teleserve.co.in"),
+    ("How do I set up auto-pay for my bill?", "Auto-pay Setup"),
+    ("Which cities are in 5G phase 2 and how far along is Pune?", "Pune (Ongoing"),
+    ("How many connections can share the family plan?", "Up to 4 connections"),
+    ("Samsung service mode code *#0011#", "*#0011#"),
+]
+
+
+class BM25Retriever:
+    """BM25 alone, for comparison."""
+
+    def __init__(self, bm25, top_k):
+        self.bm25 = bm25
+        self.top_k = top_k
+
+    def retrieve(self, query):
+        return self.bm25.retrieve(query, self.top_k)
+
+
+def evaluate(name, retriever, k):
+    hits = 0
+    latencies = []
+    for question, phrase in EVAL_SET:
+        start = time.perf_counter()
+        results = retriever.retrieve(question)[:k]
+        latencies.append((time.perf_counter() - start) * 1000)
+        if any(phrase in result.node.get_content() for result in results):
+            hits += 1
+    recall = hits / len(EVAL_SET)
+    print(f"{name:>16} {recall:>10.0%} {statistics.median(latencies):>14.1f}")
+    return recall
+
+
+def stage_latencies(retriever):
+    """Median per-stage latency over the eval set for a HybridRetriever."""
+    stages = {}
+    for question, _ in EVAL_SET:
+        retriever.retrieve(question)
+        for stage, ms in retriever.last_timings.items():
+            stages.setdefault(stage, []).append(ms)
+    return {stage: statistics.median(values) for stage, values in stages.items()}
+
+
+def document_nodes(chunk_size):
+    documents = SimpleDirectoryReader(config.DOCUMENTS_PATH, filename_as_id=True).load_data()
+    return SentenceSplitter(chunk_size=chunk_size, chunk_overlap=20).get_nodes_from_documents(documents)
+
+
+def eval_retrieval(k=3, chunk_size=256, rerank=False):
+    """Recall@k of BM25, vector and hybrid retrieval over data/documents, with per-stage latency."""
+    nodes = document_nodes(chunk_size)
+    bm25 = BM25Index.build([{"id": node.node_id, "text": node.get_content(), "metadata": node.metadata}
+                            for node in nodes])
+
+    print("=" * 80)
+    print(f"RETRIEVAL EVALUATION ({len(EVAL_SET)} questions, {len(nodes)} chunks of {chunk_size} tokens)")
+    print("=" * 80)
+    print(f"{'Retriever':>16} {f'Recall@{k}':>10} {'p50 (ms)':>14}")
+
+    results = {"bm25": evaluate("bm25", BM25Retriever(bm25, k), k)}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            embed_model = get_embed_model()
+            collection = chromadb.PersistentClient(path=tmp).get_or_create_collection("eval_docs")
+            storage_context = StorageContext.from_defaults(vector_store=ChromaVectorStore(chroma_collection=collection))
+            index = VectorStoreIndex(nodes, storage_context=storage_context, embed_model=embed_model)
+        except Exception as e:
+            # No embedding backend available here: BM25 is still evaluated
+            print(f"{'vector':>16} skipped: {e}")
+            print("=" * 80)
+            return results
+
+        results["vector"] = evaluate("vector", index.as_retriever(similarity_top_k=k), k)
+        candidates = index.as_retriever(similarity_top_k=config.RETRIEVAL_CANDIDATES)
+        hybrid = HybridRetriever(candidates, bm25, top_k=k)
+        results["hybrid"] = evaluate("hybrid (rrf)", hybrid, k)
+        stages = stage_latencies(hybrid)
+        if rerank:
+            reranked = HybridRetriever(candidates, bm25, top_k=k, reranker=create_reranker(k))
+            results["hybrid+rerank"] = evaluate("hybrid+rerank", reranked, k)
+            stages = stage_latencies(reranked)
+        print("\nPer-stage p50 (ms): " + ", ".join(f"{stage} {ms:.1f}" for stage, ms in stages.items()))
+
+    print("=" * 80)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Knowledge retrieval evaluation")
+    parser.add_argument("-k", type=int, default=config.RETRIEVAL_TOP_K)
+    parser.add_argument("--chunk-size", type=int, default=256)
+    parser.add_argument("--rerank", action="store_true", help="Also evaluate the cross-encoder rerank stage")
+    args = parser.parse_args()
+    eval_retrieval(k=args.k, chunk_size=args.chunk_size, rerank=args.rerank)
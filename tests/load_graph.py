@@ -0,0 +1,209 @@
+import sys
+import os
+import argparse
+import random
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Mixed traffic: (route, query); multi-intent questions fan out to several agents
+QUERY_MIX = {
+    "billing": [
+        "What's my bill this month?",
+        "Why is my bill so high?",
+        "How much data did I use?",
+        "Explain the extra charges on my invoice",
+    ],
+    "plan": [
+        "Recommend a better plan for my usage",
+        "Is there a cheaper plan for me?",
+        "Should I upgrade my plan?",
+    ],
+    "network": [
+        "No signal on my phone in Mumbai",
+        "Internet keeps dropping in Bangalore",
+        "Is there an outage in my area?",
+    ],
+    "knowledge": [
+        "What is VoLTE?",
+        "How do I enable Wi-Fi calling?",
+        "Explain APN settings",
+    ],
+    "multi": [
+        "Why is my bill high and should I change plans?",
+        "My internet is slow and what is 5G?",
+    ],
+}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Drive create_graph().invoke at a target concurrency "
+                                                 "against a stub LLM and a synthetic database")
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight")
+    parser.add_argument("--customers", type=int, default=10000, help="Synthetic customers")
+    parser.add_argument("--months", type=int, default=3, help="Billing periods per customer")
+    parser.add_argument("--incidents", type=int, default=500, help="Synthetic network incidents")
+    parser.add_argument("--routes", default=",".join(QUERY_MIX), help="Comma-separated subset of the query mix")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Stub LLM latency per call")
+    parser.add_argument("--jitter-ms", type=float, default=10.0, help="Stub LLM latency variation")
+    parser.add_argument("--base-url", help="Existing OpenAI-compatible endpoint instead of the built-in stub")
+    parser.add_argument("--db", help="Existing database (default: a fresh synthetic one)")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the semantic response cache")
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args(argv)
+
+
+class NodeTimer:
+    """LangChain callback handler recording the duration of each LangGraph node run."""
+
+    def __init__(self):
+        from langchain_core.callbacks import BaseCallbackHandler
+
+        timer = self
+
+        class Handler(BaseCallbackHandler):
+            def on_chain_start(self, serialized, inputs, *, run_id, metadata=None, **kwargs):
+                if metadata and kwargs.get("name") == metadata.get("langgraph_node"):
+                    timer.started[run_id] = (kwargs["name"], time.perf_counter())
+
+            def on_chain_end(self, outputs, *, run_id, **kwargs):
+                timer.finish(run_id)
+
+            def on_chain_error(self, error, *, run_id, **kwargs):
+                timer.finish(run_id)
+
+        self.handler = Handler()
+        self.started = {}
+        self.durations = []
+
+    def finish(self, run_id):
+        started = self.started.pop(run_id, None)
+        if started:
+            name, start = started
+            self.durations.append((name, (time.perf_counter() - start) * 1000))
+
+
+def build_workload(args, emails):
+    rng = random.Random(args.seed)
+    routes = [route.strip() for route in args.routes.split(",") if route.strip() in QUERY_MIX]
+    return [(route, rng.choice(QUERY_MIX[route]), rng.choice(emails))
+            for route in (rng.choice(routes) for _ in range(args.requests))]
+
+
+def run_one(graph, query, email):
+    """Invoke the graph once; returns (latency_ms, agent path, node durations, error)."""
+    timer = NodeTimer()
+    state = {"query": query, "customer_info": {"email": email}, "chat_history": []}
+    start = time.perf_counter()
+    try:
+        result = graph.invoke(state, config={"callbacks": [timer.handler]})
+        error = None
+    except Exception as e:
+        result, error = {}, f"{type(e).__name__}: {e}"
+    latency = (time.perf_counter() - start) * 1000
+    path = "+".join(result.get("classifications") or [result.get("classification") or "error"])
+    if result.get("cache_hit"):
+        path += " (cached)"
+    return latency, path, timer.durations, error
+
+
+def latency_table(title, samples):
+    from utils.metrics import percentile
+
+    lines = [f"\n{title}", f"{'':<28} {'count':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}  (ms)"]
+    for name in sorted(samples, key=lambda n: -len(samples[n])):
+        values = sorted(samples[name])
+        lines.append(f"{name:<28} {len(values):>6} {percentile(values, 50):>9.1f} {percentile(values, 95):>9.1f} "
+                     f"{percentile(values, 99):>9.1f} {values[-1]:>9.1f}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    workdir = tempfile.mkdtemp(prefix="telecom-load-")
+
+    # The stub and the scratch paths must be in the environment before config is imported
+    stub = None
+    if not args.base_url:
+        from tests.stub_llm_server import StubLLMServer
+        stub = StubLLMServer(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms)
+        args.base_url = stub.start()
+    os.environ["OPENAI_BASE_URL"] = args.base_url
+    os.environ["OPENAI_API_KEY"] = os.environ.get("OPENAI_API_KEY") or "sk-load-test"
+    os.environ["DB_PATH"] = args.db or os.path.join(workdir, "telecom.db")
+    os.environ["CHROMA_PATH"] = os.path.join(workdir, "chromadb")
+    os.environ["EMBEDDING_CACHE_PATH"] = os.path.join(workdir, "embedding_cache.db")
+    os.environ["TRACE_JSONL_PATH"] = os.path.join(workdir, "traces.jsonl")
+    if args.no_cache:
+        os.environ["RESPONSE_CACHE_ENABLED"] = "false"
+
+    from utils.database import db
+    from utils.synthetic_data import customer_email, generate
+    from orchestration.graph import create_graph
+
+    print("=" * 80)
+    print(f"GRAPH LOAD TEST ({args.requests} requests, concurrency {args.concurrency}, LLM at {args.base_url})")
+    print("=" * 80)
+    if not args.db:
+        start = time.perf_counter()
+        counts = generate(db, args.customers, args.months, args.incidents, args.seed)
+        print(f"Generated {counts['customers']:,} customers, {counts['usage_rows']:,} usage rows and "
+              f"{counts['incidents']:,} incidents in {time.perf_counter() - start:.1f}s")
+    db.ensure_migrated()
+    total_customers = db.query_one("SELECT COUNT(*) FROM customers")[0]
+    rng = random.Random(args.seed)
+    emails = [row[0] for row in db.query("SELECT email FROM customers WHERE rowid IN (%s)" % ",".join(
+        str(rng.randint(1, total_customers)) for _ in range(min(500, total_customers))))]
+
+    graph = create_graph()
+    workload = build_workload(args, emails)
+
+    # One untimed request per route builds the agents, the knowledge index and the connection pools
+    print("Warming up...")
+    for route in dict.fromkeys(route for route, _, _ in workload):
+        latency, _, _, error = run_one(graph, QUERY_MIX[route][0], emails[0])
+        print(f"  {route:<10} {latency:>9.1f} ms" + (f"  ({error})" if error else ""))
+
+    node_samples, path_samples, errors = defaultdict(list), defaultdict(list), defaultdict(int)
+    lock = threading.Lock()
+
+    def worker(item):
+        route, query, email = item
+        latency, path, durations, error = run_one(graph, query, email)
+        with lock:
+            path_samples[path].append(latency)
+            path_samples["(all requests)"].append(latency)
+            for node, duration in durations:
+                node_samples[node].append(duration)
+            if error:
+                errors[error] += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(args.concurrency) as pool:
+        list(pool.map(worker, workload))
+    elapsed = time.perf_counter() - start
+
+    print(f"\n{args.requests} requests in {elapsed:.1f}s - {args.requests / elapsed:.1f} requests/s "
+          f"at concurrency {args.concurrency}" + (f"; stub served {stub.requests}" if stub else ""))
+    print(latency_table("Latency per agent path", path_samples))
+    print(latency_table("Latency per node", node_samples))
+    if errors:
+        print(f"\n{sum(errors.values())} failed request(s):")
+        for error, count in sorted(errors.items(), key=lambda item: -item[1]):
+            print(f"  {count:>5} x {error[:160]}")
+    print("=" * 80)
+
+    db.pool.close_all()
+    if stub:
+        stub.stop()
+    return path_samples, node_samples
+
+
+if __name__ == "__main__":
+    main()
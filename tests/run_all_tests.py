@@ -6,6 +6,25 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from test_classification import test_classification
 from test_e2e import test_end_to_end
+from test_query_plans import test_query_plans
+from test_network_concurrency import test_network_concurrency
+from test_network_analytics import test_network_analytics
+from test_streaming import test_streaming
+from test_async_graph import test_async_graph
+from test_multi_intent import test_multi_intent
+from test_prefetch import test_prefetch
+from test_knowledge_ingest import test_knowledge_ingest
+from test_embedding_cache import test_embedding_cache
+from test_hybrid_retrieval import test_hybrid_retrieval
+from test_faq_answers import test_faq_answers
+from test_runtime import test_runtime
+from test_import_time import test_import_time
+from test_billing_calculator import test_billing_calculator
+from test_plan_recommender import test_plan_recommender
+from test_plan_optimization import test_plan_optimization
+from test_load_harness import test_load_harness
+from test_tracing import test_tracing
+from test_tiered_classifier import test_tiered_classifier
 
 def run_all_tests():
     """Run all test suites."""
@@ -18,17 +37,131 @@ def run_all_tests():
     total_failed = 0
     
     # Test 1: Classification
-    print("\n[1/2] Running Classification Tests...")
+    print("\n[1/21] Running Classification Tests...")
     passed, failed = test_classification()
     total_passed += passed
     total_failed += failed
     
     # Test 2: End-to-End
-    print("\n[2/2] Running End-to-End Tests...")
+    print("\n[2/21] Running End-to-End Tests...")
     passed, failed = test_end_to_end()
     total_passed += passed
     total_failed += failed
     
+    # Test 3: Query Plans
+    print("\n[3/21] Running Query Plan Tests...")
+    passed, failed = test_query_plans()
+    total_passed += passed
+    total_failed += failed
+    
+    # Test 4: Network agent concurrency
+    print("\n[4/21] Running Network Concurrency Tests...")
+    passed, failed = test_network_concurrency()
+    total_passed += passed
+    total_failed += failed
+    
+    # Test 5: Admin network analytics
+    print("\n[5/21] Running Admin Network Analytics Tests...")
+    passed, failed = test_network_analytics()
+    total_passed += passed
+    total_failed += failed
+    
+    # Test 6: Streaming
+    print("\n[6/21] Running Streaming Tests...")
+    passed, failed = test_streaming()
+    total_passed += passed
+    total_failed += failed
+    
+    # Test 7: Async Graph
+    print("\n[7/21] Running Async Graph Tests...")
+    passed, failed = test_async_graph()
+    total_passed += passed
+    total_failed += failed
+    
+    # Test 8: Multi-Intent
+    print("\n[8/21] Running Multi-Intent Tests...")
+    passed, failed = test_multi_intent()
+    total_passed += passed
+    total_failed += failed
+    
+    # Test 9: Speculative Prefetch
+    print("\n[9/21] Running Speculative Prefetch Tests...")
+    passed, failed = test_prefetch()
+    total_passed += passed
+    total_failed += failed
+    
+    # Test 10: Knowledge Ingestion
+    print("\n[10/21] Running Knowledge Ingestion Tests...")
+    passed, failed = test_knowledge_ingest()
+    total_passed += passed
+    total_failed += failed
+    
+    # Test 11: Embedding Cache
+    print("\n[11/21] Running Embedding Cache Tests...")
+    passed, failed = test_embedding_cache()
+    total_passed += passed
+    total_failed += failed
+    
+    # Test 12: Hybrid Retrieval
+    print("\n[12/21] Running Hybrid Retrieval Tests...")
+    passed, failed = test_hybrid_retrieval()
+    total_passed += passed
+    total_failed += failed
+    
+    # Test 13: Extractive FAQ Answers
+    print("\n[13/21] Running Extractive FAQ Answers Tests...")
+    passed, failed = test_faq_answers()
+    total_passed += passed
+    total_failed += failed
+    
+    # Test 14: Shared Runtime
+    print("\n[14/21] Running Shared Runtime Tests...")
+    passed, failed = test_runtime()
+    total_passed += passed
+    total_failed += failed
+    
+    # Test 15: Import Time
+    print("\n[15/21] Running Import Time Tests...")
+    passed, failed = test_import_time()
+    total_passed += passed
+    total_failed += failed
+    
+    # Test 16: Billing Calculator
+    print("\n[16/21] Running Billing Calculator Tests...")
+    passed, failed = test_billing_calculator()
+    total_passed += passed
+    total_failed += failed
+    
+    # Test 17: Plan Recommender
+    print("\n[17/21] Running Plan Recommender Tests...")
+    passed, failed = test_plan_recommender()
+    total_passed += passed
+    total_failed += failed
+    
+    # Test 18: Plan Optimization Job
+    print("\n[18/21] Running Plan Optimization Job Tests...")
+    passed, failed = test_plan_optimization()
+    total_passed += passed
+    total_failed += failed
+    
+    # Test 19: Load Harness
+    print("\n[19/21] Running Load Harness Tests...")
+    passed, failed = test_load_harness()
+    total_passed += passed
+    total_failed += failed
+    
+    # Test 20: Tracing
+    print("\n[20/21] Running Tracing Tests...")
+    passed, failed = test_tracing()
+    total_passed += passed
+    total_failed += failed
+    
+    # Test 21: Tiered Classifier
+    print("\n[21/21] Running Tiered Classifier Tests...")
+    passed, failed = test_tiered_classifier()
+    total_passed += passed
+    total_failed += failed
+    
     # Final Summary
     print("\n" + "=" * 80)
     print("FINAL TEST SUMMARY")
@@ -0,0 +1,201 @@
+import argparse
+import base64
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+EMBEDDING_DIMENSIONS = 1536
+
+# Classification replies; no project imports, so a load test can point config at the stub first
+LABEL_KEYWORDS = [
+    ("billing", ("bill", "charge", "pay", "invoice", "owe", "refund", "cost")),
+    ("network", ("signal", "network", "internet", "drop", "slow", "outage", "connect", "call")),
+    ("plan", ("plan", "upgrade", "downgrade", "recommend", "switch", "cheaper")),
+]
+
+ANSWERS = [
+    "Based on your account details, everything looks in order. Let me know if you need anything else.",
+    "I have reviewed your request. Here is a summary of what I found and the recommended next steps.",
+    "Thanks for reaching out. The information you asked for is shown below with the key figures highlighted.",
+    "Here is what I can tell you from the records available. Please contact support if anything looks wrong.",
+]
+
+
+def _digest(text):
+    return hashlib.sha256(text.encode()).digest()
+
+
+def _tokens(text):
+    """Rough token count (about four characters per token), enough for usage accounting."""
+    return max(1, len(text) // 4)
+
+
+def complete(messages):
+    """Deterministic reply to a chat conversation: same messages, same answer."""
+    system = " ".join(m.get("content") or "" for m in messages if m.get("role") == "system")
+    prompt = "\n".join(str(m.get("content") or "") for m in messages)
+    last = next((str(m.get("content") or "") for m in reversed(messages) if m.get("role") == "user"), prompt)
+    if "classif" in system.lower():
+        words = last.lower()
+        return next((label for label, keywords in LABEL_KEYWORDS if any(k in words for k in keywords)), "knowledge")
+    answer = ANSWERS[_digest(prompt)[0] % len(ANSWERS)]
+    if "Final Answer:" in prompt:
+        # CrewAI agents stop on a ReAct final answer
+        answer = f"Thought: I now can give a great answer\nFinal Answer: {answer}"
+    if "TERMINATE" in prompt:
+        answer += "\nTERMINATE"
+    return answer
+
+
+def embed(text, dimensions=EMBEDDING_DIMENSIONS):
+    """Unit vector seeded from the text, so equal texts embed identically."""
+    seed = int.from_bytes(_digest(text)[:8], "little")
+    vector = np.random.default_rng(seed).standard_normal(dimensions).astype(np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+class StubLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+        stub = self.server.stub
+        stub.wait()
+        path = self.path.split("?")[0].rstrip("/")
+        if path.endswith("/chat/completions"):
+            stub.count("chat")
+            self._chat(body)
+        elif path.endswith("/embeddings"):
+            stub.count("embeddings")
+            self._embeddings(body)
+        else:
+            self._json({"error": {"message": f"Unknown endpoint {self.path}", "type": "invalid_request_error"}}, 404)
+
+    def _chat(self, body):
+        messages = body.get("messages") or []
+        content = complete(messages)
+        usage = {"prompt_tokens": sum(_tokens(str(m.get("content") or "")) for m in messages),
+                 "completion_tokens": _tokens(content)}
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        response_id = f"chatcmpl-{_digest(content).hex()[:24]}"
+        model = body.get("model", "stub")
+        created = int(time.time())
+
+        if not body.get("stream"):
+            self._json({
+                "id": response_id, "object": "chat.completion", "created": created, "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content},
+                             "finish_reason": "stop"}],
+                "usage": usage,
+            })
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        chunk = {"id": response_id, "object": "chat.completion.chunk", "created": created, "model": model}
+        pieces = [{"role": "assistant", "content": ""}] + [{"content": p} for p in re.findall(r"\S+\s*", content)]
+        for delta in pieces:
+            self._event({**chunk, "choices": [{"index": 0, "delta": delta, "finish_reason": None}]})
+        self._event({**chunk, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                     **({"usage": usage} if (body.get("stream_options") or {}).get("include_usage") else {})})
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+        self.close_connection = True
+
+    def _embeddings(self, body):
+        inputs = body.get("input")
+        inputs = [inputs] if isinstance(inputs, str) else inputs or []
+        dimensions = body.get("dimensions") or EMBEDDING_DIMENSIONS
+        data = []
+        for i, text in enumerate(inputs):
+            vector = embed(str(text), dimensions)
+            encoded = (base64.b64encode(vector.tobytes()).decode() if body.get("encoding_format") == "base64"
+                       else vector.tolist())
+            data.append({"object": "embedding", "index": i, "embedding": encoded})
+        tokens = sum(_tokens(str(text)) for text in inputs)
+        self._json({"object": "list", "data": data, "model": body.get("model", "stub"),
+                    "usage": {"prompt_tokens": tokens, "total_tokens": tokens}})
+
+    def _event(self, payload):
+        self.wfile.write(f"data: {json.dumps(payload)}\n\n".encode())
+        self.wfile.flush()
+
+    def _json(self, payload, status=200):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class StubLLMServer:
+    """
+    OpenAI-compatible chat completion and embedding server with canned, deterministic
+    answers and a fixed per-request latency, so load tests measure this app and not the model.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency_ms=0.0, jitter_ms=0.0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.requests = {"chat": 0, "embeddings": 0}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), StubLLMHandler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def wait(self):
+        delay = self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+    def count(self, kind):
+        with self._lock:
+            self.requests[kind] += 1
+
+    def start(self):
+        """Serve on a background thread; returns the base URL to use as OPENAI_BASE_URL."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Deterministic OpenAI-compatible stub for load tests")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay added to every request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Random +/- variation of the delay")
+    args = parser.parse_args(argv)
+
+    server = StubLLMServer(port=args.port, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms)
+    print(f"Stub LLM server on {server.base_url} (export OPENAI_BASE_URL={server.base_url})")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import sys
+import os
+import asyncio
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import orchestration.graph as graph_module
+import services.customer_service as customer_service
+import agents.billing_agents as billing_agents
+import agents.llm as llm
+from orchestration.graph import create_async_graph
+from orchestration.response_cache import response_cache
+from orchestration.streaming import ResponseStream
+
+CONCURRENT_QUERIES = 24
+AGENT_LATENCY = 0.2  # Simulated model round-trip per query
+
+
+async def fake_aprocess_plan_query(query, customer_id="CUST001", customer_context=None, on_token=None,
+                                   plan_catalog=None, usage_history=None):
+    """Async agent stand-in: awaits like a real model call and streams two chunks."""
+    await asyncio.sleep(AGENT_LATENCY)
+    if on_token:
+        on_token(f"Plan answer for {customer_id}")
+        on_token(f" ({query})")
+    return f"Plan answer for {customer_id} ({query})"
+
+
+def fake_process_billing_query(query, customer_id, customer_context=None, on_token=None, usage_history=None):
+    """Sync agent stand-in (like CrewAI): blocks its thread for the whole call."""
+    time.sleep(AGENT_LATENCY)
+    return f"Billing answer for {customer_id} ({query})"
+
+
+def fake_load_customer_context(email):
+    customer_id = email.split("@")[0].upper()
+    return {
+        "role": "customer",
+        "customer_id": customer_id,
+        "customer_data": None,
+        "customer": {"customer_id": customer_id, "name": customer_id, "account_status": "Active"},
+        "plan": {"name": "Basic"},
+        "latest_usage": None,
+    }
+
+
+def turn(i, service_type):
+    email = f"cust{i:03d}@example.com"
+    return {
+        "query": f"question {i}",
+        "service_type": service_type,
+        "chat_history": [],
+        "classification": None,
+        "intermediate_responses": {},
+        "final_response": None,
+        "user_email": email,
+        "customer_info": {"email": email},
+    }
+
+
+async def run_concurrently(graph, service_type):
+    start = time.perf_counter()
+    results = await asyncio.gather(*(graph.ainvoke(turn(i, service_type)) for i in range(CONCURRENT_QUERIES)))
+    return results, time.perf_counter() - start
+
+
+async def stream_one(graph):
+    stream = ResponseStream(graph, turn(999, "plan"))
+    tokens = [token async for token in stream]
+    return tokens, stream
+
+
+def test_async_graph():
+    """Check the async graph overlaps concurrent turns on a single event loop."""
+    print("=" * 80)
+    print("ASYNC GRAPH TESTS")
+    print("=" * 80)
+
+    passed = 0
+    failed = 0
+    sequential = CONCURRENT_QUERIES * AGENT_LATENCY
+
+    originals = (graph_module.aprocess_plan_query, billing_agents.process_billing_query,
+                 customer_service.load_customer_context, customer_service.get_service_plans,
+                 customer_service.get_usage_history)
+    graph_module.aprocess_plan_query = fake_aprocess_plan_query
+    billing_agents.process_billing_query = fake_process_billing_query
+    customer_service.load_customer_context = fake_load_customer_context
+    customer_service.get_service_plans = lambda: []
+    customer_service.get_usage_history = lambda customer_id: []
+    response_cache.clear()
+
+    try:
+        graph = create_async_graph()
+        for service_type, label in (("plan", "async agent"), ("billing", "thread-offloaded agent")):
+            results, elapsed = llm.run_async(run_concurrently(graph, service_type))
+            correct = all(
+                result["final_response"].endswith(f"for CUST{i:03d} (question {i})")
+                for i, result in enumerate(results)
+            )
+            if correct and elapsed < sequential / 4:
+                print(f"✅ {label}: {CONCURRENT_QUERIES} turns in {elapsed:.2f}s "
+                      f"(sequential would take {sequential:.1f}s)")
+                passed += 1
+            else:
+                print(f"❌ {label}: {elapsed:.2f}s for {CONCURRENT_QUERIES} turns, answers correct={correct}")
+                failed += 1
+
+        tokens, stream = llm.run_async(stream_one(graph))
+        if tokens == ["Plan answer for CUST999", " (question 999)"] and stream.final_response == "".join(tokens):
+            print(f"✅ astream yields agent tokens (first after {stream.ttft_ms:.0f}ms)")
+            passed += 1
+        else:
+            print(f"❌ astream tokens: {tokens}")
+            failed += 1
+
+        async def open_clients():
+            return llm.get_async_http_client(), llm.get_async_openai_client()
+
+        http_client, openai_client = llm.run_async(open_clients())
+        if http_client.is_closed and openai_client.is_closed() and not llm._loop_clients:
+            print("✅ run_async closes the loop's LLM clients before the loop shuts down")
+            passed += 1
+        else:
+            print("❌ async LLM clients left open after run_async")
+            failed += 1
+    finally:
+        (graph_module.aprocess_plan_query, billing_agents.process_billing_query,
+         customer_service.load_customer_context, customer_service.get_service_plans,
+         customer_service.get_usage_history) = originals
+        response_cache.clear()
+
+    print(f"\n{'=' * 80}")
+    print(f"SUMMARY: {passed} passed, {failed} failed")
+    print("=" * 80)
+
+    return passed, failed
+
+
+if __name__ == "__main__":
+    passed, failed = test_async_graph()
+    sys.exit(0 if failed == 0 else 1)
@@ -0,0 +1,105 @@
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import agents.billing_agents as billing_agents
+from agents.billing_calculator import compute_bill, format_simple_answer, format_facts
+from config.config import config
+from tests.checks import Checks
+
+PLAN = {"plan_id": 2, "name": "Standard Plan", "monthly_cost": 45.0, "data_limit_gb": 10.0,
+        "voice_minutes": 500, "sms_count": 200, "unlimited_data": 0, "unlimited_voice": 0, "unlimited_sms": 1}
+USAGE = {"billing_period_start": "2024-02-01", "billing_period_end": "2024-02-29", "data_used_gb": 12.5,
+         "voice_minutes_used": 420, "sms_count_used": 900, "additional_charges": 12.5, "total_bill_amount": 57.5}
+PREVIOUS = ("2024-01-01", "2024-01-31", 9.0, 380, 150, 0.0, 50.0)
+
+CONTEXT = {
+    "customer_id": "CUST002",
+    "customer": {"customer_id": "CUST002", "name": "Priya Sharma", "email": "priya@example.com", "service_plan_id": 2},
+    "plan": PLAN,
+    "latest_usage": USAGE,
+}
+
+
+class FakeCrew:
+    def __init__(self):
+        self.inputs = []
+
+    def kickoff(self, inputs):
+        self.inputs.append(inputs)
+        return "narrated analysis"
+
+
+def test_billing_calculator():
+    """Check the bill breakdown, the templated simple answer and fact-only narration."""
+    print("=" * 80)
+    print("BILLING CALCULATOR TESTS")
+    print("=" * 80)
+
+    check = Checks()
+
+    # 1. Per-dimension deltas against the plan limits
+    facts = compute_bill(PLAN, USAGE, billing_agents.usage_from_row(PREVIOUS))
+    data, voice, sms = (facts["dimensions"][name] for name in ("data", "voice", "sms"))
+    check("data overage computed", data["delta"] == 2.5 and data["overage"] == 2.5 and data["percent_used"] == 125)
+    check("usage under the limit has a negative delta and no overage", voice["delta"] == -80 and voice["overage"] == 0)
+    check("unlimited dimension never overage", sms["unlimited"] and sms["limit"] is None and sms["overage"] == 0)
+
+    # 2. Month over month
+    mom = facts["month_over_month"]
+    check("month-over-month change computed", mom["total"]["change"] == 7.5 and round(mom["total"]["change_pct"], 1) == 15.0
+          and mom["data"]["change"] == 3.5)
+    check("no usage yet: total unknown, base kept",
+          compute_bill(PLAN, None)["total"] is None and compute_bill(PLAN, None)["base"] == 45.0)
+
+    # 3. Templated answer
+    answer = format_simple_answer(facts, "Priya Sharma")
+    check("templated answer has total, breakdown, overage and trend",
+          all(part in answer for part in ["$57.50", "Standard Plan): $45.00", "$12.50", "2.5 GB of data", "up $7.50 (+15.0%)"]))
+    check("blank customer name gets no greeting",
+          format_simple_answer(facts, "   ").startswith("your current bill")
+          and format_simple_answer(facts, "   ") == format_simple_answer(facts, None))
+    check("fact sheet states the deltas for the LLM", "over by 2.5 GB" in format_facts(facts)
+          and "80 minutes remaining" in format_facts(facts))
+
+    # 4. Simple queries skip the crew entirely; detailed ones get precomputed facts
+    crew = FakeCrew()
+    originals = (billing_agents.get_billing_crew, billing_agents.get_usage_history, config.BILLING_ANSWER_MODE)
+    billing_agents.get_billing_crew = lambda kind: crew
+    billing_agents.get_usage_history = lambda customer_id: [tuple(USAGE.values()), PREVIOUS]
+    try:
+        tokens = []
+        start = time.perf_counter()
+        answer = billing_agents.process_billing_query("What's my bill?", "CUST002", CONTEXT, on_token=tokens.append)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        check(f"simple query answered from the template in {elapsed_ms:.1f}ms",
+              answer.startswith("Hi Priya, your current bill is **$57.50**") and tokens == [answer] and not crew.inputs)
+
+        answer = billing_agents.process_billing_query("Why is my bill so high?", "CUST002", CONTEXT)
+        check("detailed query narrates computed facts", answer == "narrated analysis"
+              and "Data usage: 12.5 GB of 10.0 GB (over by 2.5 GB" in crew.inputs[-1]["billing_data"])
+
+        billing_agents.get_usage_history = lambda customer_id: []
+        answer = billing_agents.process_billing_query("What's my bill?", "CUST002", CONTEXT,
+                                                      usage_history=[tuple(USAGE.values()), PREVIOUS])
+        check("prefetched usage history used for month over month without a DB read", "up $7.50 (+15.0%)" in answer)
+
+        config.BILLING_ANSWER_MODE = "llm"
+        billing_agents.process_billing_query("What's my bill?", "CUST002", CONTEXT)
+        check("llm mode always uses the crew", len(crew.inputs) == 2 and crew.inputs[-1]["total_bill_amount"] == "57.50")
+    finally:
+        billing_agents.get_billing_crew, billing_agents.get_usage_history, config.BILLING_ANSWER_MODE = originals
+
+    print(f"\n{'=' * 80}")
+    print(f"SUMMARY: {check.passed} passed, {check.failed} failed")
+    print("=" * 80)
+
+    return check.passed, check.failed
+
+
+if __name__ == "__main__":
+    passed, failed = test_billing_calculator()
+    sys.exit(0 if failed == 0 else 1)
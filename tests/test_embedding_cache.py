@@ -0,0 +1,83 @@
+import sys
+import os
+import asyncio
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from llama_index.core.embeddings import MockEmbedding
+from agents.embeddings import CachedEmbedding, EmbeddingCache, collection_name
+from config.config import config
+from tests.checks import Checks
+
+TEXTS = [f"chunk {i} about roaming charges" for i in range(10)]
+
+
+class CountingEmbedding(MockEmbedding):
+    """Offline embedding model that counts calls and returns a vector per text."""
+
+    calls: int = 0
+    embedded: int = 0
+
+    def _get_text_embedding(self, text):
+        self.embedded += 1
+        return [float(len(text)), 0.25] + [0.5] * (self.embed_dim - 2)
+
+    def _get_text_embeddings(self, texts):
+        self.calls += 1
+        return [self._get_text_embedding(text) for text in texts]
+
+    def _get_query_embedding(self, query):
+        self.embedded += 1
+        return [1.0] * self.embed_dim
+
+
+def test_embedding_cache():
+    """Check the embedding cache batches misses, persists vectors and keeps collections per backend."""
+    print("=" * 80)
+    print("EMBEDDING CACHE TESTS")
+    print("=" * 80)
+
+    check = Checks()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = os.path.join(tmp, "embeddings.db")
+        inner = CountingEmbedding(embed_dim=4, embed_batch_size=64)
+        model = CachedEmbedding(inner, EmbeddingCache(cache_path))
+
+        # 1. Cold batch goes to the model in one call
+        vectors = model.get_text_embedding_batch(TEXTS)
+        check("cold batch embedded in a single model call", inner.calls == 1 and inner.embedded == 10)
+
+        # 2. Partially cached batch only sends the misses
+        inner.calls = inner.embedded = 0
+        mixed = model.get_text_embedding_batch(TEXTS[:5] + ["a brand new chunk"])
+        check("only cache misses reach the model", inner.embedded == 1 and mixed[:5] == vectors[:5])
+
+        # 3. Vectors survive a restart (new cache instance on the same file)
+        inner.calls = inner.embedded = 0
+        reopened = CachedEmbedding(inner, EmbeddingCache(cache_path))
+        check("cached vectors persist across instances",
+              reopened.get_text_embedding_batch(TEXTS) == vectors and inner.embedded == 0)
+
+        # 4. Query embeddings are cached separately from document embeddings
+        first = reopened.get_query_embedding(TEXTS[0])
+        again = asyncio.run(reopened.aget_query_embedding(TEXTS[0]))
+        check("query embedding cached under its own key", inner.embedded == 1 and first == again == [1.0] * 4)
+
+    # 5. Each backend has its own collection
+    check("local backend uses a separate collection",
+          collection_name("openai") == config.KNOWLEDGE_COLLECTION
+          and collection_name("local").startswith(f"{config.KNOWLEDGE_COLLECTION}_local_"))
+
+    print(f"\n{'=' * 80}")
+    print(f"SUMMARY: {check.passed} passed, {check.failed} failed")
+    print("=" * 80)
+
+    return check.passed, check.failed
+
+
+if __name__ == "__main__":
+    passed, failed = test_embedding_cache()
+    sys.exit(0 if failed == 0 else 1)
@@ -0,0 +1,97 @@
+import sys
+import os
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chromadb
+from llama_index.core.embeddings import MockEmbedding
+from llama_index.core.retrievers import BaseRetriever
+from llama_index.core.schema import NodeWithScore, TextNode
+from agents.hybrid_retrieval import BM25Index, HybridRetriever, reciprocal_rank_fusion, tokenize, bm25_path_for
+from agents.knowledge_ingest import ingest
+from tests.checks import Checks
+
+CHUNKS = [
+    {"id": "apn", "text": "Set the APN to internet.teleserve.co.in with IPv4/IPv6 protocol.", "metadata": {}},
+    {"id": "volte", "text": "Toggle on VoLTE Calls under Mobile Networks for HD voice.", "metadata": {}},
+    {"id": "signal", "text": "Weak signal makes calls drop. Move closer to a window for better signal.", "metadata": {}},
+    {"id": "bill", "text": "Your bill includes one-time charges and usage beyond plan limits.", "metadata": {}},
+]
+
+
+def node(node_id, text=""):
+    return NodeWithScore(node=TextNode(id_=node_id, text=text), score=1.0)
+
+
+class FixedRetriever(BaseRetriever):
+    """Stands in for the vector retriever: always returns the same ranking."""
+
+    def __init__(self, ids):
+        super().__init__()
+        self.ids = ids
+
+    def _retrieve(self, query_bundle):
+        texts = {chunk["id"]: chunk["text"] for chunk in CHUNKS}
+        return [node(node_id, texts[node_id]) for node_id in self.ids]
+
+
+def test_hybrid_retrieval():
+    """Check BM25 exact-term hits, reciprocal-rank fusion and the hybrid retriever."""
+    print("=" * 80)
+    print("HYBRID RETRIEVAL TESTS")
+    print("=" * 80)
+
+    check = Checks()
+
+    # 1. Tokens keep exact telecom terms intact
+    check("tokenizer keeps APN host names whole", "internet.teleserve.co.in" in tokenize(CHUNKS[0]["text"]))
+
+    # 2. BM25 finds exact-term chunks
+    bm25 = BM25Index.build(CHUNKS)
+    check("BM25 ranks the VoLTE chunk first for 'volte'", bm25.retrieve("How do I enable VoLTE?", 2)[0].node.node_id == "volte")
+    check("BM25 ignores chunks without query terms", [n.node.node_id for n in bm25.retrieve("APN", 10)] == ["apn"])
+
+    # 3. RRF rewards agreement between the lists
+    fused = reciprocal_rank_fusion([[node("a"), node("b"), node("c")], [node("c"), node("d")]], k=60)
+    check("chunk found by both retrievers ranks first", fused[0].node.node_id == "c"
+          and abs(fused[0].score - (1 / 63 + 1 / 61)) < 1e-9)
+
+    # 4. Hybrid: dense misses the exact term, BM25 brings it into the top k
+    retriever = HybridRetriever(FixedRetriever(["signal", "bill", "volte"]), bm25, top_k=2, candidates=5)
+    ids = [n.node.node_id for n in retriever.retrieve("APN internet.teleserve.co.in")]
+    check(f"hybrid top-2 includes the exact-term chunk ({ids})", "apn" in ids and len(ids) == 2)
+    check("per-stage timings recorded", set(retriever.last_timings) == {"dense", "bm25", "fusion"})
+
+    # 5. Ingestion keeps the BM25 index in step with the collection
+    with tempfile.TemporaryDirectory() as tmp:
+        documents_path = os.path.join(tmp, "documents")
+        chroma_path = os.path.join(tmp, "chromadb")
+        os.makedirs(documents_path)
+        for chunk in CHUNKS:
+            with open(os.path.join(documents_path, f"{chunk['id']}.txt"), "w") as f:
+                f.write(chunk["text"])
+
+        ingest(documents_path=documents_path, chroma_path=chroma_path, collection_name="hybrid_docs",
+               embed_model=MockEmbedding(embed_dim=8))
+        os.remove(os.path.join(documents_path, "apn.txt"))
+        ingest(documents_path=documents_path, chroma_path=chroma_path, collection_name="hybrid_docs",
+               embed_model=MockEmbedding(embed_dim=8))
+
+        index = BM25Index.load(bm25_path_for(chroma_path, "hybrid_docs"))
+        collection = chromadb.PersistentClient(path=chroma_path).get_collection("hybrid_docs")
+        check("BM25 index rebuilt with the collection's chunk ids",
+              sorted(chunk["id"] for chunk in index.chunks) == sorted(collection.get()["ids"])
+              and not index.retrieve("APN"))
+
+    print(f"\n{'=' * 80}")
+    print(f"SUMMARY: {check.passed} passed, {check.failed} failed")
+    print("=" * 80)
+
+    return check.passed, check.failed
+
+
+if __name__ == "__main__":
+    passed, failed = test_hybrid_retrieval()
+    sys.exit(0 if failed == 0 else 1)
@@ -0,0 +1,67 @@
+import sys
+import os
+import re
+import subprocess
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.checks import Checks
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cold import budget for orchestration.graph (langgraph itself is most of it); override per machine
+IMPORT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "3000"))
+RUNS = 3
+
+# Agent frameworks that must load on first use of their node, not with the graph
+LAZY_PACKAGES = ["crewai", "autogen", "llama_index", "chromadb", "langchain_openai"]
+
+_LINE_RE = re.compile(r"import time:\s+\d+ \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def cold_import(module):
+    """Import module in a fresh interpreter; returns ({module: cumulative us}, returncode, stderr)."""
+    env = {k: v for k, v in os.environ.items() if k != "OPENAI_API_KEY"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, timeout=120
+    )
+    timings = {}
+    for line in result.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if match:
+            timings[match.group(3)] = int(match.group(1))
+    return timings, result.returncode, result.stderr
+
+
+def test_import_time():
+    """Check importing the graph stays under budget and leaves the agent frameworks unloaded."""
+    print("=" * 80)
+    print("IMPORT TIME REGRESSION TESTS")
+    print("=" * 80)
+
+    check = Checks()
+
+    runs = [cold_import("orchestration.graph") for _ in range(RUNS)]
+    timings, returncode, stderr = runs[0]
+    check("graph imports without an API key", returncode == 0)
+    if returncode != 0:
+        print(stderr.strip().splitlines()[-1])
+
+    loaded = sorted({name.split(".")[0] for name in timings if name.split(".")[0] in LAZY_PACKAGES})
+    check(f"agent frameworks not imported with the graph ({', '.join(loaded) or 'none'})", not loaded)
+
+    best_ms = min(run[0].get("orchestration.graph", float("inf")) for run in runs) / 1000
+    check(f"cold import {best_ms:.0f}ms within {IMPORT_BUDGET_MS:.0f}ms budget", best_ms <= IMPORT_BUDGET_MS)
+
+    print(f"\n{'=' * 80}")
+    print(f"SUMMARY: {check.passed} passed, {check.failed} failed")
+    print("=" * 80)
+
+    return check.passed, check.failed
+
+
+if __name__ == "__main__":
+    passed, failed = test_import_time()
+    sys.exit(0 if failed == 0 else 1)
@@ -0,0 +1,122 @@
+import sys
+import os
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chromadb
+from llama_index.core.embeddings import MockEmbedding
+from agents.knowledge_ingest import ingest, load_manifest
+from tests.checks import Checks
+
+DOCUMENTS = {
+    "Billing FAQs.txt": "Bills are issued on the 1st of every month. Late fees apply after 15 days.",
+    "Roaming.txt": "International roaming must be activated before travel. Daily passes are available.",
+    "Outages.txt": "Report outages through the app. Most outages are resolved within four hours.",
+}
+
+
+class CountingEmbedding(MockEmbedding):
+    """Offline embedding model that counts the texts it embeds."""
+
+    embedded: int = 0
+
+    def _get_text_embedding(self, text):
+        self.embedded += 1
+        return super()._get_text_embedding(text)
+
+
+class FailingEmbedding(MockEmbedding):
+    """Embedding model whose API is unreachable."""
+
+    def _get_text_embedding(self, text):
+        raise ConnectionError("embedding API unreachable")
+
+
+def write(documents_path, name, text):
+    with open(os.path.join(documents_path, name), "w") as f:
+        f.write(text)
+
+
+def vectors_for(collection, name):
+    return len(collection.get(where={"file_name": name})["ids"])
+
+
+def test_knowledge_ingest():
+    """Check incremental ingestion embeds only new/edited files and drops deleted ones."""
+    print("=" * 80)
+    print("KNOWLEDGE INGESTION TESTS")
+    print("=" * 80)
+
+    check = Checks()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        documents_path = os.path.join(tmp, "documents")
+        chroma_path = os.path.join(tmp, "chromadb")
+        manifest_path = os.path.join(chroma_path, "ingest_manifest.json")
+        os.makedirs(documents_path)
+        for name, text in DOCUMENTS.items():
+            write(documents_path, name, text)
+
+        embed_model = CountingEmbedding(embed_dim=8)
+
+        def run(**kwargs):
+            embed_model.embedded = 0
+            return ingest(documents_path=documents_path, chroma_path=chroma_path, collection_name="test_docs",
+                          manifest_path=manifest_path, embed_model=embed_model, **kwargs)
+
+        collection = lambda: chromadb.PersistentClient(path=chroma_path).get_collection("test_docs")
+
+        # 1. First run embeds everything
+        stats = run()
+        check(f"initial ingest embeds {stats['chunks_embedded']} chunks for 3 files",
+              len(stats["added"]) == 3 and stats["chunks_embedded"] == embed_model.embedded == collection().count())
+
+        # 2. Nothing changed: nothing embedded
+        stats = run()
+        check("unchanged documents are not re-embedded",
+              embed_model.embedded == 0 and len(stats["unchanged"]) == 3 and collection().count() == 3)
+
+        # 3. Edited file is replaced, not duplicated
+        edited = "Roaming is now included in Premium plans at no extra cost."
+        write(documents_path, "Roaming.txt", edited)
+        stats = run()
+        check("only the edited file is re-embedded",
+              stats["changed"] == ["Roaming.txt"] and embed_model.embedded == 1)
+        stored = collection().get(where={"file_name": "Roaming.txt"}, include=["documents"])["documents"]
+        check("old vectors for the edited file are removed", stored == [edited])
+
+        # 4. A failed embedding run keeps the previous vectors
+        write(documents_path, "Roaming.txt", "Roaming packs now start at 7 days.")
+        try:
+            ingest(documents_path=documents_path, chroma_path=chroma_path, collection_name="test_docs",
+                   manifest_path=manifest_path, embed_model=FailingEmbedding(embed_dim=8))
+        except ConnectionError:
+            pass
+        stored = collection().get(where={"file_name": "Roaming.txt"}, include=["documents"])["documents"]
+        check("failed re-embed leaves the old vectors in place", stored == [edited])
+
+        # 5. Deleted file loses its vectors
+        os.remove(os.path.join(documents_path, "Outages.txt"))
+        stats = run()
+        check("deleted file's vectors are removed",
+              stats["deleted"] == ["Outages.txt"] and vectors_for(collection(), "Outages.txt") == 0
+              and "Outages.txt" not in load_manifest(manifest_path))
+
+        # 6. A store without a manifest (built before this existed) is reconciled, not duplicated
+        os.remove(manifest_path)
+        stats = run()
+        check("store without a manifest is re-synced without duplicates",
+              collection().count() == 2 and vectors_for(collection(), "Billing FAQs.txt") == 1)
+
+    print(f"\n{'=' * 80}")
+    print(f"SUMMARY: {check.passed} passed, {check.failed} failed")
+    print("=" * 80)
+
+    return check.passed, check.failed
+
+
+if __name__ == "__main__":
+    passed, failed = test_knowledge_ingest()
+    sys.exit(0 if failed == 0 else 1)
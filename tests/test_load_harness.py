@@ -0,0 +1,100 @@
+import sys
+import os
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openai import OpenAI
+
+from tests.checks import Checks
+from tests.stub_llm_server import StubLLMServer
+from tests.load_graph import NodeTimer
+from utils.database import Database
+from utils.synthetic_data import generate, customer_email, PASSWORD
+from utils.user_management import UserManager
+
+
+def test_load_harness():
+    """Check the load-test pieces: stub LLM server, synthetic users/incidents and the node timer."""
+    print("=" * 80)
+    print("LOAD HARNESS TESTS")
+    print("=" * 80)
+
+    check = Checks()
+
+    # 1. Stub LLM server through the real OpenAI client
+    stub = StubLLMServer()
+    client = OpenAI(api_key="sk-test", base_url=stub.start())
+    try:
+        messages = [{"role": "user", "content": "Summarize my account"}]
+        first = client.chat.completions.create(model="gpt-4o", messages=messages)
+        second = client.chat.completions.create(model="gpt-4o", messages=messages)
+        check("chat completions are deterministic and report token usage",
+              first.choices[0].message.content == second.choices[0].message.content
+              and first.usage.total_tokens > 0)
+
+        label = client.chat.completions.create(model="gpt-4o", messages=[
+            {"role": "system", "content": "Classify the following query"},
+            {"role": "user", "content": "Why was I charged twice?"}]).choices[0].message.content
+        check("classification prompts get a label", label == "billing")
+
+        stream = client.chat.completions.create(model="gpt-4o", messages=messages, stream=True)
+        streamed = "".join(chunk.choices[0].delta.content or "" for chunk in stream if chunk.choices)
+        check("streamed answer matches the plain one", streamed == first.choices[0].message.content)
+
+        vectors = client.embeddings.create(model="text-embedding-3-small", input=["5G", "VoLTE", "5G"]).data
+        check("embeddings are unit vectors, equal for equal text",
+              len(vectors[0].embedding) == 1536 and vectors[0].embedding == vectors[2].embedding
+              and vectors[0].embedding != vectors[1].embedding
+              and abs(sum(v * v for v in vectors[1].embedding) - 1) < 1e-4)
+        check("requests are counted", stub.requests == {"chat": 4, "embeddings": 1})
+    finally:
+        stub.stop()
+
+    # 2. Synthetic users can log in; incidents cover open and resolved cases
+    with tempfile.TemporaryDirectory() as tmp:
+        database = Database(os.path.join(tmp, "load.db"))
+        counts = generate(database, 50, months=2, incidents=40, seed=5)
+        users = UserManager()
+        users.db = database
+        authenticated = users.authenticate_user(customer_email(7), PASSWORD)
+        linked = database.query_one("SELECT u.role FROM customers c JOIN users u ON u.id = c.user_id "
+                                    "WHERE c.email = ?", [customer_email(7)])
+        check("synthetic users log in and are linked to their customer",
+              counts["users"] == 50 and authenticated and linked == ("customer",))
+        statuses = dict(database.query("SELECT status, COUNT(*) FROM network_incidents GROUP BY status"))
+        unresolved = database.query_one("SELECT COUNT(*) FROM network_incidents "
+                                        "WHERE (status = 'resolved') != (resolved_date IS NOT NULL)")[0]
+        check("incidents generated with consistent resolution dates",
+              sum(statuses.values()) == 40 and "resolved" in statuses and len(statuses) > 1 and unresolved == 0)
+        database.pool.close_all()
+
+    # 3. Node timer records each LangGraph node once
+    from langgraph.graph import StateGraph, START, END
+    from typing import TypedDict
+
+    class State(TypedDict, total=False):
+        value: int
+
+    builder = StateGraph(State)
+    builder.add_node("first", lambda state: {"value": state["value"] + 1})
+    builder.add_node("second", lambda state: {"value": state["value"] * 2})
+    builder.add_edge(START, "first")
+    builder.add_edge("first", "second")
+    builder.add_edge("second", END)
+    timer = NodeTimer()
+    result = builder.compile().invoke({"value": 1}, config={"callbacks": [timer.handler]})
+    check("node timer records every node", result["value"] == 4
+          and [name for name, _ in timer.durations] == ["first", "second"])
+
+    print(f"\n{'=' * 80}")
+    print(f"SUMMARY: {check.passed} passed, {check.failed} failed")
+    print("=" * 80)
+
+    return check.passed, check.failed
+
+
+if __name__ == "__main__":
+    passed, failed = test_load_harness()
+    sys.exit(0 if failed == 0 else 1)
@@ -0,0 +1,160 @@
+import sys
+import os
+import threading
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import orchestration.graph as graph_module
+import services.customer_service as customer_service
+from orchestration.graph import create_graph
+from orchestration.response_cache import response_cache
+from orchestration.streaming import ResponseStream
+from tests.checks import Checks
+
+AGENT_LATENCY = 0.3
+MULTI_QUERY = "Why is my bill so high and should I change plans?"
+
+calls = []
+received = {}  # route -> the query text its agent was given
+calls_lock = threading.Lock()
+
+
+def record(route, query):
+    with calls_lock:
+        calls.append(route)
+        received[route] = query
+
+
+def fake_billing_query(query, customer_id, customer_context=None, on_token=None, usage_history=None):
+    record("billing", query)
+    time.sleep(AGENT_LATENCY)
+    answer = "Your bill is $85 because of 2GB of data overage."
+    if on_token:
+        on_token(answer)
+    return answer
+
+
+def fake_plan_query(query, customer_id="CUST001", customer_context=None, on_token=None, plan_catalog=None,
+                    usage_history=None):
+    record("plan", query)
+    time.sleep(AGENT_LATENCY)
+    if on_token:
+        on_token("Upgrade to ")
+        on_token("Premium.")
+    return "Upgrade to Premium."
+
+
+def fake_customer_context(email):
+    return {
+        "role": "customer",
+        "customer_id": "CUST001",
+        "customer_data": None,
+        "customer": {"customer_id": "CUST001", "name": "Test Customer", "account_status": "Active"},
+        "plan": {"name": "Basic"},
+        "latest_usage": {"data_used_gb": 7.0},
+    }
+
+
+def turn(query):
+    return {
+        "query": query,
+        "service_type": None,
+        "chat_history": [],
+        "classification": None,
+        "intermediate_responses": {},
+        "final_response": None,
+        "user_email": "customer@example.com",
+        "customer_info": {"email": "customer@example.com"},
+    }
+
+
+def test_multi_intent():
+    """Check multi-intent questions fan out to parallel agents and merge into one answer."""
+    print("=" * 80)
+    print("MULTI-INTENT FAN-OUT TESTS")
+    print("=" * 80)
+
+    check = Checks()
+
+    originals = (graph_module.process_billing_query, graph_module.process_plan_query,
+                 customer_service.load_customer_context, customer_service.get_service_plans,
+                 customer_service.get_usage_history)
+    graph_module.process_billing_query = fake_billing_query
+    graph_module.process_plan_query = fake_plan_query
+    customer_service.load_customer_context = fake_customer_context
+    customer_service.get_service_plans = lambda: []
+    customer_service.get_usage_history = lambda customer_id: []
+    response_cache.clear()
+
+    try:
+        graph = create_graph()
+
+        # 1. Both intents answered, in parallel
+        start = time.perf_counter()
+        result = graph.invoke(turn(MULTI_QUERY))
+        elapsed = time.perf_counter() - start
+        check("classified as billing + plan", result.get("classifications") == ["billing", "plan"])
+        check("merged answer has both sections",
+              "### 💳 Billing" in result["final_response"] and "### 📋 Plans" in result["final_response"]
+              and "overage" in result["final_response"] and "Premium" in result["final_response"])
+        check(f"branches ran in parallel ({elapsed:.2f}s for two {AGENT_LATENCY}s agents)",
+              elapsed < AGENT_LATENCY * 1.8)
+        check("each agent answers the clause it is cached under",
+              received == {"billing": "Why is my bill so high", "plan": "should I change plans"})
+
+        # 2. Repeating the question is served from the cache per route
+        calls.clear()
+        result = graph.invoke(turn(MULTI_QUERY))
+        check("repeat question answered from cache without agents",
+              result.get("cache_hit") and not calls and "Premium" in result["final_response"])
+
+        # 3. Only uncached routes run
+        response_cache.clear()
+        graph.invoke(turn("Why is my bill so high?"))
+        calls.clear()
+        result = graph.invoke(turn(MULTI_QUERY))
+        check("cached billing route reused, only the plan agent runs",
+              calls == ["plan"] and result.get("cached_routes") == ["billing"] and "overage" in result["final_response"])
+
+        # 4. Streaming: the live route streams, the other section follows at the merge
+        response_cache.clear()
+        stream = ResponseStream(graph, turn(MULTI_QUERY))
+        tokens = list(stream)
+        check("streamed text matches the merged answer", "".join(tokens) == stream.final_response)
+        check("first section is streamed token by token", tokens[:3] == ["### 💳 Billing\n\n",
+                                                                          "Your bill is $85 because of 2GB of data overage.",
+                                                                          "\n\n### 📋 Plans\n\nUpgrade to Premium."])
+
+        # 5. Single-intent questions are unchanged
+        response_cache.clear()
+        result = graph.invoke(turn("Recommend a better plan"))
+        check("single intent has no section headers",
+              result.get("classifications") == ["plan"] and result["final_response"] == "Upgrade to Premium.")
+
+        # 6. "X and Y" about one topic stays one branch
+        response_cache.clear()
+        calls.clear()
+        result = graph.invoke(turn("Why is my bill high and what is the late fee?"))
+        check("two billing questions go to the billing agent once",
+              result.get("classifications") == ["billing"] and calls == ["billing"]
+              and not result["final_response"].startswith("###"))
+        decision = graph_module.classifier.classify_intents("Do you have a data plus voice plan?")
+        check("'plus' inside one request does not split it", len(decision["labels"]) == 1)
+    finally:
+        (graph_module.process_billing_query, graph_module.process_plan_query,
+         customer_service.load_customer_context, customer_service.get_service_plans,
+         customer_service.get_usage_history) = originals
+        response_cache.clear()
+
+    print(f"\n{'=' * 80}")
+    print(f"SUMMARY: {check.passed} passed, {check.failed} failed")
+    print("=" * 80)
+
+    return check.passed, check.failed
+
+
+if __name__ == "__main__":
+    passed, failed = test_multi_intent()
+    sys.exit(0 if failed == 0 else 1)
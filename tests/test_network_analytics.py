@@ -0,0 +1,103 @@
+import sys
+import os
+import tempfile
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import agents.network_agents as network_agents
+import services.network_analytics as network_analytics
+from utils.database import Database
+from services.network_analytics import get_network_overview
+from tests.checks import Checks
+
+INCIDENTS = [
+    # incident_id, area, issue_type, severity, status, reported_date, resolved_date
+    ("INC001", "Downtown", "Outage", "critical", "resolved", "2024-01-01 00:00:00", "2024-01-01 04:00:00"),
+    ("INC002", "Downtown", "Slow Data", "high", "open", "2024-01-02 00:00:00", None),
+    ("INC003", "Airport", "Outage", "critical", "closed", "2024-01-03 00:00:00", "2024-01-03 02:00:00"),
+    ("INC004", "Airport", "Call Drops", "medium", "open", "2024-01-04 00:00:00", None),
+    ("INC005", "Suburbs", "Call Drops", "low", "investigating", "2024-01-05 00:00:00", None),
+    ("INC006", "Downtown", "Outage", "high", "resolved", "2024-01-06 00:00:00", "2024-01-06 12:00:00"),
+]
+
+CUSTOMERS = [("CUST001", "Active"), ("CUST002", "Active"), ("CUST003", "Suspended")]
+
+
+class NoAgentPool:
+    """Fails the test if the admin path tries to start an AutoGen conversation."""
+
+    def checkout(self, timeout=None):
+        raise AssertionError("admin overview must not check out network agents")
+
+
+def seed(database):
+    database.create_tables()
+    for row in INCIDENTS:
+        database.execute(
+            "INSERT INTO network_incidents (incident_id, area, issue_type, severity, status, reported_date, resolved_date) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)", row
+        )
+    for customer_id, status in CUSTOMERS:
+        database.execute(
+            "INSERT INTO customers (customer_id, name, email, account_status) VALUES (?, ?, ?, ?)",
+            (customer_id, customer_id, f"{customer_id.lower()}@example.com", status)
+        )
+
+
+def test_network_analytics():
+    """Check incident aggregates/MTTR and that admin network queries skip the LLM."""
+    print("=" * 80)
+    print("ADMIN NETWORK ANALYTICS TESTS")
+    print("=" * 80)
+
+    check = Checks()
+
+    original_db, original_pool = network_analytics.db, network_agents.agent_pool
+    with tempfile.TemporaryDirectory() as tmp:
+        database = Database(os.path.join(tmp, "network.db"))
+        seed(database)
+
+        overview = get_network_overview(database)
+        check("totals: 6 incidents, 3 open, 3 closed",
+              (overview["total_incidents"], overview["open_incidents"], overview["closed_incidents"]) == (6, 3, 3))
+        check("overall MTTR is the mean of 4h, 2h and 12h", overview["mttr_hours"] == 6.0)
+        check("Downtown: 1 open, 2 closed, MTTR 8h",
+              overview["by_area"]["Downtown"] == {"total": 3, "open": 1, "closed": 2, "mttr_hours": 8.0})
+        check("severities ordered critical -> low",
+              list(overview["by_severity"]) == ["critical", "high", "medium", "low"])
+        check("issue types without repairs have no MTTR", overview["by_issue_type"]["Call Drops"]["mttr_hours"] is None)
+        check("account status counts", overview["account_status"] == {"Active": 2, "Suspended": 1})
+
+        network_analytics.db = database
+        network_agents.agent_pool = NoAgentPool()
+        try:
+            start = time.perf_counter()
+            response = network_agents.handle_admin_network_query(
+                "How is the network in Airport?", "admin@telecom.com", narrative=False
+            )
+            elapsed_ms = (time.perf_counter() - start) * 1000
+        except AssertionError as e:
+            response, elapsed_ms = str(e), 0.0
+        finally:
+            network_analytics.db = original_db
+            network_agents.agent_pool = original_pool
+
+        check(f"admin query answered without agents in {elapsed_ms:.1f}ms",
+              "Total incidents: 6" in response and "Airport: 1 open / 1 closed" in response)
+        check("area named in the query is shown on its own",
+              "Requested areas" in response and "Downtown:" not in response.split("**Requested areas**")[1].split("**")[0])
+
+        database.pool.close_all()
+
+    print(f"\n{'=' * 80}")
+    print(f"SUMMARY: {check.passed} passed, {check.failed} failed")
+    print("=" * 80)
+
+    return check.passed, check.failed
+
+
+if __name__ == "__main__":
+    passed, failed = test_network_analytics()
+    sys.exit(0 if failed == 0 else 1)
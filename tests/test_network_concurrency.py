@@ -0,0 +1,115 @@
+import sys
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import agents.network_agents as network_agents
+from agents.network_agents import NetworkAgentPool, NetworkAgentSet, process_network_query
+
+CONCURRENT_QUERIES = 16
+POOL_SIZE = 4
+
+
+class StubModelClient:
+    """Deterministic AutoGen model client: answers with the ticket id found in the prompt."""
+
+    def __init__(self, config, **kwargs):
+        self.delay = config.get("delay", 0.05)
+
+    def create(self, params):
+        time.sleep(self.delay)  # Hold the agent set long enough for requests to overlap
+        prompt = " ".join(str(m.get("content") or "") for m in params["messages"])
+        ticket = re.search(r"TICKET-\d+", prompt).group(0)
+        message = SimpleNamespace(content=f"Resolved {ticket} TERMINATE", function_call=None, tool_calls=None)
+        return SimpleNamespace(model="stub", choices=[SimpleNamespace(message=message)], cost=0.0)
+
+    def message_retrieval(self, response):
+        return [choice.message.content for choice in response.choices]
+
+    def cost(self, response):
+        return 0.0
+
+    @staticmethod
+    def get_usage(response):
+        return {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0, "cost": 0.0, "model": "stub"}
+
+
+def stub_agent_factory():
+    agents = NetworkAgentSet(
+        config_list=[{"model": "stub", "model_client_cls": "StubModelClient"}],
+        speaker_selection_method="round_robin",
+        llm_options={"cache_seed": None}
+    )
+    for agent in (agents.diagnostics, agents.integrator, agents.streaming_integrator, agents.manager):
+        agent.register_model_client(model_client_cls=StubModelClient)
+    return agents
+
+
+def customer_context(i):
+    return {
+        "role": "customer",
+        "customer_id": f"CUST{i:03d}",
+        "customer": {"customer_id": f"CUST{i:03d}", "name": f"Customer {i}",
+                     "account_status": "Active", "service_plan_id": 1},
+        "plan": {"name": "Basic"},
+    }
+
+
+def test_network_concurrency():
+    """Fire simultaneous process_network_query calls and check transcripts never mix."""
+    print("=" * 80)
+    print("NETWORK AGENT CONCURRENCY TESTS")
+    print("=" * 80)
+
+    passed = 0
+    failed = 0
+    original_pool = network_agents.agent_pool
+
+    for mode in ("fast", "groupchat"):
+        pool = NetworkAgentPool(size=POOL_SIZE, factory=stub_agent_factory)
+        network_agents.agent_pool = pool
+        start_barrier = threading.Barrier(CONCURRENT_QUERIES)
+
+        def ask(i):
+            start_barrier.wait()
+            query = f"TICKET-{i}: my data keeps dropping"
+            return i, process_network_query(query, f"c{i}@example.com", customer_context(i), mode=mode)
+
+        try:
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=CONCURRENT_QUERIES) as executor:
+                results = list(executor.map(ask, range(CONCURRENT_QUERIES)))
+            elapsed = time.perf_counter() - started
+        finally:
+            network_agents.agent_pool = original_pool
+
+        mixed = [(i, response) for i, response in results if f"TICKET-{i}" not in response
+                 or re.findall(r"TICKET-\d+", response) != [f"TICKET-{i}"]]
+
+        if mixed:
+            print(f"❌ {mode}: {len(mixed)} responses contained another request's transcript: {mixed[:3]}")
+            failed += 1
+        elif pool.peak_in_use < 2:
+            print(f"❌ {mode}: requests did not overlap (peak {pool.peak_in_use} agent sets in use)")
+            failed += 1
+        else:
+            print(f"✅ {mode}: {CONCURRENT_QUERIES} queries in {elapsed:.2f}s, "
+                  f"peak {pool.peak_in_use}/{POOL_SIZE} agent sets, {pool.created} created")
+            passed += 1
+
+    print(f"\n{'=' * 80}")
+    print(f"SUMMARY: {passed} passed, {failed} failed")
+    print("=" * 80)
+
+    return passed, failed
+
+
+if __name__ == "__main__":
+    passed, failed = test_network_concurrency()
+    sys.exit(0 if failed == 0 else 1)
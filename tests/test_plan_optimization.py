@@ -0,0 +1,96 @@
+import sys
+import os
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import services.customer_service as customer_service
+import services.plan_optimization as plan_optimization
+from agents.plan_recommender import recommend_for_customers
+from services.plan_optimization import run_optimization, format_summary, PLANS_QUERY
+from utils.database import Database
+from utils.synthetic_data import generate
+from tests.checks import Checks
+
+CUSTOMERS = 3000
+
+
+def test_plan_optimization():
+    """Check the bulk plan optimization job: chunked parallel scoring into the materialized table."""
+    print("=" * 80)
+    print("PLAN OPTIMIZATION JOB TESTS")
+    print("=" * 80)
+
+    check = Checks()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database = Database(os.path.join(tmp, "bulk.db"))
+        counts = generate(database, CUSTOMERS, months=4, seed=3)
+        check("synthetic data generated", counts == {"plans": 7, "users": CUSTOMERS, "customers": CUSTOMERS,
+                                                 "usage_rows": CUSTOMERS * 4, "incidents": 0})
+
+        # 1. In-process run, with progress per chunk
+        progress = []
+        summary = run_optimization(database, workers=1, chunk_size=700, months=3,
+                                   on_progress=lambda done, total, elapsed: progress.append(done))
+        check(f"every customer scored ({summary['customers_per_second']:,.0f} customers/s)",
+              summary["customers"] == CUSTOMERS and database.query_one(
+                  "SELECT COUNT(*) FROM plan_recommendations WHERE run_id = ?", [summary["run_id"]])[0] == CUSTOMERS)
+        check("progress reported per chunk", progress == [700, 1400, 2100, 2800, 3000])
+        check("in-process run closes its read-only connection", not plan_optimization._worker)
+
+        # 2. Same answers as scoring the whole base in memory
+        original_db = customer_service.db
+        customer_service.db = database
+        try:
+            expected = recommend_for_customers(customer_service.get_usage_profiles.uncached(3), database.query(PLANS_QUERY))
+            run, switchers = customer_service.get_plan_optimization(limit=CUSTOMERS)
+            materialized = {row[0]: (row[4], round(row[6], 6)) for row in switchers}
+            check("materialized results match in-memory scoring",
+                  materialized == {s["customer_id"]: (s["recommended_plan"], round(s["savings"], 6)) for s in expected}
+                  and run["switchers"] == len(expected) > 0)
+
+            # 3. Process pool run replaces the previous results
+            summary = run_optimization(database, workers=2, chunk_size=500, months=3, on_progress=None)
+            run, _ = customer_service.get_plan_optimization()
+            check("process pool run gives the same results and replaces the previous run",
+                  run["run_id"] == summary["run_id"] and run["switchers"] == len(expected)
+                  and database.query("SELECT DISTINCT run_id FROM plan_recommendations") == [(summary["run_id"],)])
+
+            # 4. A failed run leaves the last completed results in place
+            try:
+                run_optimization(database, workers=1, chunk_size=500,
+                                 on_progress=lambda done, total, elapsed: 1 / 0 if done > 1000 else None)
+            except ZeroDivisionError:
+                pass
+            run, _ = customer_service.get_plan_optimization()
+            status = database.query_one("SELECT status FROM plan_optimization_runs ORDER BY run_id DESC LIMIT 1")[0]
+            check("failed run is recorded and the last results stay visible",
+                  status == "failed" and run["run_id"] == summary["run_id"] and not plan_optimization._worker
+                  and database.query("SELECT DISTINCT run_id FROM plan_recommendations") == [(summary["run_id"],)])
+
+            # 5. Customers without usage are reported as skipped, and progress still reaches the total
+            for i in range(2):
+                database.execute("INSERT INTO customers (customer_id, name, email, service_plan_id, account_status) "
+                                 "VALUES (?, ?, ?, 1, 'Active')", [f"ZNEW{i}", f"New {i}", f"new{i}@example.com"])
+            progress = []
+            summary = run_optimization(database, workers=1, chunk_size=700, months=3,
+                                       on_progress=lambda done, total, elapsed: progress.append((done, total)))
+            check("customers without usage are counted as skipped",
+                  summary["customers"] == CUSTOMERS and summary["skipped"] == 2
+                  and progress[-1] == (CUSTOMERS, CUSTOMERS) and "2 without usage skipped" in format_summary(summary))
+        finally:
+            customer_service.db = original_db
+            database.pool.close_all()
+
+    print(f"\n{'=' * 80}")
+    print(f"SUMMARY: {check.passed} passed, {check.failed} failed")
+    print("=" * 80)
+
+    return check.passed, check.failed
+
+
+if __name__ == "__main__":
+    passed, failed = test_plan_optimization()
+    sys.exit(0 if failed == 0 else 1)
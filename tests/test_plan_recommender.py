@@ -0,0 +1,128 @@
+import sys
+import os
+import sqlite3
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+import services.customer_service as customer_service
+from agents.plan_recommender import (PlanMatrix, project_usage, project_costs, rank_plans, recommend_batch,
+                                     recommend_for_customers, overage_rates)
+from agents.service_agents import build_plan_prompt
+from utils.database import Database
+from tests.checks import Checks
+
+# get_service_plans layout: id, name, cost, data GB, voice, sms, unlimited data/voice/sms
+PLANS = [
+    (1, "Basic", 20.0, 5.0, 300, 100, 0, 0, 0),
+    (2, "Standard", 35.0, 15.0, 1000, 500, 0, 0, 1),
+    (3, "Unlimited", 60.0, None, None, None, 1, 1, 1),
+]
+# get_usage_history layout, latest first: start, end, data, voice, sms, extras, total
+HISTORY = [
+    ("2024-03-01", "2024-03-31", 12.0, 900, 50, 0.0, 0.0),
+    ("2024-02-01", "2024-02-29", 10.0, 700, 50, 0.0, 0.0),
+    ("2024-01-01", "2024-01-31", 8.0, 500, 50, 0.0, 0.0),
+    ("2023-12-01", "2023-12-31", 100.0, 5000, 5000, 0.0, 0.0),
+]
+
+
+def naive_costs(usage, plans):
+    rates = overage_rates()
+    costs = np.zeros((len(usage), len(plans)))
+    for c, row in enumerate(usage):
+        for p, plan in enumerate(plans):
+            caps = [np.inf if plan[6 + d] else (plan[3 + d] or 0.0) for d in range(3)]
+            costs[c, p] = plan[2] + sum(max(row[d] - caps[d], 0.0) * rates[d] for d in range(3))
+    return costs
+
+
+def test_plan_recommender():
+    """Check projected plan costs, ranking, batch scoring and the ranked advisor prompt."""
+    print("=" * 80)
+    print("PLAN RECOMMENDER TESTS")
+    print("=" * 80)
+
+    check = Checks()
+
+    # 1. Unlimited allowances are infinite caps
+    matrix = PlanMatrix(PLANS)
+    check("unlimited flags become infinite caps", np.isinf(matrix.caps[2]).all() and np.isinf(matrix.caps[1, 2])
+          and matrix.caps[0, 0] == 5.0)
+    check("huge usage costs nothing extra on unlimited", project_costs([[1e6, 1e6, 1e6]], matrix)[0, 2] == 60.0)
+
+    # 2. Projection uses the latest months only
+    usage = project_usage(HISTORY, months=3)
+    check("usage projected from the latest 3 months", usage.tolist() == [10.0, 700.0, 50.0])
+
+    # 3. Ranking with per-plan breakdown and savings against the current plan
+    recommendation = rank_plans(HISTORY, PLANS, current_plan_id=1, months=3)
+    top, basic = recommendation["ranking"][0], recommendation["current"]
+    check("cheapest plan ranked first", [entry["name"] for entry in recommendation["ranking"]] == ["Standard", "Unlimited", "Basic"])
+    check("overage breakdown per dimension", basic["overage"]["data"] == 50.0 and basic["overage"]["voice"] == 20.0
+          and basic["total"] == 90.0)
+    check("savings against the current plan", top["savings"] == 55.0 and basic["savings"] == 0.0)
+    check("no history, no ranking", rank_plans([], PLANS) is None)
+
+    # 4. Batch scoring matches the per-customer arithmetic, across batch boundaries
+    rng = np.random.default_rng(7)
+    usage = rng.uniform(0, [40, 2000, 800], size=(500, 3))
+    current = rng.choice([1, 2, 3, 99], size=500).tolist()
+    result = recommend_batch(usage, PLANS, current, batch_size=64)
+    expected = naive_costs(usage, PLANS)
+    check("batched costs match the naive loop", np.array_equal(result["best"], expected.argmin(axis=1))
+          and np.allclose(result["best_cost"], expected.min(axis=1)))
+    known = np.array(current) != 99
+    check("current cost known only for catalogue plans", np.isnan(result["current_cost"][~known]).all()
+          and np.allclose(result["savings"][known], expected[known, np.array(current)[known] - 1] - expected.min(axis=1)[known]))
+
+    # 5. Admin view from the database
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "plans.db")
+        database = Database(db_path)
+        database.create_tables()
+        conn = sqlite3.connect(db_path)
+        conn.executemany("INSERT INTO service_plans (plan_id, name, plan_type, monthly_cost, data_limit_gb, voice_minutes, "
+                         "sms_count, unlimited_data, unlimited_voice, unlimited_sms) VALUES (?, ?, 'postpaid', ?, ?, ?, ?, ?, ?, ?)",
+                         [(p[0], p[1], *p[2:]) for p in PLANS])
+        conn.executemany("INSERT INTO customers (customer_id, name, email, service_plan_id) VALUES (?, ?, ?, ?)",
+                         [("CUST001", "Heavy", "h@example.com", 1), ("CUST002", "Light", "l@example.com", 1)])
+        conn.executemany("INSERT INTO customer_usage (customer_id, billing_period_start, billing_period_end, "
+                         "data_used_gb, voice_minutes_used, sms_count_used) VALUES (?, ?, ?, ?, ?, ?)",
+                         [("CUST001", *row[:5]) for row in HISTORY] + [("CUST002", "2024-03-01", "2024-03-31", 1.0, 50, 5)])
+        conn.commit()
+        conn.close()
+
+        original_db = customer_service.db
+        customer_service.db = database
+        try:
+            profiles = customer_service.get_usage_profiles.uncached(3)
+        finally:
+            customer_service.db = original_db
+            database.pool.close_all()
+    check("usage profiles average the latest periods", profiles[0] == ("CUST001", "Heavy", 1, 10.0, 700.0, 50.0))
+    switches = recommend_for_customers(profiles, PLANS)
+    check("admin view lists only customers who would save", [(s["customer_id"], s["recommended_plan"], s["savings"])
+                                                             for s in switches] == [("CUST001", "Standard", 55.0)])
+
+    # 6. The advisor prompt carries the ranking; the model only phrases it
+    context = {"customer_id": "CUST001", "customer": {"service_plan_id": 1}, "plan": {"name": "Basic"},
+               "latest_usage": {"data_used_gb": 12.0, "voice_minutes_used": 900, "sms_count_used": 50}}
+    prompt = build_plan_prompt("Am I on the right plan?", "CUST001", context, PLANS, HISTORY)
+    check("prompt carries the ranked plans and the top pick",
+          "Recommend switching to Standard." in prompt and "1. Standard: $35.00 (no overage), saves $55.00/month" in prompt
+          and "Basic: $90.00 = $20.00 base + overage (data $50.00, voice $20.00) (current plan)" in prompt)
+
+    print(f"\n{'=' * 80}")
+    print(f"SUMMARY: {check.passed} passed, {check.failed} failed")
+    print("=" * 80)
+
+    return check.passed, check.failed
+
+
+if __name__ == "__main__":
+    passed, failed = test_plan_recommender()
+    sys.exit(0 if failed == 0 else 1)
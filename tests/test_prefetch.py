@@ -0,0 +1,110 @@
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import orchestration.graph as graph_module
+import services.customer_service as customer_service
+from orchestration.graph import create_graph
+from orchestration.response_cache import response_cache
+from tests.checks import Checks
+
+STEP_LATENCY = 0.3  # Simulated DB lookup and LLM classification, each
+PLAN_CATALOG = [("PLAN001", "Basic", 29.99, 5, 500, 100, "Starter plan")]
+USAGE_HISTORY = [("2024-02-01", "2024-02-29", 3.0, 200, 40, 0.0, 29.99)]
+
+received = {}
+
+
+class SlowClassifier:
+    """Stands in for the LLM tier: takes as long as the customer lookup."""
+
+    def classify_intents(self, query, llm=None):
+        time.sleep(STEP_LATENCY)
+        return {"label": "plan", "labels": ["plan"], "clauses": {}, "tier": "llm", "confidence": 1.0}
+
+
+def slow_customer_context(email):
+    time.sleep(STEP_LATENCY)
+    return {
+        "role": "customer",
+        "customer_id": "CUST001",
+        "customer_data": None,
+        "customer": {"customer_id": "CUST001", "name": "Test Customer", "account_status": "Active"},
+        "plan": {"name": "Basic"},
+        "latest_usage": {"data_used_gb": 3.0},
+    }
+
+
+def fake_plan_query(query, customer_id="CUST001", customer_context=None, on_token=None, plan_catalog=None,
+                    usage_history=None):
+    received["plan_catalog"] = plan_catalog
+    received["usage_history"] = usage_history
+    received["customer_context"] = customer_context
+    return "Stay on Basic."
+
+
+def turn(query):
+    return {
+        "query": query,
+        "service_type": None,
+        "chat_history": [],
+        "classification": None,
+        "intermediate_responses": {},
+        "final_response": None,
+        "user_email": "customer@example.com",
+        "customer_info": {"email": "customer@example.com"},
+    }
+
+
+def test_prefetch():
+    """Check customer data is fetched while the query is classified and handed to the agent."""
+    print("=" * 80)
+    print("SPECULATIVE PREFETCH TESTS")
+    print("=" * 80)
+
+    check = Checks()
+
+    originals = (graph_module.classifier, graph_module.process_plan_query,
+                 customer_service.load_customer_context, customer_service.get_service_plans,
+                 customer_service.get_usage_history)
+    graph_module.classifier = SlowClassifier()
+    graph_module.process_plan_query = fake_plan_query
+    customer_service.load_customer_context = slow_customer_context
+    customer_service.get_service_plans = lambda: PLAN_CATALOG
+    customer_service.get_usage_history = lambda customer_id: USAGE_HISTORY
+    response_cache.clear()
+
+    try:
+        graph = create_graph()
+
+        start = time.perf_counter()
+        result = graph.invoke(turn("Is my plan still a good fit?"))
+        elapsed = time.perf_counter() - start
+
+        check(f"lookup and classification overlap ({elapsed:.2f}s for two {STEP_LATENCY}s steps)",
+              elapsed < STEP_LATENCY * 1.6)
+        check("answer uses the joined state",
+              result["final_response"] == "Stay on Basic." and result.get("customer_id") == "CUST001")
+        check("plan agent receives the prefetched catalogue and history",
+              received.get("plan_catalog") == PLAN_CATALOG and received.get("usage_history") == USAGE_HISTORY)
+        check("plan agent receives the prefetched usage",
+              (received.get("customer_context") or {}).get("latest_usage") == {"data_used_gb": 3.0})
+    finally:
+        (graph_module.classifier, graph_module.process_plan_query,
+         customer_service.load_customer_context, customer_service.get_service_plans,
+         customer_service.get_usage_history) = originals
+        response_cache.clear()
+
+    print(f"\n{'=' * 80}")
+    print(f"SUMMARY: {check.passed} passed, {check.failed} failed")
+    print("=" * 80)
+
+    return check.passed, check.failed
+
+
+if __name__ == "__main__":
+    passed, failed = test_prefetch()
+    sys.exit(0 if failed == 0 else 1)
@@ -0,0 +1,88 @@
+import sys
+import os
+import ast
+import glob
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.database import Database
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCES = [os.path.join(ROOT, "services", "customer_service.py")] + sorted(
+    glob.glob(os.path.join(ROOT, "agents", "*.py"))
+)
+
+
+def collect_queries(paths=SOURCES):
+    """Collect every SELECT statement literal from the given source files."""
+    queries = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            tree = ast.parse(f.read(), filename=path)
+        # Fragments of f-strings (dynamic IN lists) are not complete statements
+        fragments = {id(part) for node in ast.walk(tree) if isinstance(node, ast.JoinedStr) for part in node.values}
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Constant) and isinstance(node.value, str) and id(node) not in fragments:
+                sql = node.value.strip()
+                if sql.upper().startswith("SELECT") and " FROM " in sql.upper().replace("\n", " "):
+                    queries.append((os.path.relpath(path, ROOT), node.lineno, sql))
+    return sorted(queries)
+
+
+def plan_problems(conn, sql):
+    """Return the EXPLAIN QUERY PLAN lines that indicate a scan or a temp sort."""
+    params = [None] * sql.count("?")
+    plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    details = [row[-1] for row in plan]
+    problems = []
+    for detail in details:
+        if detail.startswith("SCAN") and "USING" not in detail and "CONSTANT ROW" not in detail:
+            problems.append(detail)
+        elif "USE TEMP B-TREE" in detail:
+            problems.append(detail)
+    return details, problems
+
+
+def test_query_plans():
+    """Assert every filtered query in services/ and agents/ is served by an index."""
+    print("=" * 80)
+    print("QUERY PLAN INDEX TESTS")
+    print("=" * 80)
+
+    passed = 0
+    failed = 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database = Database(os.path.join(tmp, "plans.db"))
+        database.create_tables()
+
+        with database.connection() as conn:
+            for path, line, sql in collect_queries():
+                label = f"{path}:{line}"
+                if "WHERE" not in sql.upper():
+                    # Whole-table reads (listings, global aggregates) scan by design
+                    print(f"➖ {label} -> full-table read, skipped")
+                    continue
+
+                details, problems = plan_problems(conn, sql)
+                if problems:
+                    print(f"❌ {label} -> {'; '.join(problems)}")
+                    failed += 1
+                else:
+                    print(f"✅ {label} -> {'; '.join(details)}")
+                    passed += 1
+
+        database.pool.close_all()
+
+    print(f"\n{'=' * 80}")
+    print(f"SUMMARY: {passed} indexed, {failed} not indexed")
+    print("=" * 80)
+
+    return passed, failed
+
+
+if __name__ == "__main__":
+    passed, failed = test_query_plans()
+    sys.exit(0 if failed == 0 else 1)
@@ -0,0 +1,93 @@
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from orchestration.runtime import Runtime, READY, DEGRADED, FAILED
+from tests.checks import Checks
+
+STAGE_LATENCY = 0.2
+
+
+def slow(seconds, error=None):
+    def warm():
+        time.sleep(seconds)
+        if error:
+            raise RuntimeError(error)
+    return warm
+
+
+class FakeRuntime(Runtime):
+    """Runtime with stand-in stages, so warm-up order and timings can be checked without the real stack."""
+
+    def __init__(self, knowledge_error=None, graph_error=None):
+        super().__init__()
+        self.knowledge_error = knowledge_error
+        self.graph_error = graph_error
+
+    def _build_graph(self):
+        time.sleep(STAGE_LATENCY)
+        if self.graph_error:
+            raise RuntimeError(self.graph_error)
+        self.graph = "compiled graph"
+
+    def plan(self):
+        return [
+            ("database", slow(0.01), False),
+            ("graph", self._build_graph, True),
+            ("knowledge", slow(STAGE_LATENCY, self.knowledge_error), False),
+        ]
+
+
+def test_runtime():
+    """Check background warm-up, readiness gating and the per-subsystem startup breakdown."""
+    print("=" * 80)
+    print("SHARED RUNTIME TESTS")
+    print("=" * 80)
+
+    check = Checks()
+
+    # 1. Warm-up runs in the background
+    start = time.perf_counter()
+    runtime = FakeRuntime().start()
+    started_in = time.perf_counter() - start
+    check(f"start() returns immediately ({started_in * 1000:.1f}ms)", started_in < 0.05 and not runtime.ready)
+    check("every stage is listed before it runs", list(runtime.snapshot()["stages"]) == ["database", "graph", "knowledge"])
+
+    # 2. Ready as soon as the graph is built, before slower stages finish
+    graph = runtime.wait_for_graph(timeout=5)
+    check("graph available before knowledge finishes warming",
+          graph == "compiled graph" and runtime.ready and runtime.snapshot()["stages"]["knowledge"]["ms"] is None)
+
+    # 3. Breakdown once everything has run
+    runtime.wait(timeout=5)
+    snapshot = runtime.snapshot()
+    check("per-stage timings recorded",
+          snapshot["status"] == READY and all(stage["ms"] is not None for stage in snapshot["stages"].values())
+          and snapshot["stages"]["knowledge"]["ms"] >= STAGE_LATENCY * 1000 * 0.9)
+
+    # 4. Optional stage failure degrades, it doesn't block chat
+    runtime = FakeRuntime(knowledge_error="chroma unavailable").start()
+    runtime.wait(timeout=5)
+    snapshot = runtime.snapshot()
+    check("failed optional stage leaves the runtime usable but degraded",
+          runtime.ready and snapshot["status"] == DEGRADED
+          and snapshot["stages"]["knowledge"]["error"] == "chroma unavailable")
+
+    # 5. Graph failure is reported and releases waiters
+    runtime = FakeRuntime(graph_error="missing OPENAI_API_KEY").start()
+    check("graph failure releases waiters with no graph",
+          runtime.wait_for_graph(timeout=5) is None and runtime.status == FAILED and not runtime.ready)
+
+    print(f"\n{'=' * 80}")
+    print(f"SUMMARY: {check.passed} passed, {check.failed} failed")
+    print("=" * 80)
+
+    return check.passed, check.failed
+
+
+if __name__ == "__main__":
+    passed, failed = test_runtime()
+    sys.exit(0 if failed == 0 else 1)
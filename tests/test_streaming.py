@@ -0,0 +1,128 @@
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import orchestration.graph as graph_module
+import services.customer_service as customer_service
+from orchestration.graph import create_graph
+from orchestration.response_cache import response_cache
+from orchestration.streaming import ResponseStream
+from agents.network_agents import NetworkAgentSet, TokenIOStream
+from utils.metrics import metrics
+from tests.checks import Checks
+
+ANSWER_TOKENS = ["You are ", "on the ", "Basic plan; ", "upgrading to ", "Premium ", "fits your usage."]
+TOKEN_DELAY = 0.05
+
+
+def fake_plan_query(query, customer_id="CUST001", customer_context=None, on_token=None, plan_catalog=None,
+                    usage_history=None):
+    """Stands in for the LLM: emits the answer a few words at a time."""
+    for token in ANSWER_TOKENS:
+        time.sleep(TOKEN_DELAY)
+        if on_token:
+            on_token(token)
+    return "".join(ANSWER_TOKENS)
+
+
+def fake_customer_context(email):
+    return {
+        "role": "customer",
+        "customer_id": "CUST001",
+        "customer_data": None,
+        "customer": {"customer_id": "CUST001", "name": "Test Customer", "account_status": "Active"},
+        "plan": {"name": "Basic"},
+        "latest_usage": {"data_used_gb": 4.2},
+    }
+
+
+def turn(query, service_type="plan", email="customer@example.com"):
+    return {
+        "query": query,
+        "service_type": service_type,
+        "chat_history": [],
+        "classification": None,
+        "intermediate_responses": {},
+        "final_response": None,
+        "user_email": email,
+        "customer_info": {"email": email},
+    }
+
+
+def test_streaming():
+    """Check tokens reach the caller before the agent finishes and match the final answer."""
+    print("=" * 80)
+    print("STREAMING TESTS")
+    print("=" * 80)
+
+    check = Checks()
+
+    original_plan, original_context = graph_module.process_plan_query, customer_service.load_customer_context
+    original_plans, original_history = customer_service.get_service_plans, customer_service.get_usage_history
+    graph_module.process_plan_query = fake_plan_query
+    customer_service.load_customer_context = fake_customer_context
+    customer_service.get_service_plans = lambda: []
+    customer_service.get_usage_history = lambda customer_id: []
+    response_cache.clear()
+    metrics.reset()
+
+    try:
+        graph = create_graph()
+
+        # 1. Agent tokens are yielded as they are produced
+        stream = ResponseStream(graph, turn("Which plan suits my usage?"))
+        tokens = list(stream)
+        check(f"streamed {len(tokens)} tokens, first after {stream.ttft_ms:.0f}ms of {stream.total_ms:.0f}ms",
+              tokens == ANSWER_TOKENS and stream.ttft_ms < stream.total_ms / 2)
+        check("final_response matches the streamed text", stream.final_response == "".join(tokens))
+        check("time-to-first-token recorded per route",
+              metrics.summary("stream.ttft_ms.plan")["count"] == 1 and metrics.summary("stream.ttft_ms")["count"] == 1)
+
+        # 2. Cache hits stream the cached answer in one chunk
+        stream = ResponseStream(graph, turn("Which plan suits my usage?"))
+        tokens = list(stream)
+        check("cache hit streams the cached answer", tokens == ["".join(ANSWER_TOKENS)] and stream.final_state.get("cache_hit"))
+
+        # 3. Turns that emit no tokens fall back to the final response
+        customer_service.load_customer_context = lambda email: {"role": None, "customer_id": None, "customer_data": None}
+        stream = ResponseStream(graph, turn("Recommend a better plan", email="nobody@example.com"))
+        tokens = list(stream)
+        check("non-streaming answers are yielded whole", tokens == [stream.final_response] and tokens[0].startswith("Unable"))
+
+        # 4. Blocking invoke still works and emits nothing
+        result = graph.invoke(turn("Is there a cheaper plan for me?"))
+        check("graph.invoke unaffected", result["final_response"].startswith("Unable"))
+    finally:
+        graph_module.process_plan_query = original_plan
+        customer_service.load_customer_context = original_context
+        customer_service.get_service_plans = original_plans
+        customer_service.get_usage_history = original_history
+        response_cache.clear()
+
+    # 5. AutoGen stream capture drops colour codes and the TERMINATE marker
+    received = []
+    io = TokenIOStream(received.append)
+    io.print("\033[32m", end="")
+    for chunk in ["Restart your ", "phone. TERM", "INATE"]:
+        io.print(chunk, end="")
+    io.print("\033[0m\n")
+    check("network stream filters TERMINATE", "".join(received) == "Restart your phone. ")
+
+    # 6. Only the token-callback path asks the provider for streamed completions
+    agents = NetworkAgentSet(config_list=[{"model": "stub", "api_key": "stub"}])
+    check("group chat integrator does not stream, the callback twin does",
+          "stream" not in agents.integrator.llm_config and agents.streaming_integrator.llm_config.get("stream") is True)
+
+    print(f"\n{'=' * 80}")
+    print(f"SUMMARY: {check.passed} passed, {check.failed} failed")
+    print("=" * 80)
+
+    return check.passed, check.failed
+
+
+if __name__ == "__main__":
+    passed, failed = test_streaming()
+    sys.exit(0 if failed == 0 else 1)
@@ -0,0 +1,93 @@
+import sys
+import os
+import asyncio
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from orchestration.classifier import TieredClassifier, TRAINING_QUERIES, llm_offload_rate
+from utils.metrics import metrics
+from tests.checks import Checks
+
+
+def test_tiered_classifier():
+    """Check the rules -> local model -> LLM tiers, the confidence threshold and the offload rate."""
+    print("=" * 80)
+    print("TIERED CLASSIFIER TESTS")
+    print("=" * 80)
+
+    check = Checks()
+
+    classifier = TieredClassifier(threshold=0.75)
+    llm_calls = []
+
+    def llm(query):
+        llm_calls.append(query)
+        return "network"
+
+    def broken_llm(query):
+        raise RuntimeError("LLM unavailable")
+
+    metrics.reset()
+
+    # 1. Decisive keywords stop at the rules tier
+    decision = classifier.classify("Why was I charged twice?", llm=llm)
+    check("strong keywords are decided by the rules tier",
+          decision["label"] == "billing" and decision["tier"] == "rules" and decision["confidence"] >= 0.75)
+
+    # 2. Weak keywords: the TF-IDF model decides, on paraphrases it was not trained on
+    seeds = {text.lower() for text, _ in TRAINING_QUERIES}
+    paraphrases = ["Mobile data isn't working", "How do I reset my voicemail PIN?"]
+    check("model-tier queries are not seed sentences", not seeds & {q.lower() for q in paraphrases})
+    decision = classifier.classify(paraphrases[0], llm=llm)
+    check("weak rule matches fall through to the local model",
+          classifier.rules.predict(paraphrases[0])[1] < 0.75
+          and decision["label"] == "network" and decision["tier"] == "model")
+    decision = classifier.classify(paraphrases[1], llm=llm)
+    check("queries without keywords are decided by the local model",
+          decision["label"] == "knowledge" and decision["tier"] == "model")
+    check("confident local tiers never call the LLM", llm_calls == [])
+
+    # 3. Both local tiers unsure: the LLM decides
+    decision = classifier.classify("Voice breaks up", llm=llm)
+    check("unsure local tiers defer to the LLM",
+          decision["label"] == "network" and decision["tier"] == "llm" and llm_calls == ["Voice breaks up"])
+    decision = asyncio.run(classifier.aclassify("Voice breaks up", llm=lambda q: asyncio.sleep(0, "billing")))
+    check("async classify defers to the LLM too", decision["label"] == "billing" and decision["tier"] == "llm")
+
+    # 4. No LLM, a failing one or an unknown label: below-threshold guesses default to knowledge
+    check("'I need help' is below the threshold for every local tier",
+          0 < classifier.model.predict("I need help")[1] < 0.75 and classifier.rules.predict("I need help")[0] is None)
+    decision = classifier.classify("I need help")
+    check("unsure queries fall back to knowledge, not the weak local guess",
+          decision["label"] == "knowledge" and decision["tier"] == "fallback")
+    decisions = [classifier.classify("Voice breaks up", llm=broken_llm),
+                 classifier.classify("Voice breaks up", llm=lambda q: "weather")]
+    check("a failed or unusable LLM answer falls back to knowledge as llm_failed",
+          all(d["label"] == "knowledge" and d["tier"] == "llm_failed" for d in decisions))
+
+    # 5. The threshold moves the boundary between the tiers
+    lenient = TieredClassifier(threshold=0.5).classify("Voice breaks up", llm=llm)
+    strict = TieredClassifier(threshold=1.01).classify("Why was I charged twice?")
+    check("threshold controls which tier answers",
+          lenient["tier"] == "model" and lenient["label"] == "network"
+          and strict["tier"] == "fallback" and strict["label"] == "knowledge")
+
+    # 6. Offload rate: only rules, model and the no-LLM fallback avoided a model call
+    counts = {tier: metrics.counter(f"classifier.tier.{tier}")
+              for tier in ("rules", "model", "llm", "llm_failed", "fallback")}
+    check("offload rate leaves out every turn that called the LLM",
+          counts == {"rules": 1, "model": 3, "llm": 2, "llm_failed": 2, "fallback": 2}
+          and abs(llm_offload_rate() - 6 / 10) < 1e-9)
+    metrics.reset()
+
+    print(f"\n{'=' * 80}")
+    print(f"SUMMARY: {check.passed} passed, {check.failed} failed")
+    print("=" * 80)
+
+    return check.passed, check.failed
+
+
+if __name__ == "__main__":
+    passed, failed = test_tiered_classifier()
+    sys.exit(0 if failed == 0 else 1)
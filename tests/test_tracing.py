@@ -0,0 +1,202 @@
+import sys
+import os
+import asyncio
+import contextvars
+import json
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openai import OpenAI
+from tests.checks import Checks
+
+import orchestration.graph as graph_module
+import services.customer_service as customer_service
+from agents.llm import SharedHTTPClient, run_async
+from orchestration.graph import create_graph, create_async_graph
+from orchestration.response_cache import response_cache
+from tests.stub_llm_server import StubLLMServer
+from utils.database import Database
+from utils.synthetic_data import generate, customer_email
+from utils.tracing import Trace, Tracer, current_trace, tracer, summarize, trace_node, turn
+
+EMAIL = customer_email(3)
+
+
+def turn_inputs(query):
+    return {"query": query, "chat_history": [], "user_email": EMAIL, "customer_info": {"email": EMAIL}}
+
+
+def test_tracing():
+    """Check per-turn tracing: node spans, DB/LLM/cache counters and the JSONL/OpenTelemetry exports."""
+    print("=" * 80)
+    print("TRACING TESTS")
+    print("=" * 80)
+
+    check = Checks()
+
+    stub = StubLLMServer()
+    client = OpenAI(api_key="sk-test", base_url=stub.start(), http_client=SharedHTTPClient())
+
+    def plan_agent(query, **kwargs):
+        response = client.chat.completions.create(model="gpt-4o", messages=[{"role": "user", "content": query}])
+        return response.choices[0].message.content
+
+    async def aplan_agent(query, **kwargs):
+        return await asyncio.to_thread(plan_agent, query)
+
+    tmp = tempfile.TemporaryDirectory()
+    database = Database(os.path.join(tmp.name, "trace.db"))
+    generate(database, 20, months=2, seed=1)
+    originals = (customer_service.db, graph_module.process_plan_query, graph_module.aprocess_plan_query,
+                 tracer.exporters, tracer.jsonl_path)
+    customer_service.db = database
+    graph_module.process_plan_query = plan_agent
+    graph_module.aprocess_plan_query = aplan_agent
+    tracer.exporters = ["jsonl"]
+    tracer.jsonl_path = os.path.join(tmp.name, "traces.jsonl")
+    customer_service.customer_cache.invalidate()
+    response_cache.clear()
+    tracer.clear()
+
+    try:
+        graph = create_graph()
+
+        # 1. One turn, one trace with a span per node run
+        result = graph.invoke(turn_inputs("Recommend a better plan for me"))
+        trace = tracer.recent()[0]
+        spans = {span["name"]: span for span in trace["spans"]}
+        check("one trace per turn with a span per node",
+              len(tracer.recent()) == 1 and set(spans) == {"get_customer_context", "classify_query", "response_cache",
+                                                          "plan_node", "merge_responses", "finalize"}
+              and trace["routes"] == ["plan"] and result["final_response"])
+        check("DB queries and time are attributed to the prefetch node",
+              spans["get_customer_context"]["db_queries"] > 0 and spans["get_customer_context"]["db_ms"] > 0
+              and trace["db_queries"] == sum(span["db_queries"] for span in trace["spans"]))
+        check("LLM call and reported tokens are attributed to the agent node",
+              spans["plan_node"]["llm_calls"] == 1 and spans["plan_node"]["prompt_tokens"] > 0
+              and spans["plan_node"]["completion_tokens"] > 0 and trace["llm_calls"] == 1)
+        check("node wall times fit inside the turn",
+              all(0 < span["wall_ms"] <= trace["wall_ms"] for span in trace["spans"]))
+
+        # 2. The repeat is served from the caches
+        graph.invoke(turn_inputs("Recommend a better plan for me"))
+        repeat = tracer.recent()[0]
+        check("cache hits recorded per cache",
+              repeat["caches"]["response"] == {"hits": 1, "misses": 0}
+              and repeat["caches"]["customer_data"]["hits"] > 0 and repeat["llm_calls"] == 0
+              and repeat["response_cache_hit"] is True)
+
+        # 3. Async graph: parallel branches still report into their turn
+        response_cache.clear()
+        run_async(create_async_graph().ainvoke(turn_inputs("Is there a cheaper plan for me?")))
+        async_trace = tracer.recent()[0]
+        check("async turns are traced too",
+              len(tracer.recent()) == 3 and async_trace["llm_calls"] == 1
+              and {span["name"] for span in async_trace["spans"]} >= {"get_customer_context", "plan_node"})
+
+        # 4. Failing node: the span and the turn carry the error
+        def broken(state):
+            raise RuntimeError("boom")
+
+        try:
+            with turn():
+                trace_node("plan_node", broken)({})
+        except RuntimeError:
+            pass
+        failed_trace = tracer.recent()[0]
+        check("node errors are recorded and re-raised",
+              failed_trace["error"] == "RuntimeError: boom" and failed_trace["spans"][0]["error"] == "RuntimeError: boom")
+
+        # 5. Outside a turn nothing is recorded
+        database.query("SELECT COUNT(*) FROM customers")
+        check("work outside a turn is not traced", len(tracer.recent()) == 4)
+
+        # 6. Exports
+        with open(tracer.jsonl_path) as f:
+            lines = [json.loads(line) for line in f]
+        check("every turn appended to the JSONL sink",
+              [line["trace_id"] for line in lines] == [t["trace_id"] for t in reversed(tracer.recent())])
+
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+        from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+        exporter = InMemorySpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+        tracer._otel_tracer = provider.get_tracer("test")
+        tracer.exporters = ["otel"]
+        graph.invoke(turn_inputs("Should I upgrade my plan?"))
+        otel_spans = exporter.get_finished_spans()
+        root = next(span for span in otel_spans if span.name == "chat_turn")
+        check("OpenTelemetry export: one root span with a child per node",
+              len(otel_spans) == len(tracer.recent()[0]["spans"]) + 1
+              and all(span.parent.span_id == root.context.span_id for span in otel_spans if span is not root)
+              and root.attributes["db_queries"] == tracer.recent()[0]["db_queries"])
+
+        # 7. Dashboard summary
+        summary = {node["node"]: node for node in summarize(tracer.recent())}
+        check("per-node summary for the Performance panel",
+              summary["plan_node"]["runs"] == 4 and summary["plan_node"]["p95_ms"] >= summary["plan_node"]["p50_ms"] > 0)
+
+        # 8. Streams stopped early, even when closed from another context
+        tracer.exporters = []
+        stream = graph.stream(turn_inputs("Should I downgrade my plan?"), stream_mode="values")
+        next(stream)
+        leaked = current_trace() is not None
+        contextvars.Context().run(stream.close)
+        check("abandoned stream finishes its turn without leaking it to the consumer",
+              not leaked and len(tracer.recent()) == 6 and tracer.recent()[0]["wall_ms"] > 0)
+
+        async def abandon():
+            stream = create_async_graph().astream(turn_inputs("Compare plans for me"), stream_mode="values")
+            await stream.__anext__()
+            leaked = current_trace() is not None
+            await stream.aclose()
+            await asyncio.sleep(0.1)
+            return leaked
+
+        check("abandoned async stream finishes its turn without leaking it to the consumer",
+              not run_async(abandon()) and len(tracer.recent()) == 7)
+
+        # 9. A missing OpenTelemetry package disables that exporter instead of failing the turn
+        tracer.exporters = ["otel"]
+        tracer._otel_tracer = None
+        otel_module = sys.modules.get("opentelemetry")
+        sys.modules["opentelemetry"] = None
+        try:
+            graph.invoke(turn_inputs("Which plan suits my usage?"))
+        finally:
+            sys.modules["opentelemetry"] = otel_module
+        check("missing opentelemetry is logged and the exporter dropped",
+              tracer.exporters == [] and len(tracer.recent()) == 8)
+
+        # 10. The JSONL sink rolls over instead of growing forever
+        rolling = Tracer(exporters="jsonl", jsonl_path=os.path.join(tmp.name, "rolling.jsonl"), jsonl_max_bytes=2000)
+        for _ in range(10):
+            rolling.finish(Trace("chat_turn"))
+        sizes = [os.path.getsize(rolling.jsonl_path + suffix) for suffix in ("", ".1")]
+        check("JSONL export rotates past TRACE_JSONL_MAX_MB", all(0 < size <= 2000 for size in sizes))
+    finally:
+        (customer_service.db, graph_module.process_plan_query, graph_module.aprocess_plan_query,
+         tracer.exporters, tracer.jsonl_path) = originals
+        tracer._otel_tracer = None
+        customer_service.customer_cache.invalidate()
+        response_cache.clear()
+        tracer.clear()
+        database.pool.close_all()
+        stub.stop()
+        tmp.cleanup()
+
+    print(f"\n{'=' * 80}")
+    print(f"SUMMARY: {check.passed} passed, {check.failed} failed")
+    print("=" * 80)
+
+    return check.passed, check.failed
+
+
+if __name__ == "__main__":
+    passed, failed = test_tracing()
+    sys.exit(0 if failed == 0 else 1)
@@ -4,6 +4,8 @@ Renders the chat UI for interacting with AI agents.
 """
 
 import streamlit as st
+from config.config import config
+from orchestration.streaming import ResponseStream
 
 def render_chat_tab(tab_name, tab_obj):
     """Render chat interface for service tabs (Billing, Network, Plans, Knowledge)"""
@@ -27,7 +29,7 @@ def render_chat_tab(tab_name, tab_obj):
                 service_type = None if tab_name == "Assistant" else tab_name.lower()
                 
                 # Invoke LangGraph with customer context and explicit service type
-                result = st.session_state.graph.invoke({
+                inputs = {
                     "query": prompt,
                     "service_type": service_type,
                     "chat_history": [],
@@ -36,9 +38,20 @@ def render_chat_tab(tab_name, tab_obj):
                     "final_response": None,
                     "user_email": st.session_state.user_email,
                     "customer_info": {"email": st.session_state.user_email}
-                })
+                }
+                
+                if config.STREAMING_ENABLED:
+                    # Render tokens as the agents produce them
+                    with st.chat_message("user"):
+                        st.markdown(prompt.replace("$", "\\$"))
+                    with st.chat_message("assistant"):
+                        stream = ResponseStream(st.session_state.graph, inputs)
+                        st.write_stream(token.replace("$", "\\$") for token in stream)
+                    response = stream.final_response
+                else:
+                    result = st.session_state.graph.invoke(inputs)
+                    response = result.get("final_response", "No response")
                 
-                response = result.get("final_response", "No response")
                 st.session_state.messages[tab_name].append({"role": "assistant", "content": response})
                 st.rerun()
             except Exception as e:
@@ -5,7 +5,13 @@ Renders role-based dashboard - Admin overview or Customer account details.
 
 import streamlit as st
 import pandas as pd
-from services.customer_service import get_customer_profile, get_usage_history, get_all_customers
+from services.customer_service import (get_customer_profile, get_usage_history, get_all_customers,
+                                       get_service_plans, get_usage_profiles, get_plan_optimization)
+from agents.plan_recommender import recommend_for_customers
+from orchestration.classifier import llm_offload_rate
+from config.config import config
+from utils.metrics import percentile
+from utils.tracing import tracer, summarize
 
 def render_dashboard():
     """Render role-based dashboard."""
@@ -72,6 +78,35 @@ def render_admin_dashboard():
             else:
                 st.info("No plan statistics available")
             
+            # Plan Optimization: the materialized bulk job results when available, else scored live
+            st.markdown("#### 💡 Plan Optimization")
+            run, switchers = get_plan_optimization()
+            if run:
+                col1, col2, col3 = st.columns(3)
+                col1.metric("Customers Scored", f"{run['customers']:,}")
+                col2.metric("Would Save by Switching", f"{run['switchers']:,}")
+                col3.metric("Total Monthly Savings", f"\\${run['total_monthly_savings']:,.0f}")
+                st.caption(f"Bulk run {run['run_id']} finished {run['finished_at']} "
+                           f"({run['customers_per_second']:,.0f} customers/s, "
+                           f"last {run['lookback_months']} months of usage); top {len(switchers)} shown")
+                switches = [dict(zip(["customer_id", "name", "current_plan", "current_cost", "recommended_plan",
+                                      "recommended_cost", "savings"], row)) for row in switchers]
+            else:
+                st.caption("Scored live; run `python -m services.plan_optimization run` to materialize "
+                           "results for the whole customer base")
+                switches = recommend_for_customers(get_usage_profiles(config.PLAN_LOOKBACK_MONTHS),
+                                                   get_service_plans())
+            if switches:
+                switch_df = pd.DataFrame(switches).rename(columns={
+                    "customer_id": "Customer ID", "name": "Name", "current_plan": "Current Plan",
+                    "current_cost": "Projected Cost", "recommended_plan": "Recommended Plan",
+                    "recommended_cost": "Recommended Cost", "savings": "Monthly Savings"})
+                for column in ["Projected Cost", "Recommended Cost", "Monthly Savings"]:
+                    switch_df[column] = switch_df[column].apply(lambda x: f"\\${x:.2f}")
+                st.dataframe(switch_df, use_container_width=True)
+            else:
+                st.info("Every customer is on their cheapest plan")
+            
             # Customer Management
             st.markdown("#### 🔧 Customer Management")
             all_customers = get_all_customers()
@@ -104,6 +139,53 @@ def render_admin_dashboard():
                 st.info("No customer data available")
     else:
         st.info("Click 'Refresh System Overview' to load admin dashboard")
+    
+    render_performance_panel()
+
+def render_performance_panel():
+    """Per-turn traces of the chat graph served by this process: where the time goes, node by node"""
+    st.divider()
+    st.markdown("#### ⏱️ Performance")
+    traces = tracer.recent()
+    if not traces:
+        st.info("No chat turns traced yet" if config.TRACING_ENABLED else "Tracing is off (TRACING_ENABLED=false)")
+        return
+    
+    wall = sorted(trace["wall_ms"] for trace in traces)
+    turns = len(traces)
+    hits = sum(trace["cache_hits"] for trace in traces)
+    lookups = hits + sum(trace["cache_misses"] for trace in traces)
+    col1, col2, col3, col4, col5, col6 = st.columns(6)
+    col1.metric("Turn p50 / p95", f"{percentile(wall, 50):,.0f} / {percentile(wall, 95):,.0f} ms")
+    col2.metric("DB Queries / Turn", f"{sum(trace['db_queries'] for trace in traces) / turns:.1f}")
+    col3.metric("LLM Calls / Turn", f"{sum(trace['llm_calls'] for trace in traces) / turns:.1f}")
+    col4.metric("Tokens / Turn", f"{sum(trace['prompt_tokens'] + trace['completion_tokens'] for trace in traces) / turns:,.0f}")
+    col5.metric("Cache Hit Rate", f"{hits / lookups:.0%}" if lookups else "-")
+    col6.metric("Routed Without LLM", f"{llm_offload_rate():.0%}")
+    st.caption(f"Last {turns} turn(s) in this process; exported to "
+               f"{config.TRACE_EXPORTER if tracer.exporters else 'memory only'}"
+               + (f" ({config.TRACE_JSONL_PATH})" if "jsonl" in tracer.exporters else ""))
+    
+    node_df = pd.DataFrame(summarize(traces)).rename(columns={
+        "node": "Node", "runs": "Runs", "p50_ms": "p50 (ms)", "p95_ms": "p95 (ms)", "p99_ms": "p99 (ms)",
+        "db_queries": "DB Queries", "db_ms": "DB (ms)", "llm_calls": "LLM Calls", "tokens": "Tokens"})
+    st.dataframe(node_df.round(1), use_container_width=True, hide_index=True)
+    
+    st.markdown("##### Recent Turns")
+    recent_df = pd.DataFrame([{
+        "Started": trace["started_at"][11:19],
+        "Routes": "+".join(trace.get("routes") or []),
+        "Wall (ms)": trace["wall_ms"],
+        "Slowest Node": max(trace["spans"], key=lambda span: span["wall_ms"])["name"] if trace["spans"] else "",
+        "DB Queries": trace["db_queries"],
+        "DB (ms)": trace["db_ms"],
+        "LLM Calls": trace["llm_calls"],
+        "LLM (ms)": trace["llm_ms"],
+        "Tokens": trace["prompt_tokens"] + trace["completion_tokens"],
+        "Cache Hits": trace["cache_hits"],
+        "Error": trace["error"] or "",
+    } for trace in traces[:50]])
+    st.dataframe(recent_df.round(1), use_container_width=True, hide_index=True)
 
 def render_customer_dashboard():
     """Render customer account dashboard."""
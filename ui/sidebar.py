@@ -87,6 +87,7 @@ def render_sidebar():
                 - Network Status
                 - Plan Analytics
                 """)
+                render_runtime_status()
             else:
                 st.header("📱 Services")
                 st.markdown("""
@@ -97,6 +98,21 @@ def render_sidebar():
                 - Knowledge Base
                 """)
 
+def render_runtime_status():
+    """Readiness and per-subsystem startup times of the shared runtime."""
+    from orchestration.runtime import get_runtime
+    
+    snapshot = get_runtime().snapshot()
+    icons = {"ready": "✅", "failed": "❌", "starting": "⏳", "pending": "⏸️"}
+    with st.expander(f"⚙️ System status: {snapshot['status']}"):
+        for name, stage in snapshot["stages"].items():
+            timing = f" - {stage['ms']:.0f}ms" if stage["ms"] is not None else ""
+            st.write(f"{icons.get(stage['status'], '')} {name}{timing}")
+            if stage["error"]:
+                st.caption(stage["error"])
+        if snapshot["total_ms"] is not None:
+            st.caption(f"Warm-up took {snapshot['total_ms'] / 1000:.1f}s")
+
 def authenticate_user(email, password):
     """Authenticate user credentials"""
     try:
@@ -0,0 +1,31 @@
+"""
+Concurrency - Shared worker pool for blocking calls made from async code.
+Lets the async graph overlap SQLite reads and sync-only agent frameworks.
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config.config import config
+
+_executor = None
+_lock = threading.Lock()
+
+
+def get_executor():
+    """Process-wide thread pool sized by config.ASYNC_WORKER_THREADS."""
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=config.ASYNC_WORKER_THREADS,
+                                           thread_name_prefix="telecom-worker")
+        return _executor
+
+
+async def run_in_thread(fn, *args, **kwargs):
+    """Await fn(*args, **kwargs) on the shared pool, carrying the caller's contextvars."""
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, fn, *args, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(get_executor(), call)
@@ -1,47 +1,207 @@
 """
 Database Utility - SQLite connection manager with query methods.
 Provides access to customers, service_plans, and customer_usage tables.
+Connections are pooled, tuned with WAL/pragmas, and reused per thread.
 """
 
 
+import queue
 import sqlite3
+import threading
+from contextlib import contextmanager
 from config.config import config
+from utils.concurrency import run_in_thread
+from utils.tracing import timed
+
+
+class ConnectionPool:
+    """Bounded pool of tuned SQLite connections.
+
+    A thread that already holds a connection (nested query inside a
+    ``connection()`` block) reuses it instead of checking out a second one.
+    Idle connections are handed out LIFO so a busy thread keeps hitting the
+    same warm connection and its prepared-statement cache.
+    """
+
+    def __init__(self, db_path, max_size=config.DB_POOL_SIZE, timeout=config.DB_POOL_TIMEOUT):
+        self.db_path = db_path
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._local = threading.local()
+        self._all = []
+        self._in_use = set()
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.timeout,
+            check_same_thread=False,
+            cached_statements=config.DB_STATEMENT_CACHE_SIZE,
+        )
+        # WAL lets readers proceed while a writer commits
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA synchronous={config.DB_SYNCHRONOUS}")
+        # Negative cache_size is interpreted by SQLite as KiB
+        conn.execute(f"PRAGMA cache_size=-{config.DB_CACHE_SIZE_KB}")
+        conn.execute(f"PRAGMA mmap_size={config.DB_MMAP_SIZE}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        with self._lock:
+            self._all.append(conn)
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """Check out a connection for the duration of the block."""
+        held = getattr(self._local, "conn", None)
+        if held is not None:
+            yield held
+            return
+
+        if not self._slots.acquire(timeout=self.timeout):
+            raise sqlite3.OperationalError(
+                f"Connection pool exhausted ({self.max_size} connections in use)"
+            )
+        try:
+            with self._lock:
+                try:
+                    conn = self._idle.get_nowait()
+                except queue.Empty:
+                    conn = None
+            if conn is None:
+                conn = self._connect()
+            with self._lock:
+                self._in_use.add(conn)
+        except Exception:
+            self._slots.release()
+            raise
+
+        self._local.conn = conn
+        try:
+            yield conn
+        finally:
+            self._local.conn = None
+            self._release(conn)
+            self._slots.release()
+
+    def _release(self, conn):
+        with self._lock:
+            self._in_use.discard(conn)
+            # close_all() retired this connection while it was checked out
+            retired = conn not in self._all
+            if not retired:
+                if conn.in_transaction:
+                    conn.rollback()
+                self._idle.put(conn)
+        if retired:
+            _close(conn)
+
+    def close_all(self):
+        """Close every connection opened by this pool.
+
+        Idle connections are closed now; checked-out ones are closed when
+        their holder returns them, never handed out again.
+        """
+        with self._lock:
+            conns, self._all = self._all, []
+            idle = [conn for conn in conns if conn not in self._in_use]
+            self._idle = queue.LifoQueue()
+        for conn in idle:
+            _close(conn)
+
+
+def _close(conn):
+    try:
+        conn.close()
+    except sqlite3.Error:
+        pass
+
 
 class Database:
-    def __init__(self, db_path=config.DB_PATH):
+    def __init__(self, db_path=config.DB_PATH, pool_size=config.DB_POOL_SIZE):
         self.db_path = db_path
+        self.pool = ConnectionPool(db_path, max_size=pool_size)
+        self._migrated = False
+        self._write_listeners = []
 
     def get_connection(self):
+        """Open a standalone (unpooled) connection; caller must close it."""
         return sqlite3.connect(self.db_path)
 
+    def connection(self):
+        """Context manager yielding a pooled connection."""
+        return self.pool.connection()
+
+    def add_write_listener(self, listener):
+        """Register listener(sql) to be called after every committed execute()."""
+        if listener not in self._write_listeners:
+            self._write_listeners.append(listener)
+
     def query(self, sql, params=None):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        try:
-            cursor.execute(sql, params or [])
-            return cursor.fetchall()
-        finally:
-            conn.close()
+        with timed("db_queries", "db_ms"), self.pool.connection() as conn:
+            cursor = conn.execute(sql, params or [])
+            try:
+                return cursor.fetchall()
+            finally:
+                cursor.close()
 
     def query_one(self, sql, params=None):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        try:
-            cursor.execute(sql, params or [])
-            return cursor.fetchone()
-        finally:
-            conn.close()
+        with timed("db_queries", "db_ms"), self.pool.connection() as conn:
+            cursor = conn.execute(sql, params or [])
+            try:
+                return cursor.fetchone()
+            finally:
+                cursor.close()
 
     def execute(self, sql, params=None):
         """Execute INSERT, UPDATE, DELETE statements"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        try:
-            cursor.execute(sql, params or [])
-            conn.commit()
-            return cursor.lastrowid
-        finally:
-            conn.close()
+        with timed("db_queries", "db_ms"), self.pool.connection() as conn:
+            try:
+                cursor = conn.execute(sql, params or [])
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        for listener in self._write_listeners:
+            listener(sql)
+        return cursor.lastrowid
+
+    def executemany(self, sql, rows):
+        """Execute one INSERT/UPDATE/DELETE for every parameter row in a single transaction"""
+        with timed("db_queries", "db_ms"), self.pool.connection() as conn:
+            try:
+                conn.executemany(sql, rows)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        for listener in self._write_listeners:
+            listener(sql)
+
+    # Async variants: the blocking call runs on the shared worker pool
+    async def aquery(self, sql, params=None):
+        return await run_in_thread(self.query, sql, params)
+
+    async def aquery_one(self, sql, params=None):
+        return await run_in_thread(self.query_one, sql, params)
+
+    async def aexecute(self, sql, params=None):
+        return await run_in_thread(self.execute, sql, params)
+
+    def migrate(self):
+        """Apply pending schema migrations; returns the applied versions."""
+        from utils.migrations import run_migrations
+
+        applied = run_migrations(self)
+        self._migrated = True
+        return applied
+
+    def ensure_migrated(self):
+        """Run migrations unless they already ran in this process."""
+        if not self._migrated:
+            self.migrate()
 
     def create_tables(self):
         """Create all necessary tables"""
@@ -151,4 +311,6 @@ class Database:
         finally:
             conn.close()
 
+        self.migrate()
+
 db = Database()
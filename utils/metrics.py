@@ -0,0 +1,76 @@
+"""
+Metrics - Thread-safe in-process counters and latency observations.
+Shared by the classifier, caches and agents; read by the admin dashboard.
+"""
+
+import math
+import threading
+from collections import defaultdict, deque
+
+
+class Metrics:
+    def __init__(self, window=1024):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(float)
+        self._observations = defaultdict(lambda: deque(maxlen=window))
+        self._totals = defaultdict(lambda: [0, 0.0])  # name -> [count, sum]
+
+    def increment(self, name, value=1):
+        """Add value to a counter."""
+        with self._lock:
+            self._counters[name] += value
+
+    def observe(self, name, value):
+        """Record one observation (e.g. a latency in ms)."""
+        with self._lock:
+            self._observations[name].append(value)
+            totals = self._totals[name]
+            totals[0] += 1
+            totals[1] += value
+
+    def counter(self, name):
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def summary(self, name):
+        """Count, mean and p50/p95/p99 over the recent window for one observation."""
+        with self._lock:
+            values = sorted(self._observations.get(name, ()))
+            count, total = self._totals.get(name, (0, 0.0))
+        if not values:
+            return {"count": 0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+        return {
+            "count": count,
+            "mean": total / count,
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95),
+            "p99": percentile(values, 99),
+            "max": values[-1],
+        }
+
+    def snapshot(self):
+        """Return all counters and observation summaries."""
+        with self._lock:
+            counters = dict(self._counters)
+            names = list(self._observations)
+        return {
+            "counters": counters,
+            "observations": {name: self.summary(name) for name in names},
+        }
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._observations.clear()
+            self._totals.clear()
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+metrics = Metrics()
@@ -0,0 +1,116 @@
+"""
+Schema Migrations - Versioned, idempotent schema changes for telecom.db.
+Each migration runs once, in order, and is recorded in schema_migrations.
+"""
+
+import sqlite3
+
+# (version, description, statements) - append new entries, never edit applied ones
+MIGRATIONS = [
+    (1, "Index hot customer and usage lookups", [
+        # email -> customer_id / account status lookups (customer service, network agent)
+        """CREATE INDEX IF NOT EXISTS idx_customers_email
+           ON customers (email, customer_id, name, account_status, service_plan_id)""",
+        # Latest usage row per customer without a temp B-tree sort
+        """CREATE INDEX IF NOT EXISTS idx_customer_usage_customer_period
+           ON customer_usage (customer_id, billing_period_end DESC)""",
+        # Admin dashboard: recent registrations and plan distribution
+        "CREATE INDEX IF NOT EXISTS idx_customers_registration_date ON customers (registration_date DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_customers_service_plan ON customers (service_plan_id)",
+    ]),
+    (2, "Materialized plan optimization results", [
+        # One row per run of services.plan_optimization; the dashboard reads the latest completed one
+        """CREATE TABLE IF NOT EXISTS plan_optimization_runs (
+               run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+               status TEXT NOT NULL DEFAULT 'running',
+               started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+               finished_at TIMESTAMP,
+               lookback_months INTEGER NOT NULL,
+               customers INTEGER DEFAULT 0,
+               switchers INTEGER DEFAULT 0,
+               total_monthly_savings REAL DEFAULT 0,
+               elapsed_seconds REAL,
+               customers_per_second REAL,
+               error TEXT
+           )""",
+        """CREATE TABLE IF NOT EXISTS plan_recommendations (
+               run_id INTEGER NOT NULL,
+               customer_id TEXT NOT NULL,
+               current_plan_id INTEGER,
+               current_cost REAL,
+               recommended_plan_id INTEGER NOT NULL,
+               recommended_cost REAL NOT NULL,
+               savings REAL,
+               PRIMARY KEY (run_id, customer_id)
+           )""",
+        # Biggest savings first for the dashboard
+        """CREATE INDEX IF NOT EXISTS idx_plan_recommendations_savings
+           ON plan_recommendations (run_id, savings DESC)""",
+        # Latest completed run without scanning failed/running ones
+        """CREATE INDEX IF NOT EXISTS idx_plan_optimization_runs_status
+           ON plan_optimization_runs (status, run_id DESC)""",
+    ]),
+]
+
+
+def _ensure_migrations_table(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.commit()
+
+
+def get_schema_version(conn):
+    """Return the highest applied migration version (0 if none)."""
+    _ensure_migrations_table(conn)
+    row = conn.execute("SELECT MAX(version) FROM schema_migrations").fetchone()
+    return row[0] or 0
+
+
+def run_migrations(database, target_version=None):
+    """Apply all pending migrations to the given Database.
+
+    Args:
+        database: Database instance to migrate
+        target_version: Stop after this version (defaults to latest)
+
+    Returns:
+        List of applied migration versions
+    """
+    applied = []
+    with database.connection() as conn:
+        current = get_schema_version(conn)
+
+        for version, description, statements in MIGRATIONS:
+            if version <= current or (target_version is not None and version > target_version):
+                continue
+            try:
+                conn.execute("BEGIN")
+                for statement in statements:
+                    conn.execute(statement)
+                conn.execute(
+                    "INSERT INTO schema_migrations (version, description) VALUES (?, ?)",
+                    (version, description)
+                )
+                conn.commit()
+            except sqlite3.Error as e:
+                conn.rollback()
+                raise sqlite3.OperationalError(f"Migration {version} ({description}) failed: {e}") from e
+            print(f"Applied migration {version}: {description}")
+            applied.append(version)
+
+        if applied:
+            conn.execute("PRAGMA optimize")
+
+    return applied
+
+
+if __name__ == "__main__":
+    from utils.database import db
+    db.create_tables()
+    versions = db.migrate()
+    print(f"Schema is up to date ({len(versions)} migration(s) applied)")
@@ -0,0 +1,199 @@
+"""
+Synthetic Data - Reproducible users, customers, usage history and incidents at any scale.
+Fills a database with the telecom.db schema for benchmarks and load tests.
+"""
+
+import argparse
+import hashlib
+import sqlite3
+import time
+
+import numpy as np
+
+from config.config import config
+
+# (name, plan_type, monthly_cost, data GB, voice minutes, SMS, unlimited data/voice/SMS, features)
+PLAN_CATALOG = [
+    ("Basic", "prepaid", 19.99, 2.0, 200, 100, 0, 0, 0, "Starter plan"),
+    ("Smart 5", "prepaid", 29.99, 5.0, 500, 300, 0, 0, 0, "5 GB data"),
+    ("Standard", "postpaid", 39.99, 10.0, 1000, 500, 0, 0, 1, "Unlimited SMS"),
+    ("Talk Plus", "postpaid", 44.99, 8.0, 0, 1000, 0, 1, 1, "Unlimited calls and SMS"),
+    ("Data 25", "postpaid", 54.99, 25.0, 1500, 1000, 0, 0, 1, "25 GB data"),
+    ("Premium", "postpaid", 69.99, 50.0, 0, 0, 0, 1, 1, "50 GB data, unlimited calls"),
+    ("Unlimited", "postpaid", 89.99, 0, 0, 0, 1, 1, 1, "Everything unlimited"),
+]
+
+AREAS = ["Mumbai", "Delhi NCR", "Bangalore", "Hyderabad", "Chennai", "Pune", "Kolkata", "Ahmedabad", "Jaipur",
+         "Chandigarh"]
+ISSUE_TYPES = ["Slow data", "Call drops", "No signal", "SMS delay", "5G outage", "Fiber cut"]
+SEVERITIES = ["critical", "high", "medium", "low"]
+
+# (issue_type, symptoms, solution, category)
+COMMON_ISSUES = [
+    ("Slow data", "Pages load slowly, video buffers", "Toggle airplane mode, check APN settings, check data balance",
+     "data"),
+    ("Call drops", "Calls disconnect mid-conversation", "Enable VoLTE, update carrier settings, move to open area",
+     "voice"),
+    ("No signal", "No bars or 'No Service'", "Restart device, reseat SIM, check for area outages", "coverage"),
+    ("SMS delay", "Messages arrive late or fail", "Check message center number, clear storage", "sms"),
+]
+
+# Every synthetic user's password (UserManager hashes with SHA-256)
+PASSWORD = "password"
+
+_INSERT_USER = """INSERT INTO users (id, username, email, password_hash, role) VALUES (?, ?, ?, ?, ?)"""
+_INSERT_CUSTOMER = """INSERT INTO customers (customer_id, user_id, name, email, phone_number, service_plan_id,
+                                             account_status, registration_date) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"""
+_INSERT_USAGE = """INSERT INTO customer_usage (customer_id, billing_period_start, billing_period_end,
+                                               data_used_gb, voice_minutes_used, sms_count_used,
+                                               additional_charges, total_bill_amount, month, year)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+
+def customer_id(i):
+    return f"CUST{i:07d}"
+
+
+def customer_email(i):
+    return f"customer{i}@example.com"
+
+
+def billing_periods(months, last_year=2024, last_month=6):
+    """(start, end, month, year) of the `months` periods up to last_month, oldest first."""
+    periods = []
+    for back in range(months - 1, -1, -1):
+        index = last_year * 12 + last_month - 1 - back
+        year, month = divmod(index, 12)
+        month += 1
+        next_year, next_month = divmod(index + 1, 12)
+        end = np.datetime64(f"{next_year:04d}-{next_month + 1:02d}-01") - np.timedelta64(1, "D")
+        periods.append((f"{year:04d}-{month:02d}-01", str(end), month, year))
+    return periods
+
+
+def _plans(conn):
+    rows = conn.execute("""SELECT plan_id, monthly_cost, data_limit_gb, voice_minutes, sms_count,
+                                  unlimited_data, unlimited_voice, unlimited_sms
+                           FROM service_plans ORDER BY plan_id""").fetchall()
+    if not rows:
+        conn.executemany("""INSERT INTO service_plans (name, plan_type, monthly_cost, data_limit_gb, voice_minutes,
+                                                       sms_count, unlimited_data, unlimited_voice, unlimited_sms, features)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""", PLAN_CATALOG)
+        conn.commit()
+        return _plans(conn)
+    return rows
+
+
+def generate_incidents(conn, incidents, rng):
+    """Insert network incidents spread over AREAS (about a third still open) and the common issues."""
+    if not conn.execute("SELECT 1 FROM common_network_issues LIMIT 1").fetchone():
+        conn.executemany("INSERT INTO common_network_issues (issue_type, symptoms, solution, category) "
+                         "VALUES (?, ?, ?, ?)", COMMON_ISSUES)
+    first = conn.execute("SELECT COUNT(*) FROM network_incidents").fetchone()[0] + 1
+    reported = np.datetime64("2024-06-30T00:00") - rng.integers(0, 90 * 24 * 60, size=incidents).astype("timedelta64[m]")
+    repair = rng.gamma(2.0, 6.0, size=incidents) * 60
+    resolved = rng.random(incidents) < 0.65
+    severity = rng.choice(len(SEVERITIES), size=incidents, p=[0.1, 0.25, 0.4, 0.25])
+    rows = []
+    for k in range(incidents):
+        resolved_at = str(reported[k] + np.timedelta64(int(repair[k]), "m")).replace("T", " ") if resolved[k] else None
+        rows.append((f"INC{first + k:07d}", AREAS[rng.integers(len(AREAS))], ISSUE_TYPES[rng.integers(len(ISSUE_TYPES))],
+                     SEVERITIES[severity[k]], "resolved" if resolved[k] else rng.choice(["open", "in_progress"]),
+                     str(reported[k]).replace("T", " "), resolved_at))
+    conn.executemany("INSERT INTO network_incidents (incident_id, area, issue_type, severity, status, reported_date, "
+                     "resolved_date) VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+    conn.commit()
+
+
+def generate(database, customers, months=3, incidents=0, seed=42, batch_size=50000, start_index=1,
+             users=True, on_progress=None):
+    """
+    Insert `customers` customers with `months` billing periods each into database
+    (plans from PLAN_CATALOG unless the catalogue is already populated), a
+    'customer' login per customer (password PASSWORD) unless users is False,
+    and `incidents` network incidents.
+
+    Usage is drawn around each customer's plan allowance, so some customers fit
+    their plan, some overrun it and some pay for far more than they use.
+    Returns counts of the inserted rows.
+    """
+    database.create_tables()
+    rng = np.random.default_rng(seed)
+    periods = billing_periods(months)
+    conn = sqlite3.connect(database.db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")
+    try:
+        plans = _plans(conn)
+        plan_ids = np.array([plan[0] for plan in plans])
+        cost = np.array([plan[1] for plan in plans], dtype=float)
+        caps = np.nan_to_num(np.array([plan[2:5] for plan in plans], dtype=float))
+        unlimited = np.array([plan[5:8] for plan in plans], dtype=bool)
+        # Unlimited dimensions still need a usage scale to draw from
+        scale = np.where(unlimited | (caps == 0), [60.0, 2500.0, 1500.0], caps)
+        rates = np.array([config.OVERAGE_RATE_DATA_GB, config.OVERAGE_RATE_VOICE_MINUTE, config.OVERAGE_RATE_SMS])
+
+        password_hash = hashlib.sha256(PASSWORD.encode()).hexdigest()
+        user_offset = conn.execute("SELECT COALESCE(MAX(id), 0) FROM users").fetchone()[0] - start_index + 1
+        inserted = 0
+        for first in range(start_index, start_index + customers, batch_size):
+            n = min(batch_size, start_index + customers - first)
+            ids = [customer_id(i) for i in range(first, first + n)]
+            plan = rng.integers(0, len(plans), size=n)
+            # Per-customer appetite relative to the plan: 0.2x (overpaying) to ~2x (overrunning)
+            appetite = rng.lognormal(-0.3, 0.6, size=(n, 1)) * scale[plan]
+            status = np.where(rng.random(n) < 0.95, "active", "suspended")
+            registered = np.datetime64("2020-01-01") + rng.integers(0, 1600, size=n)
+
+            if users:
+                conn.executemany(_INSERT_USER, [
+                    (user_offset + first + k, f"customer{first + k}", customer_email(first + k), password_hash, "customer")
+                    for k in range(n)
+                ])
+            conn.executemany(_INSERT_CUSTOMER, [
+                (cid, user_offset + first + k if users else None, f"Customer {first + k}", customer_email(first + k),
+                 f"+91{9000000000 + first + k}", int(plan_ids[plan[k]]), status[k], str(registered[k]))
+                for k, cid in enumerate(ids)
+            ])
+            for start, end, month, year in periods:
+                usage = appetite * rng.uniform(0.7, 1.3, size=(n, 3))
+                usage[:, 1:] = np.round(usage[:, 1:])
+                overage = np.where(unlimited[plan], 0.0, np.maximum(usage - caps[plan], 0.0)) * rates
+                extras = np.round(overage.sum(axis=1), 2)
+                conn.executemany(_INSERT_USAGE, [
+                    (cid, start, end, round(float(usage[k, 0]), 2), int(usage[k, 1]), int(usage[k, 2]),
+                     float(extras[k]), round(float(cost[plan[k]] + extras[k]), 2), month, year)
+                    for k, cid in enumerate(ids)
+                ])
+            conn.commit()
+            inserted += n
+            if on_progress:
+                on_progress(inserted, customers)
+        if incidents:
+            generate_incidents(conn, incidents, rng)
+    finally:
+        conn.close()
+    return {"plans": len(plans), "users": inserted if users else 0, "customers": inserted,
+            "usage_rows": inserted * months, "incidents": incidents}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic users, customers, usage history and incidents")
+    parser.add_argument("--customers", type=int, default=10000, help="Number of customers to add")
+    parser.add_argument("--months", type=int, default=3, help="Billing periods per customer")
+    parser.add_argument("--incidents", type=int, default=500, help="Number of network incidents to add")
+    parser.add_argument("--no-users", action="store_true", help="Skip the customer login accounts")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db", default=config.DB_PATH, help="Database file (created if missing)")
+    args = parser.parse_args(argv)
+
+    from utils.database import Database
+    start = time.perf_counter()
+    counts = generate(Database(args.db), args.customers, args.months, args.incidents, args.seed,
+                      users=not args.no_users, on_progress=lambda done, total: print(f"  {done:,}/{total:,} customers"))
+    print(f"Inserted {counts['users']:,} users, {counts['customers']:,} customers, {counts['usage_rows']:,} usage rows "
+          f"and {counts['incidents']:,} incidents in {time.perf_counter() - start:.1f}s (password: {PASSWORD})")
+
+
+if __name__ == "__main__":
+    main()
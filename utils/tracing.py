@@ -0,0 +1,418 @@
+"""
+Tracing - Per-turn spans for the LangGraph pipeline.
+Records node wall time, DB queries, LLM calls/tokens and cache hits; exports to JSONL or OpenTelemetry.
+"""
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from config.config import config
+from utils.metrics import metrics, percentile
+
+# Per-span and per-turn counters
+COUNTERS = ("db_queries", "db_ms", "llm_calls", "llm_ms", "prompt_tokens", "completion_tokens",
+            "cache_hits", "cache_misses")
+
+# The turn and node being traced; LangGraph and run_in_thread carry both into worker threads
+_current_trace = contextvars.ContextVar("trace", default=None)
+_current_span = contextvars.ContextVar("span", default=None)
+
+
+class Span:
+    """One graph node run within a turn."""
+
+    def __init__(self, name, offset_ms):
+        self.name = name
+        self.start_ms = offset_ms
+        self.wall_ms = None
+        self.error = None
+        self.counters = dict.fromkeys(COUNTERS, 0)
+
+    def to_dict(self):
+        return {"name": self.name, "start_ms": round(self.start_ms, 3),
+                "wall_ms": round(self.wall_ms or 0.0, 3), "error": self.error,
+                **{name: _round(value) for name, value in self.counters.items()}}
+
+
+class Trace:
+    """One chat turn: the node spans plus turn-wide counters and per-cache hit/miss counts."""
+
+    def __init__(self, name):
+        self.trace_id = uuid.uuid4().hex
+        self.name = name
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        self.wall_ms = None
+        self.error = None
+        self.attributes = {}
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.caches = {}
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.start) * 1000
+
+    def add(self, span, values):
+        # Parallel branches record into the same turn from different threads
+        with self._lock:
+            for name, value in values.items():
+                self.counters[name] += value
+                if span is not None:
+                    span.counters[name] += value
+
+    def add_cache(self, name, hits, misses):
+        with self._lock:
+            counts = self.caches.setdefault(name, {"hits": 0, "misses": 0})
+            counts["hits"] += hits
+            counts["misses"] += misses
+
+    def annotate(self, state):
+        """Copy the routing outcome from the final graph state."""
+        if not isinstance(state, dict):
+            return
+        self.attributes.update({
+            "routes": state.get("classifications") or [state.get("classification") or "unknown"],
+            "classification_tier": state.get("classification_tier"),
+            "response_cache_hit": bool(state.get("cache_hit")),
+        })
+
+    def to_dict(self):
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span.start_ms)
+            return {
+                "trace_id": self.trace_id,
+                "name": self.name,
+                "started_at": datetime.fromtimestamp(self.started_at, timezone.utc).isoformat(),
+                "wall_ms": round(self.wall_ms or 0.0, 3),
+                "error": self.error,
+                **self.attributes,
+                **{name: _round(value) for name, value in self.counters.items()},
+                "caches": {name: dict(counts) for name, counts in self.caches.items()},
+                "spans": [span.to_dict() for span in spans],
+            }
+
+
+def _round(value):
+    return round(value, 3) if isinstance(value, float) else value
+
+
+class Tracer:
+    """Finishes turn traces: keeps the recent ones for the dashboard and hands them to the exporters."""
+
+    def __init__(self, enabled=config.TRACING_ENABLED, exporters=config.TRACE_EXPORTER,
+                 jsonl_path=config.TRACE_JSONL_PATH, buffer_size=config.TRACE_BUFFER_SIZE,
+                 jsonl_max_bytes=int(config.TRACE_JSONL_MAX_MB * 1024 * 1024)):
+        self.enabled = enabled
+        self.exporters = [name.strip() for name in exporters.split(",") if name.strip() not in ("", "none")]
+        self.jsonl_path = jsonl_path
+        self.jsonl_max_bytes = jsonl_max_bytes
+        self._recent = deque(maxlen=buffer_size)
+        self._lock = threading.Lock()
+        self._otel_tracer = None
+
+    def recent(self, limit=None):
+        """The latest finished turns as dicts, newest first."""
+        with self._lock:
+            traces = list(self._recent)
+        traces.reverse()
+        return traces[:limit] if limit else traces
+
+    def clear(self):
+        with self._lock:
+            self._recent.clear()
+
+    def finish(self, trace):
+        record = trace.to_dict()
+        metrics.observe("trace.turn_ms", record["wall_ms"])
+        for span in record["spans"]:
+            metrics.observe(f"trace.node_ms.{span['name']}", span["wall_ms"])
+        with self._lock:
+            self._recent.append(record)
+        for exporter in list(self.exporters):
+            try:
+                if exporter == "jsonl":
+                    self._export_jsonl(record)
+                elif exporter == "otel":
+                    self._export_otel(trace, record)
+            except ImportError as e:
+                # Missing package: say so once and stop trying, rather than on every turn
+                print(f"Trace export to {exporter} disabled: {e}")
+                self.exporters = [name for name in self.exporters if name != exporter]
+            except Exception as e:
+                # Exporting must never fail the turn
+                print(f"Trace export to {exporter} failed: {e}")
+        return record
+
+    def _export_jsonl(self, record):
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            os.makedirs(os.path.dirname(self.jsonl_path) or ".", exist_ok=True)
+            try:
+                if self.jsonl_max_bytes and os.path.getsize(self.jsonl_path) + len(line) > self.jsonl_max_bytes:
+                    os.replace(self.jsonl_path, self.jsonl_path + ".1")
+            except FileNotFoundError:
+                pass
+            with open(self.jsonl_path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+    def _export_otel(self, trace, record):
+        """Replay the turn as an OpenTelemetry span tree (a root span with one child per node)."""
+        try:
+            from opentelemetry import trace as otel
+            from opentelemetry.trace import Status, StatusCode
+        except ImportError as e:
+            raise ImportError("TRACE_EXPORTER=otel requires opentelemetry-api (plus an SDK/exporter to ship spans)") from e
+        if self._otel_tracer is None:
+            self._otel_tracer = otel.get_tracer("telecom-ai-assistant")
+
+        start_ns = int(trace.started_at * 1e9)
+        root = self._otel_tracer.start_span(trace.name, start_time=start_ns, attributes=_otel_attributes(record))
+        parent = otel.set_span_in_context(root)
+        for span in record["spans"]:
+            child = self._otel_tracer.start_span(
+                span["name"], context=parent, start_time=start_ns + int(span["start_ms"] * 1e6),
+                attributes={name: span[name] for name in COUNTERS})
+            if span["error"]:
+                child.set_status(Status(StatusCode.ERROR, span["error"]))
+            child.end(end_time=start_ns + int((span["start_ms"] + span["wall_ms"]) * 1e6))
+        if record["error"]:
+            root.set_status(Status(StatusCode.ERROR, record["error"]))
+        root.end(end_time=start_ns + int(record["wall_ms"] * 1e6))
+
+
+def _otel_attributes(record):
+    attributes = {name: record[name] for name in COUNTERS}
+    attributes["trace.id"] = record["trace_id"]
+    for name in ("routes", "classification_tier", "response_cache_hit"):
+        if record.get(name) is not None:
+            attributes[name] = record[name]
+    for cache, counts in record["caches"].items():
+        attributes[f"cache.{cache}.hits"] = counts["hits"]
+        attributes[f"cache.{cache}.misses"] = counts["misses"]
+    return attributes
+
+
+tracer = Tracer()
+
+
+def current_trace():
+    return _current_trace.get()
+
+
+@contextmanager
+def turn(name="chat_turn"):
+    """Trace everything under this block as one turn (nested turns join the outer one)."""
+    if not tracer.enabled or _current_trace.get() is not None:
+        yield _current_trace.get()
+        return
+    trace = Trace(name)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    except Exception as e:
+        trace.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current_trace.reset(token)
+        trace.wall_ms = trace.elapsed_ms()
+        tracer.finish(trace)
+
+
+@contextmanager
+def node_span(name):
+    """Record a graph node run as a span of the current turn."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+    span = Span(name, trace.elapsed_ms())
+    token = _current_span.set(span)
+    start = time.perf_counter()
+    try:
+        yield span
+    except Exception as e:
+        span.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        span.wall_ms = (time.perf_counter() - start) * 1000
+        _current_span.reset(token)
+        with trace._lock:
+            trace.spans.append(span)
+
+
+def trace_node(name, fn):
+    """Wrap a graph node (sync or async) so each run is recorded by node_span."""
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def traced(state):
+            with node_span(name):
+                return await fn(state)
+    else:
+        @functools.wraps(fn)
+        def traced(state):
+            with node_span(name):
+                return fn(state)
+    return traced
+
+
+def record(**values):
+    """Add to the current turn's (and node's) counters; a no-op outside a traced turn."""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add(_current_span.get(), values)
+
+
+@contextmanager
+def timed(count_field, ms_field):
+    """Count one call and its duration, e.g. timed("db_queries", "db_ms")."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(_current_span.get(), {count_field: 1, ms_field: (time.perf_counter() - start) * 1000})
+
+
+def record_cache(name, hits=0, misses=0):
+    """Count cache hits/misses for the current turn, overall and per cache."""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add(_current_span.get(), {"cache_hits": hits, "cache_misses": misses})
+        trace.add_cache(name, hits, misses)
+
+
+def record_llm_usage(response):
+    """Token counts from an OpenAI-compatible JSON response body (streamed bodies carry none)."""
+    trace = _current_trace.get()
+    if trace is None or not response.headers.get("content-type", "").startswith("application/json"):
+        return
+    try:
+        usage = response.json().get("usage") or {}
+    except (ValueError, AttributeError):
+        return
+    trace.add(_current_span.get(), {"prompt_tokens": usage.get("prompt_tokens") or 0,
+                                    "completion_tokens": usage.get("completion_tokens") or 0})
+
+
+def summarize(traces):
+    """Per-node run count, p50/p95/p99 wall time and mean DB/LLM work over finished turn records."""
+    spans_by_node = {}
+    for record in traces:
+        for span in record["spans"]:
+            spans_by_node.setdefault(span["name"], []).append(span)
+    summary = []
+    for name, spans in spans_by_node.items():
+        wall = sorted(span["wall_ms"] for span in spans)
+        summary.append({
+            "node": name,
+            "runs": len(spans),
+            "p50_ms": percentile(wall, 50),
+            "p95_ms": percentile(wall, 95),
+            "p99_ms": percentile(wall, 99),
+            "db_queries": sum(span["db_queries"] for span in spans) / len(spans),
+            "db_ms": sum(span["db_ms"] for span in spans) / len(spans),
+            "llm_calls": sum(span["llm_calls"] for span in spans) / len(spans),
+            "tokens": sum(span["prompt_tokens"] + span["completion_tokens"] for span in spans) / len(spans),
+        })
+    return sorted(summary, key=lambda node: -node["p95_ms"])
+
+
+class TracedGraph:
+    """
+    Compiled graph whose invoke/stream calls (sync and async) each record one turn.
+    Everything else is delegated to the compiled graph.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    def __getattr__(self, name):
+        return getattr(self.graph, name)
+
+    def invoke(self, inputs, *args, **kwargs):
+        with turn() as trace:
+            result = self.graph.invoke(inputs, *args, **kwargs)
+            if trace is not None:
+                trace.annotate(result)
+            return result
+
+    async def ainvoke(self, inputs, *args, **kwargs):
+        with turn() as trace:
+            result = await self.graph.ainvoke(inputs, *args, **kwargs)
+            if trace is not None:
+                trace.annotate(result)
+            return result
+
+    def stream(self, inputs, *args, **kwargs):
+        # Every step (and the final close) runs in one private context, so the turn is set and
+        # reset there: it never leaks into the consumer, who may also stop early from anywhere
+        steps = self._stream(inputs, *args, **kwargs)
+        context = contextvars.copy_context()
+        try:
+            while True:
+                try:
+                    chunk = context.run(next, steps)
+                except StopIteration:
+                    return
+                yield chunk
+        finally:
+            context.run(steps.close)
+
+    def _stream(self, inputs, *args, **kwargs):
+        with turn() as trace:
+            for chunk in self.graph.stream(inputs, *args, **kwargs):
+                _annotate_from_chunk(trace, chunk, kwargs.get("stream_mode"))
+                yield chunk
+
+    async def astream(self, inputs, *args, **kwargs):
+        # The turn runs in its own task (and so its own context) and hands chunks over one at a time;
+        # a consumer that stops early cancels it, and the turn still finishes where it started
+        chunks = asyncio.Queue(maxsize=1)
+
+        async def produce():
+            try:
+                with turn() as trace:
+                    async for chunk in self.graph.astream(inputs, *args, **kwargs):
+                        _annotate_from_chunk(trace, chunk, kwargs.get("stream_mode"))
+                        await chunks.put((chunk, None))
+                await chunks.put((_END, None))
+            except Exception as e:
+                await chunks.put((_END, e))
+
+        producer = asyncio.ensure_future(produce())
+        try:
+            while True:
+                chunk, error = await chunks.get()
+                if error is not None:
+                    raise error
+                if chunk is _END:
+                    return
+                yield chunk
+        finally:
+            producer.cancel()
+
+
+_END = object()
+
+
+def _annotate_from_chunk(trace, chunk, stream_mode):
+    # Full-state chunks come as (mode, state) with several modes, or bare with stream_mode="values"
+    if trace is None:
+        return
+    if isinstance(stream_mode, (list, tuple)) and isinstance(chunk, tuple) and chunk[0] == "values":
+        trace.annotate(chunk[1])
+    elif stream_mode == "values":
+        trace.annotate(chunk)